@@ -5,12 +5,37 @@ Semester V Results Analysis Pipeline
 Executes all analysis steps from data exploration to ML predictions
 """
 
+import argparse
+import importlib.util
 import os
 import sys
 import time
 import subprocess
+import threading
+import traceback
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python'))
+
+from pipeline.dag import Step, critical_path, run_steps, step_dependencies
+from pipeline.manifest import clear_manifest, load_manifest, save_manifest, stale_reason, step_state
+from pipeline.storage import keep_in_memory
+
+parser = argparse.ArgumentParser(description="Run the complete analysis pipeline")
+parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                    help="Steps run concurrently once their inputs are ready (default: one per CPU)")
+parser.add_argument('--force', action='append', default=[], metavar='STEP',
+                    help="Run STEP even if its inputs, code and parameters are unchanged "
+                         "(repeatable; 'all' forces every step)")
+parser.add_argument('--in-process', action='store_true',
+                    help="Run the Python steps one at a time in this process, handing the cleaned "
+                         "tables from step to step in memory (default: one subprocess per step)")
+args = parser.parse_args()
+if args.in_process:
+    # Stages share pyplot state and stdout in this mode, so they run one at a time
+    args.workers = 1
+    keep_in_memory()
+
 # Create necessary directories
 os.makedirs('data/cleaned', exist_ok=True)
 os.makedirs('data/exports', exist_ok=True)
@@ -24,111 +49,177 @@ print(" "*20 + "ACADEMIC PERFORMANCE ANALYSIS PIPELINE")
 print(" "*25 + "SEMESTER V - 2025")
 print("="*80 + "\n")
 
-# Define all steps
+# Define all steps with the paths they read and write; a step runs once
+# every step writing one of its inputs has finished
 steps = [
-    {
-        'name': 'Data Exploration',
-        'script': 'python/01_explore_data.py',
-        'description': 'Initial data exploration and summary statistics'
-    },
-    {
-        'name': 'Data Cleaning & Transformation',
-        'script': 'python/02_data_cleaning.py',
-        'description': 'Clean data, create tables, calculate aggregates'
-    },
-    {
-        'name': 'Load to Database',
-        'script': 'python/03_load_to_sql.py',
-        'description': 'Load cleaned data into SQLite database'
-    },
-    {
-        'name': 'SQL Analysis Queries',
-        'script': 'python/04_run_sql_queries.py',
-        'description': 'Execute SQL analysis queries and export results'
-    },
-    {
-        'name': 'Python Visualizations',
-        'script': 'python/05_visualizations.py',
-        'description': 'Generate matplotlib/seaborn visualizations'
-    },
-    {
-        'name': 'Machine Learning Models',
-        'script': 'python/06_ml_models.py',
-        'description': 'Build SGPA prediction and at-risk classification models'
-    },
-    {
-        'name': 'R Statistical Analysis',
-        'script': 'r/01_statistical_analysis.R',
-        'description': 'Perform comprehensive statistical analysis in R'
-    }
+    Step('explore', 'Data Exploration', 'python/01_explore_data.py',
+         'Initial data exploration and summary statistics',
+         inputs=['data/raw data/'], outputs=[]),
+    Step('clean', 'Data Cleaning & Transformation', 'python/02_data_cleaning.py',
+         'Clean data, create tables, calculate aggregates',
+         inputs=['data/raw data/'],
+         outputs=['data/cleaned/', 'docs/reports/cleaning_report.txt']),
+    Step('load', 'Load to Database', 'python/03_load_to_sql.py',
+         'Load cleaned data into SQLite database',
+         inputs=['data/cleaned/', 'sql/01_schema.sql'],
+         outputs=['data/academic_performance.db']),
+    Step('queries', 'SQL Analysis Queries', 'python/04_run_sql_queries.py',
+         'Execute SQL analysis queries and export results',
+         inputs=['data/academic_performance.db', 'sql/02_analysis_queries.sql'],
+         outputs=['data/exports/']),
+    Step('visualizations', 'Python Visualizations', 'python/05_visualizations.py',
+         'Generate matplotlib/seaborn visualizations',
+         inputs=['data/cleaned/'],
+         outputs=[f'python/outputs/{name}' for name in (
+             '01_sgpa_analysis.png', '02_grade_distribution.png', '03_subject_performance.png',
+             '03b_subject_performance_detailed.png', '04_correlation_analysis.png',
+             '05_performance_categories.png')]),
+    Step('ml', 'Machine Learning Models', 'python/06_ml_models.py',
+         'Build SGPA prediction and at-risk classification models',
+         inputs=['data/cleaned/'],
+         outputs=['ml_models/'] + [f'python/outputs/{name}' for name in (
+             '06_feature_importance_sgpa.png', '07_sgpa_prediction.png', '08_confusion_matrix.png')]),
+    Step('statistics_r', 'R Statistical Analysis', 'r/01_statistical_analysis.R',
+         'Perform comprehensive statistical analysis in R',
+         inputs=['data/cleaned/'],
+         outputs=['r/outputs/']),
 ]
+dependencies = step_dependencies(steps)
+
+forced = set(args.force)
+unknown = forced - {step.key for step in steps} - {'all'}
+if unknown:
+    parser.error(f"Unknown steps {sorted(unknown)}; choose from {[step.key for step in steps]} or 'all'")
 
 # Track results
 results = {
     'completed': [],
     'failed': [],
-    'skipped': []
+    'skipped': [],
+    'unchanged': [],
+    'blocked': []
 }
 
-def run_python_script(script_path):
-    """Execute Python script"""
+# Concurrent steps print their output as one block when they finish
+print_lock = threading.Lock()
+capture = args.workers > 1
+
+
+def run_command(command, missing_message):
+    """Run a step's command; returns (success, captured output or '')."""
     try:
-        import sys
-        # Use the current Python interpreter
-        subprocess.run([sys.executable, script_path], check=True, capture_output=False)
-        return True
+        proc = subprocess.run(command, check=True, capture_output=capture, text=True)
+        return True, proc.stdout or ''
     except subprocess.CalledProcessError as e:
-        print(f"Error: {e}")
-        return False
+        return False, (e.stdout or '') + (e.stderr or '') + f"Error: {e}\n"
     except FileNotFoundError:
-        print(f"Script not found: {script_path}")
-        return False
+        return False, f"{missing_message}\n"
+
 
-def run_r_script(script_path):
-    """Execute R script"""
+def run_in_process(step):
+    """Import a Python step's script and call its main(step.args); returns (success, '')."""
+    import matplotlib
+
+    spec = importlib.util.spec_from_file_location(f"step_{step.key}", step.script)
+    module = importlib.util.module_from_spec(spec)
     try:
-        subprocess.run(['Rscript', script_path], check=True, capture_output=False)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error: {e}")
-        return False
-    except FileNotFoundError:
-        print(f"R not found in PATH. Skipping R analysis.")
-        return False
-
-# Execute all steps
-for i, step in enumerate(steps, 1):
-    print(f"\n{'-'*80}")
-    print(f"STEP {i}/{len(steps)}: {step['name'].upper()}")
-    print(f"{'-'*80}")
-    print(f"Description: {step['description']}")
-    print(f"Script: {step['script']}")
-    print()
-    
-    if not os.path.exists(step['script']):
-        print(f"⚠️  Script not found: {step['script']}")
-        results['skipped'].append(step['name'])
-        continue
-    
-    start_time = time.time()
-    print(f"Starting at {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-    
-    # Execute based on script type
-    if step['script'].endswith('.py'):
-        success = run_python_script(step['script'])
-    elif step['script'].endswith('.R'):
-        success = run_r_script(step['script'])
+        # Style changes one stage makes (seaborn themes, figure sizes) must
+        # not leak into the plots of the next
+        with matplotlib.rc_context():
+            spec.loader.exec_module(module)
+            module.main(step.args)
+    except SystemExit as e:
+        return e.code in (None, 0), ''
+    except Exception:
+        traceback.print_exc()
+        print(f"Error: {step.script} raised an exception")
+        return False, ''
+    return True, ''
+
+
+def step_command(step):
+    """Command line of a step"""
+    if step.script.endswith('.py'):
+        # Use the current Python interpreter
+        return [sys.executable, step.script] + step.args
+    if step.script.endswith('.R'):
+        return ['Rscript', step.script] + step.args
+    return None
+
+
+def run_step(step):
+    if not os.path.exists(step.script):
+        with print_lock:
+            print(f"⚠️  Script not found: {step.script}")
+        return 'skipped'
+
+    command = step_command(step)
+    if command is None:
+        return 'failed'
+
+    # Skip the step when its inputs, code and command match its last run
+    manifest = load_manifest(step)
+    state = step_state(step, command, manifest)
+    if 'all' in forced or step.key in forced:
+        reason = "forced"
     else:
-        success = False
-    
-    elapsed_time = time.time() - start_time
-    
-    if success:
-        print(f"\n✓ COMPLETED in {elapsed_time:.2f} seconds")
-        results['completed'].append(step['name'])
+        reason = stale_reason(step, state, manifest)
+    if reason is None:
+        return 'unchanged'
+    with print_lock:
+        print(f"{step.name}: running ({reason})")
+
+    clear_manifest(step)
+    missing = (f"Script not found: {step.script}" if step.script.endswith('.py')
+               else "R not found in PATH. Skipping R analysis.")
+    if args.in_process and step.script.endswith('.py'):
+        success, output = run_in_process(step)
     else:
-        print(f"\n✗ FAILED (took {elapsed_time:.2f} seconds)")
-        results['failed'].append(step['name'])
+        success, output = run_command(command, missing)
+    if success:
+        save_manifest(step, state)
+
+    if output:
+        with print_lock:
+            print(f"\n{'-'*80}")
+            print(f"OUTPUT: {step.name.upper()}")
+            print(f"{'-'*80}")
+            print(output, end='' if output.endswith('\n') else '\n')
+    return 'completed' if success else 'failed'
+
+
+def step_started(step):
+    with print_lock:
+        print(f"\n{'-'*80}")
+        print(f"STEP {steps.index(step) + 1}/{len(steps)}: {step.name.upper()}")
+        print(f"{'-'*80}")
+        print(f"Description: {step.description}")
+        print(f"Script: {step.script}")
+        after = ', '.join(sorted(dependencies[step.name])) or 'nothing'
+        print(f"After: {after}")
+        print(f"Starting at {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+
+def step_finished(step, status, elapsed_time):
+    results[status].append(step.name)
+    with print_lock:
+        if status == 'completed':
+            print(f"\n✓ {step.name}: COMPLETED in {elapsed_time:.2f} seconds")
+        elif status == 'failed':
+            print(f"\n✗ {step.name}: FAILED (took {elapsed_time:.2f} seconds)")
+        elif status == 'unchanged':
+            print(f"\n= {step.name}: UP TO DATE (inputs, code and command unchanged)")
+        elif status == 'blocked':
+            print(f"\n⊘ {step.name}: NOT RUN (a step it depends on failed)")
+
+
+# Execute all steps, independent ones concurrently
+print(f"Running {len(steps)} steps with up to {args.workers} at a time"
+      f"{' in this process' if args.in_process else ''}")
+pipeline_start = time.time()
+status, elapsed = run_steps(steps, run_step, args.workers, step_started, step_finished)
+pipeline_elapsed = time.time() - pipeline_start
+path, path_seconds = critical_path(steps, dependencies, elapsed)
 
 # Generate summary report
 print("\n\n" + "="*80)
@@ -139,6 +230,11 @@ print(f"Completed Steps: {len(results['completed'])}/{len(steps)}")
 for step in results['completed']:
     print(f"  ✓ {step}")
 
+if results['unchanged']:
+    print(f"\nUp to Date (not rerun): {len(results['unchanged'])}")
+    for step in results['unchanged']:
+        print(f"  = {step}")
+
 if results['failed']:
     print(f"\nFailed Steps: {len(results['failed'])}")
     for step in results['failed']:
@@ -149,6 +245,15 @@ if results['skipped']:
     for step in results['skipped']:
         print(f"  ⊘ {step}")
 
+if results['blocked']:
+    print(f"\nNot Run (failed dependency): {len(results['blocked'])}")
+    for step in results['blocked']:
+        print(f"  ⊘ {step}")
+
+print(f"\nWall time: {pipeline_elapsed:.2f}s with up to {args.workers} concurrent step(s)")
+print(f"Sum of step times: {sum(elapsed.values()):.2f}s")
+print(f"Critical path: {' -> '.join(path)} ({path_seconds:.2f}s)")
+
 print("\n" + "="*80)
 print(" "*30 + "OUTPUT FILES GENERATED")
 print("="*80 + "\n")
@@ -159,7 +264,8 @@ output_files = {
         'data/cleaned/subjects.csv',
         'data/cleaned/grades.csv',
         'data/cleaned/performance.csv',
-        'data/cleaned/subject_performance.csv'
+        'data/cleaned/subject_performance.csv',
+        'data/cleaned/*.parquet'
     ],
     'Database': [
         'data/academic_performance.db'
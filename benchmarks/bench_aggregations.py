@@ -0,0 +1,102 @@
+"""
+Benchmark: lambda-based vs named vectorized group aggregations.
+
+Builds a synthetic compact grades table (1M rows by default) and times
+the former per-group lambda aggregations of 02_data_cleaning.py against
+pipeline.aggregates, checking that both produce the same results.
+
+Run from the project root:
+    python benchmarks/bench_aggregations.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+
+from pipeline.aggregates import student_aggregates, subject_aggregates
+from pipeline.compact import GRADE_ORDER, compact_grades
+
+GRADE_POINTS = [10, 9, 8, 7, 6, 5, 4, 0]
+
+
+def make_grades(rows, students, courses, seed=42):
+    """Return a synthetic compact grades table."""
+    rng = np.random.default_rng(seed)
+    grade_idx = rng.choice(len(GRADE_ORDER), size=rows, p=[0.15, 0.2, 0.2, 0.15, 0.1, 0.08, 0.07, 0.05])
+
+    grades = pd.DataFrame({
+        'hall_ticket': pd.Series(rng.integers(0, students, size=rows)).map('{:012d}'.format),
+        'course_code': pd.Series(rng.integers(0, courses, size=rows)).map('C{:05d}'.format),
+        'grade': np.array(GRADE_ORDER)[grade_idx],
+        'result': np.where(grade_idx == len(GRADE_ORDER) - 1, 'FAIL', 'PASS'),
+        'grade_points': np.array(GRADE_POINTS)[grade_idx],
+    })
+    return compact_grades(grades)
+
+
+def lambda_subject_aggregates(grades):
+    result = grades.groupby('course_code', observed=True).agg({
+        'result': lambda x: (x == 'PASS').sum(),
+        'grade': 'count',
+        'grade_points': 'mean'
+    }).reset_index()
+    result.columns = ['course_code', 'passed', 'total_enrolled', 'avg_grade_points']
+    return result
+
+
+def lambda_student_aggregates(grades):
+    result = grades.groupby('hall_ticket', observed=True).agg({
+        'grade_points': ['mean', 'min', 'max', 'std'],
+        'grade': lambda x: (x == 'F').sum()
+    }).reset_index()
+    result.columns = ['hall_ticket', 'avg_grade_points', 'min_grade_points',
+                      'max_grade_points', 'std_grade_points', 'fail_count']
+    return result
+
+
+def best_time(func, grades, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(grades)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Grade rows")
+    parser.add_argument('--students', type=int, default=170_000, help="Distinct hall tickets")
+    parser.add_argument('--courses', type=int, default=2_000, help="Distinct course codes")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing repetitions (best is kept)")
+    args = parser.parse_args()
+
+    print(f"Building {args.rows:,} grade rows "
+          f"({args.students:,} students, {args.courses:,} courses)...")
+    grades = make_grades(args.rows, args.students, args.courses)
+
+    print(f"\n{'Aggregation':<22}{'lambda (s)':>12}{'named (s)':>12}{'speedup':>10}")
+    print('-' * 56)
+
+    for name, legacy, vectorized in [
+        ('subject aggregates', lambda_subject_aggregates, subject_aggregates),
+        ('student aggregates', lambda_student_aggregates, student_aggregates),
+    ]:
+        legacy_time, expected = best_time(legacy, grades, args.repeat)
+        vectorized_time, actual = best_time(vectorized, grades, args.repeat)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+        print(f"{name:<22}{legacy_time:>12.3f}{vectorized_time:>12.3f}"
+              f"{legacy_time / vectorized_time:>9.1f}x")
+
+    print("\nResults identical for both implementations.")
+
+
+if __name__ == '__main__':
+    main()
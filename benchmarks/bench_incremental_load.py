@@ -0,0 +1,125 @@
+"""
+Benchmark: incremental (upsert) database refresh vs a full reload.
+
+Loads the cleaned tables (replicated --scale times under new hall
+tickets) into a scratch SQLite database with bulk_load(), then applies a
+small change set (a share of students removed, a share of grades and
+SGPAs changed) both ways: incremental_load() on the existing database and
+bulk_load() into a fresh one. Both databases must end up with the same
+rows in every table and summary, and the run fails (exit status 1) when
+the incremental refresh is not faster than the full reload.
+
+Run from the project root (after 02_data_cleaning.py):
+    python benchmarks/bench_incremental_load.py --scale 20
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+
+from pipeline.compact import compact_grades
+from pipeline.schema import Schema
+from pipeline.sqlload import bulk_load, incremental_load
+from pipeline.storage import CLEANED_DIR, read_cleaned
+from pipeline.summaries import SUMMARIES
+
+TABLES = ['students', 'subjects', 'grades', 'performance']
+SCHEMA_FILE = 'sql/01_schema.sql'
+
+
+def replicate(tables, scale):
+    """The tables with every student copied `scale` times under new hall tickets."""
+    scaled = {'subjects': tables['subjects']}
+    for name in ('students', 'grades', 'performance'):
+        df = tables[name].astype({'hall_ticket': str})
+        copies = [df.assign(hall_ticket=df['hall_ticket'] + f"-{k:03d}") for k in range(scale)]
+        scaled[name] = pd.concat(copies, ignore_index=True)
+    scaled['grades'] = compact_grades(scaled['grades'])
+    return scaled
+
+
+def change_set(tables, share, seed=42):
+    """A copy of the tables with `share` of students removed and of grades/SGPAs changed."""
+    rng = np.random.default_rng(seed)
+    changed = dict(tables)
+
+    tickets = tables['students']['hall_ticket']
+    removed = set(tickets[rng.random(len(tickets)) < share])
+    for name in ('students', 'grades', 'performance'):
+        df = changed[name]
+        changed[name] = df[~df['hall_ticket'].astype(str).isin(removed)].reset_index(drop=True)
+
+    grades = changed['grades'].copy()
+    pick = rng.random(len(grades)) < share
+    grades.loc[pick, 'grade'] = 'O'
+    grades.loc[pick, 'grade_points'] = 10
+    changed['grades'] = grades
+
+    performance = changed['performance'].copy()
+    pick = rng.random(len(performance)) < share
+    performance.loc[pick, 'sgpa'] = (performance.loc[pick, 'sgpa'] + 0.01).round(2)
+    changed['performance'] = performance
+    return changed
+
+
+def timed(func, *args):
+    """Run func quietly; returns seconds taken."""
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        func(*args)
+    return time.perf_counter() - start
+
+
+def table_rows(db_path, name):
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql(f'SELECT * FROM "{name}" ORDER BY 1, 2, 3', conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cleaned-dir', default=CLEANED_DIR, help="Cleaned tables to load")
+    parser.add_argument('--scale', type=int, default=10, help="Copies of every student")
+    parser.add_argument('--share', type=float, default=0.01,
+                        help="Share of students removed and of grades/SGPAs changed")
+    args = parser.parse_args()
+
+    tables = replicate({name: read_cleaned(name, cleaned_dir=args.cleaned_dir) for name in TABLES},
+                       args.scale)
+    changed = change_set(tables, args.share)
+    schema = Schema(SCHEMA_FILE)
+    print(f"{len(tables['grades']):,} grade rows, {len(tables['students']):,} students; "
+          f"{args.share:.1%} of them changed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        incremental_db = os.path.join(tmp, 'incremental.db')
+        full_db = os.path.join(tmp, 'full.db')
+        initial_s = timed(bulk_load, tables, incremental_db, schema)
+        incremental_s = timed(incremental_load, changed, schema, incremental_db)
+        full_s = timed(bulk_load, changed, full_db, schema)
+
+        for name in TABLES + list(SUMMARIES):
+            pd.testing.assert_frame_equal(table_rows(incremental_db, name), table_rows(full_db, name))
+
+    print(f"\n{'Load':<22}{'seconds':>10}")
+    print('-' * 32)
+    print(f"{'initial bulk load':<22}{initial_s:>10.3f}")
+    print(f"{'full reload':<22}{full_s:>10.3f}")
+    print(f"{'incremental refresh':<22}{incremental_s:>10.3f}")
+    print(f"\nResults identical; incremental is {full_s / incremental_s:.1f}x the speed of a full reload.")
+
+    if incremental_s >= full_s:
+        print("FAILED: the incremental refresh is not faster than a full reload")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Benchmark: the whole pipeline at several synthetic data scales.
+
+For each scale (in grade rows) a raw batch is generated with
+pipeline.synthetic and every stage runs as its own process in a fresh
+work directory: cleaning, SQL load, query suite, visualizations, ML
+training and statistical analysis (plus the R analysis when Rscript is
+installed). Wall time, CPU time (user + sys) and peak resident memory are
+recorded per stage into a JSON results file, so runs can be compared.
+
+With --baseline, every stage is compared against a stored results file
+and the run fails (exit status 1) when a metric grows by more than
+--threshold; stages that also fail or go missing fail the run. Small
+absolute changes (under MIN_DELTA) are ignored so that timer noise on
+tiny stages does not count as a regression.
+
+Run from the project root:
+    python benchmarks/bench_pipeline.py --scales 1k,100k
+    python benchmarks/bench_pipeline.py --scales 1k,100k --save-baseline
+    python benchmarks/bench_pipeline.py --scales 1k,100k --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+
+from pipeline.synthetic import BatchSpec, write_batch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Scale name -> grade rows (students = rows / subjects per student)
+SCALES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000, '10M': 10_000_000}
+SUBJECTS = 6
+
+BENCH_DIR = 'data/synthetic/bench'
+RESULTS_DIR = 'benchmarks/results'
+BASELINE_PATH = 'benchmarks/baseline.json'
+
+# Stage name -> command, run from the scale's work directory
+STAGES = {
+    'clean': [sys.executable, os.path.join(ROOT, 'python/02_data_cleaning.py'), 'raw'],
+    'load': [sys.executable, os.path.join(ROOT, 'python/03_load_to_sql.py')],
+    'queries': [sys.executable, os.path.join(ROOT, 'python/04_run_sql_queries.py'), '--no-cache'],
+    'visualizations': [sys.executable, os.path.join(ROOT, 'python/05_visualizations.py')],
+    'ml': [sys.executable, os.path.join(ROOT, 'python/06_ml_models.py')],
+    'statistics': [sys.executable, os.path.join(ROOT, 'python/07_statistical_analysis.py')],
+    'statistics_r': ['Rscript', os.path.join(ROOT, 'r/01_statistical_analysis.R')],
+}
+
+METRICS = ('wall_s', 'cpu_s', 'peak_mb')
+THRESHOLD = 0.25
+
+# Changes smaller than this never count as regressions
+MIN_DELTA = {'wall_s': 0.5, 'cpu_s': 0.5, 'peak_mb': 25}
+
+
+def prepare_batch(name, grade_rows, seed):
+    """Generate (or reuse) the raw batch for a scale; returns its path."""
+    spec = BatchSpec(students=-(-grade_rows // SUBJECTS), subjects=SUBJECTS, seed=seed)
+    path = os.path.join(BENCH_DIR, f"batch_{name}.json")
+    marker = f"{path}.spec"
+    if os.path.exists(path) and os.path.exists(marker):
+        with open(marker, 'r') as f:
+            if f.read() == repr(spec):
+                return path, spec, 0.0
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    start = time.perf_counter()
+    write_batch(spec, path)
+    with open(marker, 'w') as f:
+        f.write(repr(spec))
+    return path, spec, time.perf_counter() - start
+
+
+def prepare_workdir(name, batch_path):
+    """A fresh work directory holding the batch and the SQL files."""
+    workdir = os.path.abspath(os.path.join(BENCH_DIR, name))
+    shutil.rmtree(workdir, ignore_errors=True)
+    os.makedirs(os.path.join(workdir, 'raw'))
+    os.makedirs(os.path.join(workdir, 'logs'))
+    os.symlink(os.path.abspath(batch_path), os.path.join(workdir, 'raw', os.path.basename(batch_path)))
+    os.symlink(os.path.join(ROOT, 'sql'), os.path.join(workdir, 'sql'))
+    return workdir
+
+
+def run_stage(command, workdir, log_path):
+    """Run one stage; returns its metrics (wall, CPU, peak RSS) and exit status."""
+    env = dict(os.environ, MPLBACKEND='Agg')
+    with open(log_path, 'w') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=workdir, stdout=log, stderr=subprocess.STDOUT, env=env)
+        # wait4 reports this child's own resource usage (and that of its
+        # reaped children, e.g. process pools), unlike RUSAGE_CHILDREN
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        'wall_s': round(wall, 3),
+        'cpu_s': round(usage.ru_utime + usage.ru_stime, 3),
+        'peak_mb': round(usage.ru_maxrss / 1024, 1),
+        'ok': proc.returncode == 0,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return [(scale, stage, problem)] for regressions against baseline."""
+    problems = []
+    for scale, entry in baseline['scales'].items():
+        if scale not in results['scales']:
+            continue
+        current = results['scales'][scale]['stages']
+        for stage, base in entry['stages'].items():
+            if stage not in current:
+                if stage in results['stages']:
+                    problems.append((scale, stage, "missing from this run"))
+                continue
+            if not current[stage]['ok']:
+                problems.append((scale, stage, "failed"))
+                continue
+            if not base['ok']:
+                continue
+            for metric in METRICS:
+                before, after = base[metric], current[stage][metric]
+                if after > before * (1 + threshold) and after - before > MIN_DELTA[metric]:
+                    problems.append((scale, stage, f"{metric} {before} -> {after} "
+                                                   f"(+{100 * (after / max(before, 1e-9) - 1):.0f}%)"))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default=','.join(SCALES),
+                        help=f"Comma-separated scales in grade rows (default: {','.join(SCALES)})")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Comma-separated stages (default: {','.join(STAGES)})")
+    parser.add_argument('--seed', type=int, default=42, help="Seed of the synthetic batches")
+    parser.add_argument('--output', default=None,
+                        help=f"Results file (default: {RESULTS_DIR}/bench_<timestamp>.json)")
+    parser.add_argument('--baseline', default=None, help="Results file to check this run against")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f"Allowed growth of each metric over the baseline (default: {THRESHOLD:.0%})")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"Also save this run as {BASELINE_PATH}")
+    args = parser.parse_args()
+
+    scales = [name.strip() for name in args.scales.split(',') if name.strip()]
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in scales if name not in SCALES] + [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"Unknown scales/stages: {unknown}")
+    if 'statistics_r' in stages and shutil.which('Rscript') is None:
+        print("Rscript not found; skipping the R statistical analysis")
+        stages.remove('statistics_r')
+
+    results = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'seed': args.seed,
+        'stages': stages,
+        'scales': {},
+    }
+
+    failed = False
+    for name in scales:
+        print(f"\n{'='*72}")
+        print(f"SCALE {name}: {SCALES[name]:,} grade rows")
+        print(f"{'='*72}")
+        batch_path, spec, generate_s = prepare_batch(name, SCALES[name], args.seed)
+        print(f"Batch: {batch_path} ({spec.students:,} students"
+              f"{f', generated in {generate_s:.1f}s' if generate_s else ', reused'})")
+        workdir = prepare_workdir(name, batch_path)
+
+        entry = {'grade_rows': SCALES[name], 'students': spec.students,
+                 'generate_s': round(generate_s, 3), 'stages': {}}
+        print(f"\n{'Stage':<16}{'wall (s)':>10}{'cpu (s)':>10}{'peak (MB)':>11}")
+        print('-' * 47)
+        for stage in stages:
+            metrics = run_stage(STAGES[stage], workdir, os.path.join(workdir, 'logs', f"{stage}.log"))
+            entry['stages'][stage] = metrics
+            status = '' if metrics['ok'] else f"  FAILED (see {workdir}/logs/{stage}.log)"
+            print(f"{stage:<16}{metrics['wall_s']:>10.2f}{metrics['cpu_s']:>10.2f}{metrics['peak_mb']:>11.1f}{status}")
+            if not metrics['ok']:
+                failed = True
+                break
+        results['scales'][name] = entry
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output}")
+    if args.save_baseline:
+        shutil.copyfile(output, BASELINE_PATH)
+        print(f"Baseline saved to: {BASELINE_PATH}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('machine') != results['machine']:
+            print(f"WARNING: baseline was recorded on {baseline.get('machine')}")
+        problems = compare(results, baseline, args.threshold)
+        print(f"\n{'='*72}")
+        print(f"REGRESSIONS vs {args.baseline} (threshold {args.threshold:.0%})")
+        print(f"{'='*72}")
+        for scale, stage, problem in problems:
+            print(f"   {scale:>5} {stage:<16}{problem}")
+        if not problems:
+            print("   none")
+        failed = failed or bool(problems)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
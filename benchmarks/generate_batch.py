@@ -0,0 +1,77 @@
+"""
+Generate a synthetic raw batch in the batch_student_data.json layout.
+
+Writes deterministic (by --seed) student records of any size with
+pipeline.synthetic, streaming them to disk, so every stage can be
+benchmarked on 100k or 10M students. With --shards the batch is split
+into several files in a directory, which 02_data_cleaning.py accepts as
+its source.
+
+Run from the project root:
+    python benchmarks/generate_batch.py --students 100000
+    python python/02_data_cleaning.py data/synthetic/batch_student_data.json
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+
+from pipeline.synthetic import FAIL_RATE, BatchSpec, write_batch
+
+SYNTHETIC_DIR = 'data/synthetic'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=100_000, help="Student records")
+    parser.add_argument('--programs', type=int, default=4, help="Programs students are spread over")
+    parser.add_argument('--subjects', type=int, default=6, help="Subjects per student per semester")
+    parser.add_argument('--courses', type=int, default=15, help="Courses offered per program per semester")
+    parser.add_argument('--semesters', type=int, default=1,
+                        help="Semesters per record, current first (the cleaning stage reads the current one)")
+    parser.add_argument('--current-semester', type=int, default=5, help="Number of the current semester")
+    parser.add_argument('--fail-rate', type=float, default=FAIL_RATE, help="Share of F grades")
+    parser.add_argument('--ability-spread', type=float, default=1.0,
+                        help="Spread of student ability (higher concentrates fails on fewer students)")
+    parser.add_argument('--difficulty-spread', type=float, default=0.5,
+                        help="Spread of course difficulty (higher concentrates fails on fewer courses)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--shards', type=int, default=1, help="Split the batch into this many files")
+    parser.add_argument('--workers', type=int, default=None, help="Processes writing shards")
+    parser.add_argument('--output', default=None,
+                        help=f"Output file (or directory with --shards); default under {SYNTHETIC_DIR}/")
+    args = parser.parse_args()
+
+    try:
+        spec = BatchSpec(args.students, args.programs, args.subjects, args.courses, args.semesters,
+                         args.current_semester, args.fail_rate, args.ability_spread,
+                         args.difficulty_spread, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    output = args.output
+    if output is None:
+        output = os.path.join(SYNTHETIC_DIR, 'batch_student_data.json' if args.shards == 1 else 'shards')
+    if args.shards == 1:
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+    print(f"Generating {spec}...")
+    start = time.perf_counter()
+    written = write_batch(spec, output, args.shards, args.workers)
+    elapsed = time.perf_counter() - start
+
+    total_bytes = 0
+    for path, count in written:
+        size = os.path.getsize(path)
+        total_bytes += size
+        print(f"   {path}: {count:,} records, {size / 1e6:.1f} MB")
+    records = sum(count for _, count in written)
+    print(f"\n{records:,} records, {total_bytes / 1e6:.1f} MB in {elapsed:.2f}s "
+          f"({records / max(elapsed, 1e-9):,.0f} records/s)")
+
+
+if __name__ == '__main__':
+    main()
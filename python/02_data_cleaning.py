@@ -1,93 +1,21 @@
-import pandas as pd
-import json
-import numpy as np
+import argparse
 import os
 
-print("Starting data cleaning and transformation...\n")
-
-# Create output directories
-os.makedirs('data/cleaned', exist_ok=True)
-os.makedirs('docs/reports', exist_ok=True)
-
-# Load JSON
-with open('data/raw data/batch_student_data.json', 'r') as f:
-    raw_data = json.load(f)
-
-# 1. CREATE STUDENTS TABLE
-students = []
-for record in raw_data:
-    student = record['student']
-    students.append({
-        'hall_ticket': student['hallTicket'],
-        'student_name': student['name'],
-        'father_name': student['fatherName'],
-        'mother_name': student['motherName'],
-        'program': student['program']
-    })
-
-students_df = pd.DataFrame(students)
-students_df = students_df.drop_duplicates(subset=['hall_ticket'])
-
-print(f"Students table: {len(students_df)} students")
-
-# 2. CREATE SUBJECTS TABLE
-subjects_set = set()
-for record in raw_data:
-    for subject in record['semesters'][0]['subjects']:
-        subjects_set.add((
-            subject['courseCode'],
-            subject['courseTitle'],
-            subject['credits']
-        ))
-
-subjects_df = pd.DataFrame(list(subjects_set), 
-                           columns=['course_code', 'course_title', 'credits'])
-subjects_df = subjects_df.sort_values('course_code')
-
-print(f"Subjects table: {len(subjects_df)} subjects")
-
-# 3. CREATE GRADES TABLE
-grades_data = []
-for record in raw_data:
-    student = record['student']
-    semester_info = record['semesters'][0]
-    
-    for subject in semester_info['subjects']:
-        grades_data.append({
-            'hall_ticket': student['hallTicket'],
-            'course_code': subject['courseCode'],
-            'grade': subject['grade'],
-            'result': subject['result'],
-            'credits': subject['credits'],
-            'semester': 'SEMESTER-V'
-        })
-
-grades_df = pd.DataFrame(grades_data)
-
-print(f"Grades table: {len(grades_df)} grade records")
-
-# 4. CREATE PERFORMANCE TABLE
-performance_data = []
-for record in raw_data:
-    student = record['student']
-    semester_info = record['semesters'][0]
-    
-    sgpa = semester_info['sgpa']
-    
-    performance_data.append({
-        'hall_ticket': student['hallTicket'],
-        'semester': 'SEMESTER-V',
-        'sgpa': float(sgpa) if sgpa else None,
-        'result': semester_info['result'],
-        'total_subjects': record['totalSubjects']
-    })
-
-performance_df = pd.DataFrame(performance_data)
-
-print(f"Performance table: {len(performance_df)} records")
-
-# 5. ADD GRADE POINT CONVERSION
-grade_points = {
+import numpy as np
+import pandas as pd
+
+from pipeline.aggregates import student_aggregates, subject_aggregates
+from pipeline.cache import load_sharded_tables
+from pipeline.categories import categorize_sgpa
+from pipeline.compact import compact_grades, lookup_categories, memory_footprint
+from pipeline.delta import diff_fingerprints, load_previous_outputs, replace_rows, save_fingerprints
+from pipeline.ingest import RAW_DATA_PATH, resolve_raw_paths
+from pipeline.matrix import write_grade_matrix
+from pipeline.storage import update_student_keys, write_cleaned
+
+
+# Grade point conversion
+GRADE_POINTS = {
     'O': 10,
     'A+': 9,
     'A': 8,
@@ -98,63 +26,153 @@ grade_points = {
     'F': 0
 }
 
-grades_df['grade_points'] = grades_df['grade'].map(grade_points)
-grades_df['grade_points'] = grades_df['grade_points'].fillna(0).astype(int)
-
-# 6. CALCULATE SUBJECT PERFORMANCE
-subject_performance = grades_df.groupby('course_code').agg({
-    'result': lambda x: (x == 'PASS').sum(),
-    'grade': 'count',
-    'grade_points': 'mean'
-}).reset_index()
-
-subject_performance.columns = ['course_code', 'passed', 'total_enrolled', 'avg_grade_points']
-subject_performance['pass_rate'] = (subject_performance['passed'] / subject_performance['total_enrolled'] * 100).round(2)
-subject_performance['fail_count'] = subject_performance['total_enrolled'] - subject_performance['passed']
-
-# Merge with subject names
-subject_performance = subject_performance.merge(subjects_df[['course_code', 'course_title']], on='course_code')
-
-# 7. STUDENT PERFORMANCE CATEGORIES
-def categorize_sgpa(sgpa):
-    if pd.isna(sgpa):
-        return 'Promoted'
-    elif sgpa >= 9:
-        return 'Distinction'
-    elif sgpa >= 8:
-        return 'First Class'
-    elif sgpa >= 7:
-        return 'Second Class'
-    elif sgpa >= 6:
-        return 'Pass Class'
-    else:
-        return 'At Risk'
 
-performance_df['performance_category'] = performance_df['sgpa'].apply(categorize_sgpa)
+def add_grade_points(grades_df):
+    """Return grades with a grade_points column (unknown grades score 0)."""
+    grades_df = grades_df.copy()
+    grades_df['grade_points'] = lookup_categories(grades_df['grade'], GRADE_POINTS, 0, np.int8)
+    return grades_df
+
+
+def build_subject_performance(grades_df, subjects_df):
+    """Aggregate pass counts, enrolment and average grade points per course."""
+    subject_performance = subject_aggregates(grades_df)
+    subject_performance['pass_rate'] = (subject_performance['passed'] / subject_performance['total_enrolled'] * 100).round(2)
+    subject_performance['fail_count'] = subject_performance['total_enrolled'] - subject_performance['passed']
+
+    # Merge with subject names
+    return subject_performance.merge(subjects_df[['course_code', 'course_title']], on='course_code')
+
+
+def build_performance(performance_df, grades_df):
+    """Add performance categories and student-level grade aggregates."""
+    performance_df = performance_df.copy()
+    performance_df['performance_category'] = categorize_sgpa(performance_df['sgpa'])
+
+    # Join on the integer student key: the aggregates come out keyed by
+    # the grades' hall_ticket codes, so only performance needs a lookup
+    aggregates = student_aggregates(grades_df)
+    aggregates.index = aggregates.pop('hall_ticket').cat.codes
+    keys = grades_df['hall_ticket'].cat.categories.get_indexer(performance_df['hall_ticket'].astype(str))
+    aggregates = aggregates.reindex(keys).reset_index(drop=True)
+    return pd.concat([performance_df.reset_index(drop=True), aggregates], axis=1)
+
+
+def nonzero_counts(series):
+    """value_counts() without the zero rows of unused categories."""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
 
-# 8. CALCULATE STUDENT-LEVEL AGGREGATES
-student_aggregates = grades_df.groupby('hall_ticket').agg({
-    'grade_points': ['mean', 'min', 'max', 'std'],
-    'grade': lambda x: (x == 'F').sum()
-}).reset_index()
+def clean_batch(source=RAW_DATA_PATH, workers=None, delta=False):
+    print("Starting data cleaning and transformation...\n")
 
-student_aggregates.columns = ['hall_ticket', 'avg_grade_points', 'min_grade_points', 
-                               'max_grade_points', 'std_grade_points', 'fail_count']
+    # Create output directories
+    os.makedirs('data/cleaned', exist_ok=True)
+    os.makedirs('docs/reports', exist_ok=True)
 
-# Merge with performance data
-performance_df = performance_df.merge(student_aggregates, on='hall_ticket', how='left')
+    # Load the base tables (1. students, 2. subjects, 3. grades, 4. performance)
+    # from the parse-once cache; each raw shard is only streamed and decomposed
+    # when its content has changed since the last run. Multiple shards are
+    # parsed in a process pool and merged.
+    raw_paths = resolve_raw_paths(source)
+    print(f"Raw batch files: {len(raw_paths)}")
+    tables = load_sharded_tables(raw_paths, workers=workers)
 
-# 9. SAVE CLEANED DATA
-students_df.to_csv('data/cleaned/students.csv', index=False)
-subjects_df.to_csv('data/cleaned/subjects.csv', index=False)
-grades_df.to_csv('data/cleaned/grades.csv', index=False)
-performance_df.to_csv('data/cleaned/performance.csv', index=False)
-subject_performance.to_csv('data/cleaned/subject_performance.csv', index=False)
+    students_df = tables['students']
+    students_df = students_df.drop_duplicates(subset=['hall_ticket'])
 
-print(f"\nAll tables saved to data/cleaned/")
+    print(f"Students table: {len(students_df)} students")
 
-# 10. DATA QUALITY REPORT
-report = f"""
+    subjects_df = tables['subjects'].sort_values('course_code')
+
+    print(f"Subjects table: {len(subjects_df)} subjects")
+
+    # Every hall ticket gets a stable integer key that it keeps across runs
+    student_index = update_student_keys(pd.concat([students_df['hall_ticket'], tables['grades']['hall_ticket']]))
+    grades_df = compact_grades(tables['grades'], student_index)
+
+    print(f"Grades table: {len(grades_df)} grade records")
+    print(f"   Memory: {memory_footprint(tables['grades']):.2f} MB as objects -> "
+          f"{memory_footprint(grades_df):.2f} MB compact")
+
+    performance_df = tables['performance']
+
+    print(f"Performance table: {len(performance_df)} records")
+
+    previous = load_previous_outputs() if delta else None
+
+    if delta and previous is None:
+        print("\nDelta mode: no previous cleaned outputs found, running a full rebuild")
+
+    if previous is None:
+        # 5. ADD GRADE POINT CONVERSION
+        grades_df = add_grade_points(grades_df)
+
+        # 6. CALCULATE SUBJECT PERFORMANCE
+        subject_performance = build_subject_performance(grades_df, subjects_df)
+
+        # 7-8. STUDENT PERFORMANCE CATEGORIES AND AGGREGATES
+        performance_df = build_performance(performance_df, grades_df)
+    else:
+        # Only students whose raw record changed (or appeared/disappeared)
+        # are recomputed; everything else is carried over from the last run
+        changed, removed = diff_fingerprints(tables['fingerprints'], previous['fingerprints'])
+        stale = changed | removed
+
+        print(f"\nDelta mode: {len(changed)} new/changed, {len(removed)} removed student records")
+
+        old_grades = previous['grades']
+        old_performance = previous['performance']
+        old_subject_performance = previous['subject_performance']
+
+        if not stale:
+            grades_df = old_grades
+            performance_df = old_performance
+            subject_performance = old_subject_performance
+        else:
+            stale_grades = old_grades['hall_ticket'].isin(stale)
+
+            # 5. ADD GRADE POINT CONVERSION (changed students only)
+            fresh_grades = add_grade_points(grades_df[grades_df['hall_ticket'].isin(changed)])
+            grades_df = compact_grades(replace_rows(old_grades, stale_grades, fresh_grades), student_index)
+
+            # 6. PATCH SUBJECT PERFORMANCE for courses the stale students touch
+            affected_courses = set(old_grades.loc[stale_grades, 'course_code']) | set(fresh_grades['course_code'])
+            fresh_subject_performance = build_subject_performance(
+                grades_df[grades_df['course_code'].isin(affected_courses)], subjects_df
+            )
+            subject_performance = replace_rows(
+                old_subject_performance,
+                old_subject_performance['course_code'].isin(affected_courses),
+                fresh_subject_performance
+            )
+
+            print(f"Delta mode: {len(affected_courses)} subject statistics recomputed")
+
+            # 7-8. STUDENT PERFORMANCE CATEGORIES AND AGGREGATES (changed students only)
+            fresh_performance = build_performance(
+                performance_df[performance_df['hall_ticket'].isin(changed)], fresh_grades
+            )
+            performance_df = replace_rows(
+                old_performance, old_performance['hall_ticket'].isin(stale), fresh_performance
+            )
+
+    # 9. SAVE CLEANED DATA
+    write_cleaned('students', students_df)
+    write_cleaned('subjects', subjects_df)
+    write_cleaned('grades', grades_df)
+    write_cleaned('performance', performance_df)
+    write_cleaned('subject_performance', subject_performance)
+    save_fingerprints(tables['fingerprints'])
+
+    # Student x course grade-point matrix for zero-copy slicing downstream
+    write_grade_matrix(grades_df)
+
+    print(f"\nAll tables saved to data/cleaned/ (CSV and Parquet)")
+
+    # 10. DATA QUALITY REPORT
+    report = f"""
 {'='*60}
 DATA CLEANING REPORT - SEMESTER V
 {'='*60}
@@ -169,11 +187,11 @@ TABLES CREATED:
 
 PERFORMANCE DISTRIBUTION:
 ------------------------
-{performance_df['performance_category'].value_counts().to_string()}
+{nonzero_counts(performance_df['performance_category']).to_string()}
 
 PASS/FAIL SUMMARY:
 -----------------
-{performance_df['result'].value_counts().to_string()}
+{nonzero_counts(performance_df['result']).to_string()}
 
 SGPA STATISTICS:
 ---------------
@@ -189,7 +207,7 @@ SUBJECT DIFFICULTY (by pass rate):
 
 GRADE DISTRIBUTION:
 ------------------
-{grades_df['grade'].value_counts().to_string()}
+{nonzero_counts(grades_df['grade']).to_string()}
 
 DATA QUALITY:
 ------------
@@ -201,8 +219,25 @@ Pass rate: {(grades_df['result'] == 'PASS').sum() / len(grades_df) * 100:.2f}%
 {'='*60}
 """
 
-with open('docs/reports/cleaning_report.txt', 'w') as f:
-    f.write(report)
+    with open('docs/reports/cleaning_report.txt', 'w') as f:
+        f.write(report)
+
+    print("\nReport saved to: docs/reports/cleaning_report.txt")
+    print("\nDATA CLEANING COMPLETE!")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean raw batch data into the cleaned tables")
+    parser.add_argument('source', nargs='?', default=RAW_DATA_PATH,
+                        help="Raw batch JSON file, directory of JSON files, or glob pattern")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes used to parse shards (default: CPU count)")
+    parser.add_argument('--delta', action='store_true',
+                        help="Only recompute students whose raw record changed since the last run")
+    args = parser.parse_args(argv)
+
+    clean_batch(args.source, workers=args.workers, delta=args.delta)
+
 
-print("\nReport saved to: docs/reports/cleaning_report.txt")
-print("\nDATA CLEANING COMPLETE!")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,68 @@
-import pandas as pd
+import argparse
 from sqlalchemy import create_engine
 import time
 
-print("Loading data to SQL database...\n")
+from pipeline.schema import Schema
+from pipeline.sqlload import DB_PATH, bulk_load, incremental_load
+from pipeline.storage import read_cleaned
 
-# Create SQLite connection
-engine = create_engine('sqlite:///data/academic_performance.db')
 
-# Load cleaned data
-students = pd.read_csv('data/cleaned/students.csv')
-subjects = pd.read_csv('data/cleaned/subjects.csv')
-grades = pd.read_csv('data/cleaned/grades.csv')
-performance = pd.read_csv('data/cleaned/performance.csv')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the cleaned tables into SQLite")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Upsert into the existing database instead of rebuilding it")
+    args = parser.parse_args(argv)
 
-print(f"Loaded datasets:")
-print(f"   Students: {len(students)} rows")
-print(f"   Subjects: {len(subjects)} rows")
-print(f"   Grades: {len(grades)} rows")
-print(f"   Performance: {len(performance)} rows")
+    print("Loading data to SQL database...\n")
 
-# Load to database
-print(f"\nLoading to SQLite database...")
+    # Create SQLite connection
+    engine = create_engine(f'sqlite:///{DB_PATH}')
 
-start_time = time.time()
+    # Load cleaned data
+    students = read_cleaned('students')
+    subjects = read_cleaned('subjects')
+    grades = read_cleaned('grades')
+    performance = read_cleaned('performance')
 
-students.to_sql('students', engine, if_exists='replace', index=False)
-subjects.to_sql('subjects', engine, if_exists='replace', index=False)
-grades.to_sql('grades', engine, if_exists='replace', index=False)
-performance.to_sql('performance', engine, if_exists='replace', index=False)
+    print(f"Loaded datasets:")
+    print(f"   Students: {len(students)} rows")
+    print(f"   Subjects: {len(subjects)} rows")
+    print(f"   Grades: {len(grades)} rows")
+    print(f"   Performance: {len(performance)} rows")
 
-elapsed = time.time() - start_time
+    tables = {'students': students, 'subjects': subjects, 'grades': grades, 'performance': performance}
+    schema = Schema('sql/01_schema.sql')
 
-print(f"Loaded in {elapsed:.2f} seconds")
+    start_time = time.time()
 
-# Verify
-print(f"\nVerifying database...")
+    if args.incremental:
+        # Upsert on the declared primary keys in one transaction; readers keep
+        # the previous snapshot until it commits
+        print(f"\nRefreshing SQLite database incrementally...")
+        incremental_load(tables, schema, db_path=DB_PATH)
+    else:
+        # Bulk load to database (declared tables and keys first, one transaction
+        # per table, indexes built last)
+        print(f"\nLoading to SQLite database...")
+        bulk_load(tables, db_path=DB_PATH, schema=schema)
 
-from sqlalchemy import text
-with engine.connect() as conn:
-    for table in ['students', 'subjects', 'grades', 'performance']:
-        result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-        count = result.fetchone()[0]
-        print(f"   {table}: {count} rows")
+    elapsed = time.time() - start_time
 
-print(f"\nDatabase created: data/academic_performance.db")
-print(f"Loading complete!")
\ No newline at end of file
+    print(f"Loaded in {elapsed:.2f} seconds")
+
+    # Verify
+    print(f"\nVerifying database...")
+
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        for table in ['students', 'subjects', 'grades', 'performance']:
+            result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
+            count = result.fetchone()[0]
+            print(f"   {table}: {count} rows")
+
+    print(f"\nDatabase created: data/academic_performance.db")
+    print(f"Loading complete!")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,59 +1,311 @@
+import argparse
+import functools
+import itertools
 import pandas as pd
-from sqlalchemy import create_engine
 import os
+import time
 
-print("Running SQL Analysis Queries...\n")
+from pipeline.catalog import (CATALOG_FILE, DEFAULT_PARAMS, PROGRAMS_SQL, cohort_label, cohort_slug,
+                              load_catalog, parse_params)
+from pipeline.engines import DUCKDB_PATH, ENGINES, QUERY_TABLES, frames_match, open_engine, run_queries
+from pipeline.export import CHUNK_ROWS, EXPORT_FORMATS, PREVIEW_ROWS, stream_export
+from pipeline.querycache import QueryCache
+from pipeline.queryplan import PLAN_REPORT, SCAN_THRESHOLD, SLOW_MS, profile_queries, write_plan_report
 
-# Connect to database
-engine = create_engine('sqlite:///data/academic_performance.db')
 
-# Create export directory
-os.makedirs('data/exports', exist_ok=True)
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the SQL analysis queries and export the results")
+    parser.add_argument('--engine', choices=ENGINES, default='sqlite',
+                        help="Query engine: sqlite database or duckdb over the cleaned files (default: sqlite)")
+    parser.add_argument('--duckdb-file', nargs='?', const=DUCKDB_PATH, default=None,
+                        help=f"Query a local DuckDB file instead of the cleaned files (default path: {DUCKDB_PATH})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of queries run concurrently (default: one per CPU, at most one per query)")
+    parser.add_argument('--compare', action='store_true',
+                        help="Also run every query on the other engine and print a timing report (bypasses the cache)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-run every query and rewrite every export even if the data is unchanged")
+    parser.add_argument('--explain', action='store_true',
+                        help=f"Profile every query on SQLite (plan, time, rows, index use) into {PLAN_REPORT}")
+    parser.add_argument('--scan-threshold', type=int, default=SCAN_THRESHOLD,
+                        help=f"With --explain, flag full scans/temp B-trees over tables of at least this many rows (default: {SCAN_THRESHOLD})")
+    parser.add_argument('--slow-ms', type=float, default=SLOW_MS,
+                        help=f"With --explain, flag queries slower than this many milliseconds (default: {SLOW_MS})")
+    parser.add_argument('--stream', action='store_true',
+                        help="Fetch results in chunks and write exports incrementally, printing only a preview")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help=f"With --stream, rows fetched and written per chunk (default: {CHUNK_ROWS})")
+    parser.add_argument('--export-format', choices=EXPORT_FORMATS, default='csv',
+                        help="With --stream, write exports as csv or parquet (default: csv)")
+    parser.add_argument('--preview-rows', type=int, default=PREVIEW_ROWS,
+                        help=f"With --stream, rows of each result printed to the console (default: {PREVIEW_ROWS})")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                        help=f"Bind a query parameter, repeatable (defaults: {DEFAULT_PARAMS})")
+    parser.add_argument('--by-program', action='store_true',
+                        help="Run the whole suite once per program, exporting each to data/exports/cohorts/")
+    return parser
 
-# Read SQL file
-with open('sql/02_analysis_queries.sql', 'r') as f:
-    sql_content = f.read()
 
-# Split queries
-queries = sql_content.split('-- QUERY')
-queries = [q for q in queries if 'SELECT' in q.upper()]
+def export_dir(cohort):
+    """data/exports for the default parameters, a subdirectory per other cohort."""
+    if not cohort_label(cohort):
+        return 'data/exports'
+    return os.path.join('data/exports/cohorts', cohort_slug(cohort))
 
-results = {}
 
-for i, query_block in enumerate(queries, 1):
-    lines = query_block.strip().split('\n')
-    query_name = lines[0].replace(':', '').strip() if lines else f"Query {i}"
-    
-    # Extract SQL
-    sql_lines = [line for line in lines[1:] if not line.strip().startswith('--')]
-    sql_query = '\n'.join(sql_lines).strip()
-    
-    if not sql_query:
-        continue
-    
-    try:
+def export_path(cohorts, task_id, ext):
+    c, query_id = task_id
+    return os.path.join(export_dir(cohorts[c]), f"query_{query_id}.{ext}")
+
+
+def task_header(queries, cohorts, task_id):
+    c, query_id = task_id
+    query = queries[query_id]
+    label = cohort_label(cohorts[c])
+    return f"QUERY {query.number}: {query.title}" + (f" [{label}]" if label else '')
+
+
+def stream_to_export(engine, task_id, sql_query, bound, cohorts, args):
+    """Fetch a query in chunks straight into its export file."""
+    output_file = export_path(cohorts, task_id, args.export_format)
+    rows, preview = stream_export(engine.iter_query(sql_query, args.chunk_rows, bound), output_file,
+                                  args.export_format, args.preview_rows)
+    return output_file, rows, preview
+
+
+def run_suite(engine, catalog, cohorts, workers, args):
+    """Run every query once per cohort, printing and exporting each result.
+
+    Returns (tasks, results, timings, cached, unchanged, seconds): results
+    and timings by task id, the tasks served from the result cache and
+    the streamed exports left untouched because they were current.
+    """
+    queries = {query.id: query for query in catalog}
+    single = len(cohorts) == 1
+    results = {}
+    timings = {}
+    unchanged = []
+
+    for cohort in cohorts:
+        os.makedirs(export_dir(cohort), exist_ok=True)
+
+    tasks = [((c, query.id), query.sql, query.bind(cohort))
+             for c, cohort in enumerate(cohorts) for query in catalog]
+
+    # Results are cached per (SQL text, parameters, versions of the tables it
+    # reads); a query whose tables have not changed is served from the cache
+    suite_start = time.perf_counter()
+
+    cache = None
+    if not (args.no_cache or args.compare):
+        cache = QueryCache(engine.name, engine.table_fingerprints(), QUERY_TABLES)
+    keys = {task_id: cache.key(sql_query, bound) if cache else None for task_id, sql_query, bound in tasks}
+
+    cached = []
+    pending = []
+    for task_id, sql_query, bound in tasks:
+        if args.stream:
+            # Streamed results are not held in the cache; an export that
+            # already holds the current result is simply left alone
+            output_file = export_path(cohorts, task_id, args.export_format)
+            if cache and cache.export_is_current(output_file, keys[task_id]):
+                unchanged.append((task_id, output_file))
+            else:
+                pending.append((task_id, sql_query, bound))
+            continue
+        df = cache.get(keys[task_id]) if cache else None
+        if df is not None:
+            cached.append((task_id, df, None, None))
+        else:
+            pending.append((task_id, sql_query, bound))
+
+    for task_id, output_file in unchanged:
+        print(f"{task_header(queries, cohorts, task_id)}: unchanged, {output_file}")
+
+    # Queries are independent reads, so they run concurrently; each one is
+    # printed and exported as soon as it finishes. With several cohorts only
+    # the row count and export path are printed.
+    execute = functools.partial(stream_to_export, cohorts=cohorts, args=args) if args.stream else None
+    for task_id, df, elapsed, error in itertools.chain(cached, run_queries(engine, pending, workers, execute)):
         print(f"\n{'='*60}")
-        print(f"QUERY {i}: {query_name}")
+        print(task_header(queries, cohorts, task_id))
         print(f"{'='*60}")
-        
-        df = pd.read_sql(sql_query, engine)
-        
-        print(df.to_string(index=False))
+
+        if error is not None:
+            print(f"Error in {queries[task_id[1]].title}: {str(error)}")
+            continue
+
+        if args.stream:
+            output_file, rows, preview = df
+            if single:
+                print(preview.to_string(index=False))
+                if rows > len(preview):
+                    print(f"... ({rows - len(preview)} more rows)")
+            print(f"\nRows returned: {rows}")
+            print(f"Saved to: {output_file}")
+            results[task_id] = None
+            timings[task_id] = elapsed
+            if cache:
+                cache.mark_exported(output_file, keys[task_id])
+            continue
+
+        if single:
+            print(df.to_string(index=False))
         print(f"\nRows returned: {len(df)}")
-        
-        # Save to CSV
-        safe_name = query_name.lower().replace(' ', '_').replace('/', '_')
-        output_file = f"data/exports/query_{i:02d}_{safe_name}.csv"
-        df.to_csv(output_file, index=False)
-        print(f"Saved to: {output_file}")
-        
-        results[query_name] = df
-        
-    except Exception as e:
-        print(f"Error in {query_name}: {str(e)}")
-
-print(f"\n{'='*60}")
-print(f"SQL ANALYSIS COMPLETE")
-print(f"{'='*60}")
-print(f"\nTotal queries executed: {len(results)}")
-print(f"Results saved to: data/exports/")
\ No newline at end of file
+
+        # Save to CSV (skipped when the export already holds this result)
+        output_file = export_path(cohorts, task_id, 'csv')
+        if cache and cache.export_is_current(output_file, keys[task_id]):
+            print(f"Unchanged: {output_file}")
+        else:
+            df.to_csv(output_file, index=False)
+            print(f"Saved to: {output_file}")
+            if cache:
+                cache.mark_exported(output_file, keys[task_id])
+
+        results[task_id] = df
+        if elapsed is not None:
+            timings[task_id] = elapsed
+            if cache:
+                cache.put(keys[task_id], df)
+
+    suite_elapsed = time.perf_counter() - suite_start
+    if cache:
+        cache.save()
+    return tasks, results, timings, cached, unchanged, suite_elapsed
+
+
+def print_timings(engine_name, catalog, cohorts, tasks, results, timings, cached, unchanged,
+                  suite_elapsed, workers):
+    single = len(cohorts) == 1
+    print(f"\n{'='*60}")
+    print(f"QUERY TIMINGS ({engine_name})")
+    print(f"{'='*60}")
+    served = set(results) | set(dict(unchanged))
+    for query in catalog:
+        ran = [timings[(c, query.id)] for c in range(len(cohorts)) if (c, query.id) in timings]
+        hits = sum((c, query.id) in served and (c, query.id) not in timings for c in range(len(cohorts)))
+        if single and ran:
+            print(f"   Query {query.number:2d}: {ran[0]:.4f}s  {query.title}")
+        elif single and hits:
+            print(f"   Query {query.number:2d}: cached   {query.title}")
+        elif ran or hits:
+            print(f"   Query {query.number:2d}: {sum(ran):.4f}s over {len(ran)} cohort(s)"
+                  f"{f', {hits} cached' if hits else ''}  {query.title}")
+    if cached or unchanged:
+        print(f"\n{len(cached) + len(unchanged)} of {len(tasks)} queries served from the cache")
+    serial = sum(timings.values())
+    print(f"\nWall time: {suite_elapsed:.3f}s with {workers} worker(s)", end='')
+    if timings:
+        print(f" (sum of query times {serial:.3f}s, concurrency speedup {serial / max(suite_elapsed, 1e-9):.2f}x)")
+    else:
+        print()
+
+
+def compare_engines(engine_name, catalog, tasks, results, timings, workers, args):
+    """Re-run every task on the other engine and print timings and result matches."""
+    queries = {query.id: query for query in catalog}
+    other = open_engine('duckdb' if engine_name == 'sqlite' else 'sqlite', args.duckdb_file, workers)
+    report = []
+    for task_id, other_df, other_elapsed, error in run_queries(other, tasks, workers):
+        if task_id in results and error is None:
+            report.append({
+                'query': queries[task_id[1]].number,
+                engine_name: timings[task_id],
+                other.name: other_elapsed,
+                'match': frames_match(results[task_id], other_df),
+            })
+    other.close()
+    report = pd.DataFrame(report).sort_values('query')
+    report['speedup'] = report['sqlite'] / report['duckdb']
+
+    print(f"\n{'='*60}")
+    print(f"ENGINE TIMINGS (seconds)")
+    print(f"{'='*60}")
+    print(report[['query', 'sqlite', 'duckdb', 'speedup', 'match']].to_string(
+        index=False, float_format=lambda x: f"{x:.4f}"))
+    print(f"\nTotal: sqlite {report['sqlite'].sum():.3f}s, duckdb {report['duckdb'].sum():.3f}s")
+    if not report['match'].all():
+        print(f"WARNING: results differ for queries {report.loc[~report['match'], 'query'].tolist()}")
+
+
+def explain_queries(catalog, params, args):
+    """Profile every query on SQLite and print the flagged plans."""
+    # Profile one query at a time so the timings are not skewed by the pool
+    report = profile_queries(catalog, params, scan_threshold=args.scan_threshold, slow_ms=args.slow_ms)
+    write_plan_report(report)
+
+    print(f"\n{'='*60}")
+    print(f"QUERY PLANS (sqlite)")
+    print(f"{'='*60}")
+    for entry in report['queries']:
+        if 'error' in entry:
+            print(f"   Query {entry['query']:2d}: ERROR {entry['error']}")
+            continue
+        indexes = ', '.join(entry['indexes']) or 'none'
+        print(f"   Query {entry['query']:2d}: {entry['elapsed_ms']:9.2f} ms, "
+              f"{entry['rows_returned']} rows returned, ~{entry['rows_scanned_estimate']} scanned, "
+              f"indexes: {indexes}")
+        for flag in entry['flags']:
+            print(f"      FLAG: {flag}")
+    print(f"\n{len(report['flagged'])} of {len(report['queries'])} queries flagged")
+    print(f"Plan report saved to: {PLAN_REPORT}")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.stream and args.compare:
+        parser.error("--compare needs whole results in memory and cannot be combined with --stream")
+    if args.by_program and args.compare:
+        parser.error("--compare reports a single cohort and cannot be combined with --by-program")
+    try:
+        params = dict(DEFAULT_PARAMS)
+        params.update(parse_params(args.param))
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("Running SQL Analysis Queries...\n")
+
+    # Read the query catalog
+    catalog = load_catalog(CATALOG_FILE)
+    workers = args.workers or min(len(catalog), os.cpu_count() or 1)
+
+    # Connect to the selected engine (one read-only connection per worker)
+    engine = open_engine(args.engine, args.duckdb_file, workers)
+    print(f"Engine: {engine.name}, {workers} worker(s)")
+
+    # One cohort is one set of parameter values; every query of the suite runs
+    # once per cohort with the same prepared SQL
+    cohorts = [params]
+    if args.by_program:
+        programs = engine.query(PROGRAMS_SQL)['program'].tolist()
+        cohorts = [dict(params, program=program) for program in programs]
+        print(f"Cohorts: {len(cohorts)} program(s)")
+    elif cohort_label(params):
+        print(f"Parameters: {cohort_label(params)}")
+
+    try:
+        tasks, results, timings, cached, unchanged, suite_elapsed = run_suite(
+            engine, catalog, cohorts, workers, args)
+    finally:
+        engine.close()
+
+    print_timings(engine.name, catalog, cohorts, tasks, results, timings, cached, unchanged,
+                  suite_elapsed, workers)
+
+    if args.compare:
+        compare_engines(engine.name, catalog, tasks, results, timings, workers, args)
+
+    if args.explain:
+        explain_queries(catalog, params, args)
+
+    print(f"\n{'='*60}")
+    print(f"SQL ANALYSIS COMPLETE")
+    print(f"{'='*60}")
+    print(f"\nTotal queries executed: {len(results)}")
+    print(f"Results saved to: {'data/exports/' if len(cohorts) == 1 else 'data/exports/cohorts/'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ Using Python for comprehensive statistical analysis
 (Alternative to R, produces identical results)
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -12,379 +13,383 @@ from scipy import stats
 from scipy.stats import shapiro, normaltest, skew, kurtosis
 import os
 import warnings
-warnings.filterwarnings('ignore')
-
-# Setup
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 8)
-os.makedirs('reports/statistical_analysis', exist_ok=True)
-os.makedirs('visualizations/statistical', exist_ok=True)
-
-print("\n" + "="*70)
-print("COMPREHENSIVE STATISTICAL ANALYSIS - SEMESTER V PERFORMANCE")
-print("="*70)
-
-# Load data
-performance = pd.read_csv('data/cleaned/performance.csv')
-grades = pd.read_csv('data/cleaned/grades.csv')
-subjects = pd.read_csv('data/cleaned/subjects.csv')
-
-# Remove NaN SGPA for analysis
-performance_clean = performance[performance['sgpa'].notna()].copy()
-
-print(f"\nSample Size: {len(performance_clean)} students with valid SGPA")
-print(f"Total Students: {len(performance)} (includes {len(performance) - len(performance_clean)} promoted)")
-
-# ========================================
-# 1. DESCRIPTIVE STATISTICS
-# ========================================
-
-print("\n" + "-"*70)
-print("1. DESCRIPTIVE STATISTICS")
-print("-"*70)
-
-sgpa_data = performance_clean['sgpa']
-
-desc_stats = {
-    'Mean': sgpa_data.mean(),
-    'Median': sgpa_data.median(),
-    'Mode': sgpa_data.mode()[0] if len(sgpa_data.mode()) > 0 else np.nan,
-    'Std Dev': sgpa_data.std(),
-    'Variance': sgpa_data.var(),
-    'Min': sgpa_data.min(),
-    'Max': sgpa_data.max(),
-    'Range': sgpa_data.max() - sgpa_data.min(),
-    'Q1 (25%)': sgpa_data.quantile(0.25),
-    'Q2 (50%)': sgpa_data.quantile(0.50),
-    'Q3 (75%)': sgpa_data.quantile(0.75),
-    'IQR': sgpa_data.quantile(0.75) - sgpa_data.quantile(0.25),
-    'Skewness': skew(sgpa_data),
-    'Kurtosis': kurtosis(sgpa_data),
-}
-
-print("\nSGPA Descriptive Statistics:")
-print("-" * 50)
-for key, value in desc_stats.items():
-    print(f"{key:20s}: {value:8.4f}")
-
-# ========================================
-# 2. NORMALITY TESTS
-# ========================================
-
-print("\n" + "-"*70)
-print("2. NORMALITY TESTS")
-print("-"*70)
-
-# Shapiro-Wilk Test
-shapiro_stat, shapiro_p = shapiro(sgpa_data)
-print(f"\nShapiro-Wilk Test:")
-print(f"  Test Statistic: {shapiro_stat:.6f}")
-print(f"  P-value: {shapiro_p:.6f}")
-print(f"  Result: Data is {'NORMALLY' if shapiro_p > 0.05 else 'NOT NORMALLY'} distributed")
-print(f"  Interpretation: {'✓ Null hypothesis accepted' if shapiro_p > 0.05 else '✗ Null hypothesis rejected'}")
-
-# Anderson-Darling Test
-anderson_result = stats.anderson(sgpa_data)
-print(f"\nAnderson-Darling Test:")
-print(f"  Test Statistic: {anderson_result.statistic:.6f}")
-print(f"  Critical Values: {anderson_result.critical_values}")
-print(f"  Significance Levels: {anderson_result.significance_level}%")
-
-# Kolmogorov-Smirnov Test
-ks_stat, ks_p = stats.kstest(sgpa_data, 'norm', args=(sgpa_data.mean(), sgpa_data.std()))
-print(f"\nKolmogorov-Smirnov Test:")
-print(f"  Test Statistic: {ks_stat:.6f}")
-print(f"  P-value: {ks_p:.6f}")
-
-# ========================================
-# 3. HYPOTHESIS TESTING
-# ========================================
-
-print("\n" + "-"*70)
-print("3. HYPOTHESIS TESTING")
-print("-"*70)
-
-# H1: Is mean SGPA significantly different from 8.0?
-t_stat_8, t_p_8 = stats.ttest_1samp(sgpa_data, 8.0)
-print(f"\nOne-Sample T-Test (H0: μ = 8.0)")
-print(f"  T-statistic: {t_stat_8:.6f}")
-print(f"  P-value: {t_p_8:.6f}")
-print(f"  Mean: {sgpa_data.mean():.4f}")
-print(f"  95% CI: [{sgpa_data.mean() - 1.96*sgpa_data.sem():.4f}, {sgpa_data.mean() + 1.96*sgpa_data.sem():.4f}]")
-print(f"  Conclusion: Mean is {'SIGNIFICANTLY' if t_p_8 < 0.05 else 'NOT significantly'} different from 8.0")
-
-# H2: Chi-square test for performance categories
-cat_counts = performance['performance_category'].value_counts()
-expected_freq = len(performance) / len(cat_counts)
-chi2_stat = sum((cat_counts.values - expected_freq) ** 2 / expected_freq)
-chi2_p = 1 - stats.chi2.cdf(chi2_stat, len(cat_counts) - 1)
-print(f"\nChi-Square Test (Performance Category Distribution)")
-print(f"  Chi-Square Statistic: {chi2_stat:.6f}")
-print(f"  P-value: {chi2_p:.6f}")
-print(f"  Result: Categories are {'NOT uniformly' if chi2_p < 0.05 else 'uniformly'} distributed")
-
-# ========================================
-# 4. CORRELATION ANALYSIS
-# ========================================
-
-print("\n" + "-"*70)
-print("4. CORRELATION ANALYSIS")
-print("-"*70)
-
-# SGPA vs Average Grade Points
-valid_data = performance_clean[['sgpa', 'avg_grade_points', 'fail_count', 'std_grade_points']].dropna()
-
-correlations = {
-    'SGPA vs Avg Grades': (valid_data['sgpa'], valid_data['avg_grade_points']),
-    'SGPA vs Fail Count': (valid_data['sgpa'], valid_data['fail_count']),
-    'SGPA vs Grade Consistency': (valid_data['sgpa'], valid_data['std_grade_points']),
-}
-
-print("\nPearson Correlations:")
-for name, (x, y) in correlations.items():
-    r, p = stats.pearsonr(x, y)
-    print(f"\n{name}:")
-    print(f"  Correlation (r): {r:.6f}")
-    print(f"  P-value: {p:.6f}")
-    print(f"  Significance: {'***' if p < 0.001 else '**' if p < 0.01 else '*' if p < 0.05 else 'ns'}")
-    
-    # Interpretation
-    if abs(r) < 0.3:
-        strength = "Weak"
-    elif abs(r) < 0.7:
-        strength = "Moderate"
-    else:
-        strength = "Strong"
-    
-    direction = "positive" if r > 0 else "negative"
-    print(f"  Interpretation: {strength} {direction} correlation")
-
-# ========================================
-# 5. ANOVA - SGPA BY CATEGORY
-# ========================================
-
-print("\n" + "-"*70)
-print("5. ANOVA - SGPA BY PERFORMANCE CATEGORY")
-print("-"*70)
-
-categories = ['Distinction', 'First Class', 'Second Class', 'Pass Class']
-category_data = [performance_clean[performance_clean['performance_category'] == cat]['sgpa'].values 
-                 for cat in categories if cat in performance_clean['performance_category'].unique()]
-
-f_stat, anova_p = stats.f_oneway(*category_data)
-print(f"\nOne-way ANOVA Results:")
-print(f"  F-Statistic: {f_stat:.6f}")
-print(f"  P-value: {anova_p:.6f}")
-print(f"  Conclusion: Performance categories are {'SIGNIFICANTLY' if anova_p < 0.05 else 'NOT significantly'} different")
-
-# Mean SGPA by category
-print(f"\nMean SGPA by Category:")
-for cat in categories:
-    cat_sgpa = performance_clean[performance_clean['performance_category'] == cat]['sgpa']
-    if len(cat_sgpa) > 0:
-        print(f"  {cat:20s}: {cat_sgpa.mean():6.2f} (n={len(cat_sgpa)})")
-
-# ========================================
-# 6. SUBJECT DIFFICULTY ANALYSIS
-# ========================================
-
-print("\n" + "-"*70)
-print("6. SUBJECT DIFFICULTY ANALYSIS")
-print("-"*70)
-
-# Map grades to points
-grade_map = {'O': 10, 'A+': 9, 'A': 8, 'B+': 7, 'B': 6, 'C': 5, 'D': 4, 'F': 0}
-grades['grade_points'] = grades['grade'].map(grade_map)
-
-subject_analysis = grades.groupby('course_code').agg({
-    'grade_points': ['mean', 'std', 'min', 'max'],
-    'grade': lambda x: (x == 'F').sum() / len(x) * 100,
-    'hall_ticket': 'count'
-}).round(4)
-
-subject_analysis.columns = ['mean_points', 'std_points', 'min_points', 'max_points', 'fail_rate', 'n_students']
-subject_analysis = subject_analysis.sort_values('mean_points')
-
-print(f"\n5 Most Difficult Subjects (Lowest Average Grade Points):")
-print(subject_analysis.head())
-
-print(f"\n5 Easiest Subjects (Highest Average Grade Points):")
-print(subject_analysis.tail())
-
-# ========================================
-# 7. EFFECT SIZE CALCULATIONS
-# ========================================
-
-print("\n" + "-"*70)
-print("7. EFFECT SIZE CALCULATIONS")
-print("-"*70)
-
-# Cohen's d for SGPA vs benchmark (8.0)
-cohens_d = (sgpa_data.mean() - 8.0) / sgpa_data.std()
-print(f"\nCohen's d (SGPA vs 8.0 benchmark):")
-print(f"  Effect Size: {cohens_d:.4f}")
-effect_interpretation = "negligible" if abs(cohens_d) < 0.2 else "small" if abs(cohens_d) < 0.5 else "medium" if abs(cohens_d) < 0.8 else "large"
-print(f"  Interpretation: {effect_interpretation} effect")
-
-# ========================================
-# 8. VISUALIZATIONS
-# ========================================
-
-print("\n" + "-"*70)
-print("8. GENERATING STATISTICAL VISUALIZATIONS")
-print("-"*70)
-
-# Plot 1: Distribution with normality curve
-fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-
-# Histogram with normal curve
-ax1 = axes[0, 0]
-n, bins, patches = ax1.hist(sgpa_data, bins=20, density=True, alpha=0.7, color='steelblue', edgecolor='black')
-mu, sigma = sgpa_data.mean(), sgpa_data.std()
-x = np.linspace(mu - 4*sigma, mu + 4*sigma, 100)
-ax1.plot(x, stats.norm.pdf(x, mu, sigma), 'r-', linewidth=2, label='Normal Distribution')
-ax1.axvline(mu, color='red', linestyle='--', linewidth=2, label=f'Mean: {mu:.2f}')
-ax1.axvline(sgpa_data.median(), color='green', linestyle='--', linewidth=2, label=f'Median: {sgpa_data.median():.2f}')
-ax1.set_title('SGPA Distribution with Normal Curve', fontsize=12, fontweight='bold')
-ax1.set_xlabel('SGPA')
-ax1.set_ylabel('Density')
-ax1.legend()
-ax1.grid(alpha=0.3)
-
-# Q-Q Plot
-ax2 = axes[0, 1]
-stats.probplot(sgpa_data, dist="norm", plot=ax2)
-ax2.set_title('Q-Q Plot (Normality Assessment)', fontsize=12, fontweight='bold')
-ax2.grid(alpha=0.3)
-
-# Box plot
-ax3 = axes[1, 0]
-bp = ax3.boxplot(sgpa_data, vert=True, patch_artist=True)
-bp['boxes'][0].set_facecolor('lightblue')
-ax3.set_ylabel('SGPA')
-ax3.set_title('SGPA Boxplot (Outlier Detection)', fontsize=12, fontweight='bold')
-ax3.grid(alpha=0.3, axis='y')
-
-# Cumulative distribution
-ax4 = axes[1, 1]
-sorted_sgpa = np.sort(sgpa_data)
-cumulative = np.arange(1, len(sorted_sgpa) + 1) / len(sorted_sgpa) * 100
-ax4.plot(sorted_sgpa, cumulative, linewidth=2.5, color='steelblue', marker='o', markersize=4)
-ax4.axhline(50, color='red', linestyle='--', alpha=0.5, label='Median')
-ax4.axvline(8.0, color='green', linestyle='--', alpha=0.5, label='Benchmark (8.0)')
-ax4.set_xlabel('SGPA')
-ax4.set_ylabel('Cumulative Percentage (%)')
-ax4.set_title('Cumulative Distribution of SGPA', fontsize=12, fontweight='bold')
-ax4.legend()
-ax4.grid(alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('visualizations/statistical/01_descriptive_statistics.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 01_descriptive_statistics.png")
-plt.close()
-
-# Plot 2: SGPA by Category
-fig, axes = plt.subplots(1, 2, figsize=(15, 6))
-
-# Boxplot by category
-ax1 = axes[0]
-cat_order = ['Distinction', 'First Class', 'Second Class', 'Pass Class']
-plot_data = [performance_clean[performance_clean['performance_category'] == cat]['sgpa'].values 
-             for cat in cat_order if cat in performance_clean['performance_category'].unique()]
-bp = ax1.boxplot(plot_data, labels=[c for c in cat_order if c in performance_clean['performance_category'].unique()],
-                 patch_artist=True)
-colors = ['gold', 'lightgreen', 'lightblue', 'lightyellow']
-for patch, color in zip(bp['boxes'], colors[:len(bp['boxes'])]):
-    patch.set_facecolor(color)
-ax1.set_ylabel('SGPA')
-ax1.set_title('SGPA Distribution by Performance Category', fontsize=12, fontweight='bold')
-ax1.tick_params(axis='x', rotation=15)
-ax1.grid(alpha=0.3, axis='y')
-
-# Violin plot
-ax2 = axes[1]
-cat_data = []
-cat_labels = []
-for cat in cat_order:
-    if cat in performance_clean['performance_category'].unique():
-        cat_data.append(performance_clean[performance_clean['performance_category'] == cat]['sgpa'].values)
-        cat_labels.append(cat)
-
-parts = ax2.violinplot(cat_data, positions=range(len(cat_data)), showmeans=True, showmedians=True)
-ax2.set_xticks(range(len(cat_labels)))
-ax2.set_xticklabels(cat_labels, rotation=15)
-ax2.set_ylabel('SGPA')
-ax2.set_title('SGPA Distribution (Violin Plot)', fontsize=12, fontweight='bold')
-ax2.grid(alpha=0.3, axis='y')
-
-plt.tight_layout()
-plt.savefig('visualizations/statistical/02_category_distribution.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 02_category_distribution.png")
-plt.close()
-
-# Plot 3: Correlation Analysis
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# SGPA vs Avg Grades
-ax1 = axes[0]
-ax1.scatter(valid_data['avg_grade_points'], valid_data['sgpa'], alpha=0.6, s=80, color='steelblue', edgecolors='black')
-z = np.polyfit(valid_data['avg_grade_points'], valid_data['sgpa'], 1)
-p = np.poly1d(z)
-ax1.plot(valid_data['avg_grade_points'], p(valid_data['avg_grade_points']), "r--", linewidth=2)
-r, p_val = stats.pearsonr(valid_data['avg_grade_points'], valid_data['sgpa'])
-ax1.set_xlabel('Average Grade Points')
-ax1.set_ylabel('SGPA')
-ax1.set_title(f'SGPA vs Avg Grades\n(r={r:.3f}, p<0.001)', fontsize=12, fontweight='bold')
-ax1.grid(alpha=0.3)
-
-# SGPA vs Grade Consistency (only if variance exists)
-ax2 = axes[1]
-ax2.scatter(valid_data['std_grade_points'], valid_data['sgpa'], alpha=0.6, s=80, color='lightgreen', edgecolors='black')
-if valid_data['std_grade_points'].std() > 0:
-    try:
-        z = np.polyfit(valid_data['std_grade_points'], valid_data['sgpa'], 1)
-        p = np.poly1d(z)
-        ax2.plot(valid_data['std_grade_points'], p(valid_data['std_grade_points']), "r--", linewidth=2)
-    except:
-        pass
-r, p_val = stats.pearsonr(valid_data['std_grade_points'], valid_data['sgpa'])
-ax2.set_xlabel('Grade Consistency (Std Dev)')
-ax2.set_ylabel('SGPA')
-ax2.set_title(f'SGPA vs Consistency\n(r={r:.3f}, p<0.001)', fontsize=12, fontweight='bold')
-ax2.grid(alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('visualizations/statistical/03_correlation_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 03_correlation_analysis.png")
-plt.close()
-
-# Plot 4: Subject Difficulty Heatmap
-fig, ax = plt.subplots(figsize=(12, 8))
-subjects_plot = subject_analysis.sort_values('mean_points', ascending=False).head(12)
-colors_map = plt.cm.RdYlGn(np.linspace(0.2, 0.8, len(subjects_plot)))
-bars = ax.barh(range(len(subjects_plot)), subjects_plot['mean_points'], color=colors_map, edgecolor='black')
-ax.set_yticks(range(len(subjects_plot)))
-ax.set_yticklabels(subjects_plot.index, fontsize=10)
-ax.set_xlabel('Average Grade Points', fontsize=11, fontweight='bold')
-ax.set_title('Subject Difficulty Ranking (Top 12)', fontsize=13, fontweight='bold')
-ax.set_xlim(0, 10)
-for i, (idx, row) in enumerate(subjects_plot.iterrows()):
-    ax.text(row['mean_points'] + 0.2, i, f"{row['mean_points']:.2f}", va='center', fontweight='bold')
-ax.grid(alpha=0.3, axis='x')
-plt.tight_layout()
-plt.savefig('visualizations/statistical/04_subject_difficulty.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 04_subject_difficulty.png")
-plt.close()
-
-# ========================================
-# 9. COMPREHENSIVE REPORT GENERATION
-# ========================================
-
-print("\n" + "-"*70)
-print("9. GENERATING COMPREHENSIVE STATISTICAL REPORT")
-print("-"*70)
-
-report = f"""
+
+from pipeline.matrix import GradeMatrix
+from pipeline.storage import read_cleaned
+
+
+def main(argv=None):
+    argparse.ArgumentParser(description="Statistical analysis of the cleaned tables").parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+
+    # Setup
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (12, 8)
+    os.makedirs('reports/statistical_analysis', exist_ok=True)
+    os.makedirs('visualizations/statistical', exist_ok=True)
+
+    print("\n" + "="*70)
+    print("COMPREHENSIVE STATISTICAL ANALYSIS - SEMESTER V PERFORMANCE")
+    print("="*70)
+
+    # Load only the columns the analysis uses
+    performance = read_cleaned('performance', columns=['sgpa', 'performance_category', 'avg_grade_points',
+                                                       'fail_count', 'std_grade_points'])
+    grades = read_cleaned('grades', columns=['grade_points'])
+    subjects = read_cleaned('subjects', columns=['course_code'])
+
+    # Remove NaN SGPA for analysis
+    performance_clean = performance[performance['sgpa'].notna()].copy()
+
+    print(f"\nSample Size: {len(performance_clean)} students with valid SGPA")
+    print(f"Total Students: {len(performance)} (includes {len(performance) - len(performance_clean)} promoted)")
+
+    # ========================================
+    # 1. DESCRIPTIVE STATISTICS
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("1. DESCRIPTIVE STATISTICS")
+    print("-"*70)
+
+    sgpa_data = performance_clean['sgpa']
+
+    desc_stats = {
+        'Mean': sgpa_data.mean(),
+        'Median': sgpa_data.median(),
+        'Mode': sgpa_data.mode()[0] if len(sgpa_data.mode()) > 0 else np.nan,
+        'Std Dev': sgpa_data.std(),
+        'Variance': sgpa_data.var(),
+        'Min': sgpa_data.min(),
+        'Max': sgpa_data.max(),
+        'Range': sgpa_data.max() - sgpa_data.min(),
+        'Q1 (25%)': sgpa_data.quantile(0.25),
+        'Q2 (50%)': sgpa_data.quantile(0.50),
+        'Q3 (75%)': sgpa_data.quantile(0.75),
+        'IQR': sgpa_data.quantile(0.75) - sgpa_data.quantile(0.25),
+        'Skewness': skew(sgpa_data),
+        'Kurtosis': kurtosis(sgpa_data),
+    }
+
+    print("\nSGPA Descriptive Statistics:")
+    print("-" * 50)
+    for key, value in desc_stats.items():
+        print(f"{key:20s}: {value:8.4f}")
+
+    # ========================================
+    # 2. NORMALITY TESTS
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("2. NORMALITY TESTS")
+    print("-"*70)
+
+    # Shapiro-Wilk Test
+    shapiro_stat, shapiro_p = shapiro(sgpa_data)
+    print(f"\nShapiro-Wilk Test:")
+    print(f"  Test Statistic: {shapiro_stat:.6f}")
+    print(f"  P-value: {shapiro_p:.6f}")
+    print(f"  Result: Data is {'NORMALLY' if shapiro_p > 0.05 else 'NOT NORMALLY'} distributed")
+    print(f"  Interpretation: {'✓ Null hypothesis accepted' if shapiro_p > 0.05 else '✗ Null hypothesis rejected'}")
+
+    # Anderson-Darling Test
+    anderson_result = stats.anderson(sgpa_data)
+    print(f"\nAnderson-Darling Test:")
+    print(f"  Test Statistic: {anderson_result.statistic:.6f}")
+    print(f"  Critical Values: {anderson_result.critical_values}")
+    print(f"  Significance Levels: {anderson_result.significance_level}%")
+
+    # Kolmogorov-Smirnov Test
+    ks_stat, ks_p = stats.kstest(sgpa_data, 'norm', args=(sgpa_data.mean(), sgpa_data.std()))
+    print(f"\nKolmogorov-Smirnov Test:")
+    print(f"  Test Statistic: {ks_stat:.6f}")
+    print(f"  P-value: {ks_p:.6f}")
+
+    # ========================================
+    # 3. HYPOTHESIS TESTING
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("3. HYPOTHESIS TESTING")
+    print("-"*70)
+
+    # H1: Is mean SGPA significantly different from 8.0?
+    t_stat_8, t_p_8 = stats.ttest_1samp(sgpa_data, 8.0)
+    print(f"\nOne-Sample T-Test (H0: μ = 8.0)")
+    print(f"  T-statistic: {t_stat_8:.6f}")
+    print(f"  P-value: {t_p_8:.6f}")
+    print(f"  Mean: {sgpa_data.mean():.4f}")
+    print(f"  95% CI: [{sgpa_data.mean() - 1.96*sgpa_data.sem():.4f}, {sgpa_data.mean() + 1.96*sgpa_data.sem():.4f}]")
+    print(f"  Conclusion: Mean is {'SIGNIFICANTLY' if t_p_8 < 0.05 else 'NOT significantly'} different from 8.0")
+
+    # H2: Chi-square test for performance categories
+    cat_counts = performance['performance_category'].value_counts()
+    expected_freq = len(performance) / len(cat_counts)
+    chi2_stat = sum((cat_counts.values - expected_freq) ** 2 / expected_freq)
+    chi2_p = 1 - stats.chi2.cdf(chi2_stat, len(cat_counts) - 1)
+    print(f"\nChi-Square Test (Performance Category Distribution)")
+    print(f"  Chi-Square Statistic: {chi2_stat:.6f}")
+    print(f"  P-value: {chi2_p:.6f}")
+    print(f"  Result: Categories are {'NOT uniformly' if chi2_p < 0.05 else 'uniformly'} distributed")
+
+    # ========================================
+    # 4. CORRELATION ANALYSIS
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("4. CORRELATION ANALYSIS")
+    print("-"*70)
+
+    # SGPA vs Average Grade Points
+    valid_data = performance_clean[['sgpa', 'avg_grade_points', 'fail_count', 'std_grade_points']].dropna()
+
+    correlations = {
+        'SGPA vs Avg Grades': (valid_data['sgpa'], valid_data['avg_grade_points']),
+        'SGPA vs Fail Count': (valid_data['sgpa'], valid_data['fail_count']),
+        'SGPA vs Grade Consistency': (valid_data['sgpa'], valid_data['std_grade_points']),
+    }
+
+    print("\nPearson Correlations:")
+    for name, (x, y) in correlations.items():
+        r, p = stats.pearsonr(x, y)
+        print(f"\n{name}:")
+        print(f"  Correlation (r): {r:.6f}")
+        print(f"  P-value: {p:.6f}")
+        print(f"  Significance: {'***' if p < 0.001 else '**' if p < 0.01 else '*' if p < 0.05 else 'ns'}")
+
+        # Interpretation
+        if abs(r) < 0.3:
+            strength = "Weak"
+        elif abs(r) < 0.7:
+            strength = "Moderate"
+        else:
+            strength = "Strong"
+
+        direction = "positive" if r > 0 else "negative"
+        print(f"  Interpretation: {strength} {direction} correlation")
+
+    # ========================================
+    # 5. ANOVA - SGPA BY CATEGORY
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("5. ANOVA - SGPA BY PERFORMANCE CATEGORY")
+    print("-"*70)
+
+    categories = ['Distinction', 'First Class', 'Second Class', 'Pass Class']
+    category_data = [performance_clean[performance_clean['performance_category'] == cat]['sgpa'].values 
+                     for cat in categories if cat in performance_clean['performance_category'].unique()]
+
+    f_stat, anova_p = stats.f_oneway(*category_data)
+    print(f"\nOne-way ANOVA Results:")
+    print(f"  F-Statistic: {f_stat:.6f}")
+    print(f"  P-value: {anova_p:.6f}")
+    print(f"  Conclusion: Performance categories are {'SIGNIFICANTLY' if anova_p < 0.05 else 'NOT significantly'} different")
+
+    # Mean SGPA by category
+    print(f"\nMean SGPA by Category:")
+    for cat in categories:
+        cat_sgpa = performance_clean[performance_clean['performance_category'] == cat]['sgpa']
+        if len(cat_sgpa) > 0:
+            print(f"  {cat:20s}: {cat_sgpa.mean():6.2f} (n={len(cat_sgpa)})")
+
+    # ========================================
+    # 6. SUBJECT DIFFICULTY ANALYSIS
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("6. SUBJECT DIFFICULTY ANALYSIS")
+    print("-"*70)
+
+    # Per-course statistics read column-wise from the memory-mapped grade matrix
+    course_stats = GradeMatrix().course_stats()
+    subject_analysis = course_stats[['mean_points', 'std_points', 'min_points', 'max_points']].copy()
+    subject_analysis['fail_rate'] = course_stats['fail_count'] / course_stats['n_students'] * 100
+    subject_analysis['n_students'] = course_stats['n_students']
+    subject_analysis = subject_analysis.round(4)
+    subject_analysis = subject_analysis.sort_values('mean_points')
+
+    print(f"\n5 Most Difficult Subjects (Lowest Average Grade Points):")
+    print(subject_analysis.head())
+
+    print(f"\n5 Easiest Subjects (Highest Average Grade Points):")
+    print(subject_analysis.tail())
+
+    # ========================================
+    # 7. EFFECT SIZE CALCULATIONS
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("7. EFFECT SIZE CALCULATIONS")
+    print("-"*70)
+
+    # Cohen's d for SGPA vs benchmark (8.0)
+    cohens_d = (sgpa_data.mean() - 8.0) / sgpa_data.std()
+    print(f"\nCohen's d (SGPA vs 8.0 benchmark):")
+    print(f"  Effect Size: {cohens_d:.4f}")
+    effect_interpretation = "negligible" if abs(cohens_d) < 0.2 else "small" if abs(cohens_d) < 0.5 else "medium" if abs(cohens_d) < 0.8 else "large"
+    print(f"  Interpretation: {effect_interpretation} effect")
+
+    # ========================================
+    # 8. VISUALIZATIONS
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("8. GENERATING STATISTICAL VISUALIZATIONS")
+    print("-"*70)
+
+    # Plot 1: Distribution with normality curve
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+
+    # Histogram with normal curve
+    ax1 = axes[0, 0]
+    n, bins, patches = ax1.hist(sgpa_data, bins=20, density=True, alpha=0.7, color='steelblue', edgecolor='black')
+    mu, sigma = sgpa_data.mean(), sgpa_data.std()
+    x = np.linspace(mu - 4*sigma, mu + 4*sigma, 100)
+    ax1.plot(x, stats.norm.pdf(x, mu, sigma), 'r-', linewidth=2, label='Normal Distribution')
+    ax1.axvline(mu, color='red', linestyle='--', linewidth=2, label=f'Mean: {mu:.2f}')
+    ax1.axvline(sgpa_data.median(), color='green', linestyle='--', linewidth=2, label=f'Median: {sgpa_data.median():.2f}')
+    ax1.set_title('SGPA Distribution with Normal Curve', fontsize=12, fontweight='bold')
+    ax1.set_xlabel('SGPA')
+    ax1.set_ylabel('Density')
+    ax1.legend()
+    ax1.grid(alpha=0.3)
+
+    # Q-Q Plot
+    ax2 = axes[0, 1]
+    stats.probplot(sgpa_data, dist="norm", plot=ax2)
+    ax2.set_title('Q-Q Plot (Normality Assessment)', fontsize=12, fontweight='bold')
+    ax2.grid(alpha=0.3)
+
+    # Box plot
+    ax3 = axes[1, 0]
+    bp = ax3.boxplot(sgpa_data, vert=True, patch_artist=True)
+    bp['boxes'][0].set_facecolor('lightblue')
+    ax3.set_ylabel('SGPA')
+    ax3.set_title('SGPA Boxplot (Outlier Detection)', fontsize=12, fontweight='bold')
+    ax3.grid(alpha=0.3, axis='y')
+
+    # Cumulative distribution
+    ax4 = axes[1, 1]
+    sorted_sgpa = np.sort(sgpa_data)
+    cumulative = np.arange(1, len(sorted_sgpa) + 1) / len(sorted_sgpa) * 100
+    ax4.plot(sorted_sgpa, cumulative, linewidth=2.5, color='steelblue', marker='o', markersize=4)
+    ax4.axhline(50, color='red', linestyle='--', alpha=0.5, label='Median')
+    ax4.axvline(8.0, color='green', linestyle='--', alpha=0.5, label='Benchmark (8.0)')
+    ax4.set_xlabel('SGPA')
+    ax4.set_ylabel('Cumulative Percentage (%)')
+    ax4.set_title('Cumulative Distribution of SGPA', fontsize=12, fontweight='bold')
+    ax4.legend()
+    ax4.grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('visualizations/statistical/01_descriptive_statistics.png', dpi=300, bbox_inches='tight')
+    print("✓ Saved: 01_descriptive_statistics.png")
+    plt.close()
+
+    # Plot 2: SGPA by Category
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+
+    # Boxplot by category
+    ax1 = axes[0]
+    cat_order = ['Distinction', 'First Class', 'Second Class', 'Pass Class']
+    plot_data = [performance_clean[performance_clean['performance_category'] == cat]['sgpa'].values 
+                 for cat in cat_order if cat in performance_clean['performance_category'].unique()]
+    bp = ax1.boxplot(plot_data, labels=[c for c in cat_order if c in performance_clean['performance_category'].unique()],
+                     patch_artist=True)
+    colors = ['gold', 'lightgreen', 'lightblue', 'lightyellow']
+    for patch, color in zip(bp['boxes'], colors[:len(bp['boxes'])]):
+        patch.set_facecolor(color)
+    ax1.set_ylabel('SGPA')
+    ax1.set_title('SGPA Distribution by Performance Category', fontsize=12, fontweight='bold')
+    ax1.tick_params(axis='x', rotation=15)
+    ax1.grid(alpha=0.3, axis='y')
+
+    # Violin plot
+    ax2 = axes[1]
+    cat_data = []
+    cat_labels = []
+    for cat in cat_order:
+        if cat in performance_clean['performance_category'].unique():
+            cat_data.append(performance_clean[performance_clean['performance_category'] == cat]['sgpa'].values)
+            cat_labels.append(cat)
+
+    parts = ax2.violinplot(cat_data, positions=range(len(cat_data)), showmeans=True, showmedians=True)
+    ax2.set_xticks(range(len(cat_labels)))
+    ax2.set_xticklabels(cat_labels, rotation=15)
+    ax2.set_ylabel('SGPA')
+    ax2.set_title('SGPA Distribution (Violin Plot)', fontsize=12, fontweight='bold')
+    ax2.grid(alpha=0.3, axis='y')
+
+    plt.tight_layout()
+    plt.savefig('visualizations/statistical/02_category_distribution.png', dpi=300, bbox_inches='tight')
+    print("✓ Saved: 02_category_distribution.png")
+    plt.close()
+
+    # Plot 3: Correlation Analysis
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # SGPA vs Avg Grades
+    ax1 = axes[0]
+    ax1.scatter(valid_data['avg_grade_points'], valid_data['sgpa'], alpha=0.6, s=80, color='steelblue', edgecolors='black')
+    z = np.polyfit(valid_data['avg_grade_points'], valid_data['sgpa'], 1)
+    p = np.poly1d(z)
+    ax1.plot(valid_data['avg_grade_points'], p(valid_data['avg_grade_points']), "r--", linewidth=2)
+    r, p_val = stats.pearsonr(valid_data['avg_grade_points'], valid_data['sgpa'])
+    ax1.set_xlabel('Average Grade Points')
+    ax1.set_ylabel('SGPA')
+    ax1.set_title(f'SGPA vs Avg Grades\n(r={r:.3f}, p<0.001)', fontsize=12, fontweight='bold')
+    ax1.grid(alpha=0.3)
+
+    # SGPA vs Grade Consistency (only if variance exists)
+    ax2 = axes[1]
+    ax2.scatter(valid_data['std_grade_points'], valid_data['sgpa'], alpha=0.6, s=80, color='lightgreen', edgecolors='black')
+    if valid_data['std_grade_points'].std() > 0:
+        try:
+            z = np.polyfit(valid_data['std_grade_points'], valid_data['sgpa'], 1)
+            p = np.poly1d(z)
+            ax2.plot(valid_data['std_grade_points'], p(valid_data['std_grade_points']), "r--", linewidth=2)
+        except:
+            pass
+    r, p_val = stats.pearsonr(valid_data['std_grade_points'], valid_data['sgpa'])
+    ax2.set_xlabel('Grade Consistency (Std Dev)')
+    ax2.set_ylabel('SGPA')
+    ax2.set_title(f'SGPA vs Consistency\n(r={r:.3f}, p<0.001)', fontsize=12, fontweight='bold')
+    ax2.grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('visualizations/statistical/03_correlation_analysis.png', dpi=300, bbox_inches='tight')
+    print("✓ Saved: 03_correlation_analysis.png")
+    plt.close()
+
+    # Plot 4: Subject Difficulty Heatmap
+    fig, ax = plt.subplots(figsize=(12, 8))
+    subjects_plot = subject_analysis.sort_values('mean_points', ascending=False).head(12)
+    colors_map = plt.cm.RdYlGn(np.linspace(0.2, 0.8, len(subjects_plot)))
+    bars = ax.barh(range(len(subjects_plot)), subjects_plot['mean_points'], color=colors_map, edgecolor='black')
+    ax.set_yticks(range(len(subjects_plot)))
+    ax.set_yticklabels(subjects_plot.index, fontsize=10)
+    ax.set_xlabel('Average Grade Points', fontsize=11, fontweight='bold')
+    ax.set_title('Subject Difficulty Ranking (Top 12)', fontsize=13, fontweight='bold')
+    ax.set_xlim(0, 10)
+    for i, (idx, row) in enumerate(subjects_plot.iterrows()):
+        ax.text(row['mean_points'] + 0.2, i, f"{row['mean_points']:.2f}", va='center', fontweight='bold')
+    ax.grid(alpha=0.3, axis='x')
+    plt.tight_layout()
+    plt.savefig('visualizations/statistical/04_subject_difficulty.png', dpi=300, bbox_inches='tight')
+    print("✓ Saved: 04_subject_difficulty.png")
+    plt.close()
+
+    # ========================================
+    # 9. COMPREHENSIVE REPORT GENERATION
+    # ========================================
+
+    print("\n" + "-"*70)
+    print("9. GENERATING COMPREHENSIVE STATISTICAL REPORT")
+    print("-"*70)
+
+    report = f"""
 {'='*80}
 COMPREHENSIVE STATISTICAL ANALYSIS REPORT
 ACADEMIC PERFORMANCE - SEMESTER V
@@ -512,12 +517,12 @@ One-Way ANOVA Results:
 Mean SGPA by Category:
 """
 
-for cat in categories:
-    cat_sgpa = performance_clean[performance_clean['performance_category'] == cat]['sgpa']
-    if len(cat_sgpa) > 0:
-        report += f"  {cat:20s}: {cat_sgpa.mean():6.2f} (SD={cat_sgpa.std():.2f}, n={len(cat_sgpa)})\n"
+    for cat in categories:
+        cat_sgpa = performance_clean[performance_clean['performance_category'] == cat]['sgpa']
+        if len(cat_sgpa) > 0:
+            report += f"  {cat:20s}: {cat_sgpa.mean():6.2f} (SD={cat_sgpa.std():.2f}, n={len(cat_sgpa)})\n"
 
-report += f"""
+    report += f"""
 KEY FINDINGS & INTERPRETATIONS
 {'-'*80}
 1. DISTRIBUTION CHARACTERISTICS
@@ -592,24 +597,28 @@ Institution:         Academic Institution
 {'='*80}
 """
 
-# Save report
-with open('reports/statistical_analysis/STATISTICAL_ANALYSIS_REPORT.txt', 'w', encoding='utf-8') as f:
-    f.write(report)
-
-print("✓ Saved: STATISTICAL_ANALYSIS_REPORT.txt")
-
-# Save summary statistics to CSV
-summary_df = pd.DataFrame({
-    'Metric': list(desc_stats.keys()),
-    'Value': list(desc_stats.values())
-})
-summary_df.to_csv('reports/statistical_analysis/descriptive_statistics.csv', index=False)
-print("✓ Saved: descriptive_statistics.csv")
-
-print("\n" + "="*70)
-print("STATISTICAL ANALYSIS COMPLETE!")
-print("="*70)
-print(f"\nOutputs generated:")
-print(f"  ✓ Reports: reports/statistical_analysis/")
-print(f"  ✓ Visualizations: visualizations/statistical/")
-print(f"  ✓ Total: 1 comprehensive report + 4 statistical plots + summary stats")
+    # Save report
+    with open('reports/statistical_analysis/STATISTICAL_ANALYSIS_REPORT.txt', 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    print("✓ Saved: STATISTICAL_ANALYSIS_REPORT.txt")
+
+    # Save summary statistics to CSV
+    summary_df = pd.DataFrame({
+        'Metric': list(desc_stats.keys()),
+        'Value': list(desc_stats.values())
+    })
+    summary_df.to_csv('reports/statistical_analysis/descriptive_statistics.csv', index=False)
+    print("✓ Saved: descriptive_statistics.csv")
+
+    print("\n" + "="*70)
+    print("STATISTICAL ANALYSIS COMPLETE!")
+    print("="*70)
+    print(f"\nOutputs generated:")
+    print(f"  ✓ Reports: reports/statistical_analysis/")
+    print(f"  ✓ Visualizations: visualizations/statistical/")
+    print(f"  ✓ Total: 1 comprehensive report + 4 statistical plots + summary stats")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the academic performance pipeline scripts.
+
+The numbered scripts in python/ run with this directory on sys.path,
+so modules here are imported as ``from pipeline.ingest import ...``.
+"""
@@ -0,0 +1,42 @@
+"""
+Group aggregations over the grades table.
+
+Pass/fail tests are evaluated once for the whole column as boolean
+flags, and every statistic is a built-in named aggregation, so no Python
+code runs per group.
+"""
+
+import pandas as pd
+
+
+def subject_aggregates(grades):
+    """Return passed, total_enrolled and avg_grade_points per course_code."""
+    flags = pd.DataFrame({
+        'course_code': grades['course_code'],
+        'grade': grades['grade'],
+        'grade_points': grades['grade_points'],
+        'is_pass': grades['result'] == 'PASS',
+    })
+
+    return flags.groupby('course_code', observed=True).agg(
+        passed=('is_pass', 'sum'),
+        total_enrolled=('grade', 'count'),
+        avg_grade_points=('grade_points', 'mean'),
+    ).reset_index()
+
+
+def student_aggregates(grades):
+    """Return grade point mean/min/max/std and fail_count per hall_ticket."""
+    flags = pd.DataFrame({
+        'hall_ticket': grades['hall_ticket'],
+        'grade_points': grades['grade_points'],
+        'is_fail': grades['grade'] == 'F',
+    })
+
+    return flags.groupby('hall_ticket', observed=True).agg(
+        avg_grade_points=('grade_points', 'mean'),
+        min_grade_points=('grade_points', 'min'),
+        max_grade_points=('grade_points', 'max'),
+        std_grade_points=('grade_points', 'std'),
+        fail_count=('is_fail', 'sum'),
+    ).reset_index()
@@ -0,0 +1,140 @@
+"""
+Parse-once intermediate cache for the raw batch.
+
+The first stage to read a raw batch decomposes it into the four base
+tables and writes them as Feather files under data/cache/, keyed by the
+SHA-256 of the raw file. Later stages (and later runs) load the Feather
+files directly and only re-parse when the raw file's content changes.
+
+An entry is written under a temporary name and renamed into place, so a
+reader never sees a partial entry. Temporary directories left behind by
+a process that died are removed the next time the cache is used.
+"""
+
+import glob
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pipeline.ingest import RAW_DATA_PATH, iter_records
+from pipeline.tables import decompose_records, merge_tables
+
+CACHE_DIR = 'data/cache'
+
+# Bump when decompose_records changes the layout of the cached tables
+CACHE_VERSION = 3
+
+TABLE_NAMES = ['students', 'subjects', 'grades', 'performance', 'fingerprints']
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(raw_path=RAW_DATA_PATH, cache_dir=CACHE_DIR):
+    """Return the cache directory for the current content of raw_path."""
+    return os.path.join(cache_dir, f"v{CACHE_VERSION}-{file_digest(raw_path)}")
+
+
+def is_complete(target):
+    """True when a cache entry holds every table."""
+    return all(os.path.exists(os.path.join(target, f"{name}.feather")) for name in TABLE_NAMES)
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_stale_entries(cache_dir=CACHE_DIR):
+    """Delete temporary and set-aside entries whose writing process is gone."""
+    for path in glob.glob(os.path.join(cache_dir, '*.tmp-*')) + glob.glob(os.path.join(cache_dir, '*.old-*')):
+        pid = path.rsplit('-', 1)[1]
+        if not pid.isdigit() or not process_alive(int(pid)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def swap_in(tmp, target):
+    """Rename a fully written entry into place.
+
+    An existing (incomplete) entry is renamed aside first and deleted
+    only after the new one is in place. A reader never sees a half-deleted
+    entry, and a crash at any point leaves only .tmp-/.old- directories
+    that remove_stale_entries() deletes later.
+
+    Concurrent pipeline steps may parse the same raw file at once. The
+    first complete entry wins: a process that finds one in place (before
+    or when its rename fails) deletes its own copy, which holds the same
+    tables, and leaves the entry alone for readers.
+    """
+    if is_complete(target):
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+
+    aside = f"{target}.old-{os.getpid()}"
+    try:
+        os.replace(target, aside)
+    except FileNotFoundError:
+        pass
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        if not is_complete(target):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(aside, ignore_errors=True)
+
+
+def load_tables(raw_path=RAW_DATA_PATH, cache_dir=CACHE_DIR):
+    """Return the base tables for raw_path, parsing it only on a cache miss.
+
+    The result is a dict of DataFrames keyed by table name, as produced by
+    decompose_records().
+    """
+    target = cache_path(raw_path, cache_dir)
+    remove_stale_entries(cache_dir)
+
+    if is_complete(target):
+        return {name: pd.read_feather(os.path.join(target, f"{name}.feather"))
+                for name in TABLE_NAMES}
+
+    tables = decompose_records(iter_records(raw_path))
+
+    # Write to a temporary directory first so readers never see a partial cache
+    tmp = f"{target}.tmp-{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+    for name in TABLE_NAMES:
+        tables[name].to_feather(os.path.join(tmp, f"{name}.feather"))
+    swap_in(tmp, target)
+
+    return tables
+
+
+def load_sharded_tables(raw_paths, workers=None, cache_dir=CACHE_DIR):
+    """Load and merge the base tables for several raw batch files.
+
+    Each shard goes through load_tables() (and so through the cache) in a
+    process pool of up to `workers` processes; the per-shard tables are
+    then merged with merge_tables().
+    """
+    if len(raw_paths) == 1 or workers == 1:
+        shards = [load_tables(path, cache_dir) for path in raw_paths]
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(raw_paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(load_tables, raw_paths, [cache_dir] * len(raw_paths)))
+
+    return merge_tables(shards)
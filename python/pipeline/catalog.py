@@ -0,0 +1,138 @@
+"""
+Named, parameterized catalog of the SQL analysis queries.
+
+The catalog file (sql/02_analysis_queries.sql) is a sequence of blocks,
+each opened by a `-- name:` header giving the query a stable id and a
+`-- title:` line for reports:
+
+    -- name: top_students
+    -- title: Top Students
+    -- Any further comment lines are documentation
+    SELECT ... LIMIT :top_n;
+
+Queries take named `:parameters` instead of literal thresholds and
+filters. Every parameter has a default in DEFAULT_PARAMS; semester and
+program default to NULL, which the queries read as "all cohorts":
+
+    WHERE (:program IS NULL OR s.program = :program)
+
+The SQL text of a query never changes with its parameters, so an engine
+prepares each statement once per connection and re-executes it for every
+cohort (sqlite3 keeps prepared statements in a per-connection cache keyed
+by the SQL text; DuckDB binds the values into its prepared plan).
+"""
+
+import re
+from functools import lru_cache
+
+CATALOG_FILE = 'sql/02_analysis_queries.sql'
+
+# Parameter -> default value. None for semester/program means no filter.
+DEFAULT_PARAMS = {
+    'semester': None,
+    'program': None,
+    'top_n': 10,
+    'risk_sgpa': 7.0,
+    'min_o_grades': 3,
+}
+
+PARAM_TYPES = {
+    'semester': str,
+    'program': str,
+    'top_n': int,
+    'risk_sgpa': float,
+    'min_o_grades': int,
+}
+
+# Cohorts for a run over every program
+PROGRAMS_SQL = 'SELECT DISTINCT program FROM students WHERE program IS NOT NULL ORDER BY program'
+
+NAME_PATTERN = re.compile(r'^--\s*name:\s*(\S+)\s*$', re.MULTILINE)
+TITLE_PATTERN = re.compile(r'^--\s*title:\s*(.+?)\s*$', re.MULTILINE)
+ID_PATTERN = re.compile(r'^[a-z][a-z0-9_]*$')
+PARAM_PATTERN = re.compile(r'(?<![:\w]):([A-Za-z_]\w*)')
+
+
+class CatalogQuery:
+    """One catalog entry: position, stable id, title and SQL text."""
+
+    def __init__(self, number, query_id, title, sql):
+        self.number = number
+        self.id = query_id
+        self.title = title
+        self.sql = sql
+        self.params = list(dict.fromkeys(PARAM_PATTERN.findall(sql)))
+
+    def bind(self, params=None):
+        """Values for this query's parameters: defaults overridden by params."""
+        values = dict(DEFAULT_PARAMS)
+        values.update(params or {})
+        return {name: values[name] for name in self.params}
+
+    def __repr__(self):
+        return f"CatalogQuery({self.number}, {self.id!r})"
+
+
+def load_catalog(path=CATALOG_FILE):
+    """Return the catalog as an ordered list of CatalogQuery.
+
+    Raises ValueError for malformed or duplicate ids and for parameters
+    without a default.
+    """
+    with open(path, 'r') as f:
+        content = f.read()
+
+    headers = list(NAME_PATTERN.finditer(content))
+    queries = []
+    seen = set()
+    for number, (header, following) in enumerate(zip(headers, headers[1:] + [None]), 1):
+        query_id = header.group(1)
+        if not ID_PATTERN.match(query_id):
+            raise ValueError(f"{path}: query id {query_id!r} must be lower_snake_case")
+        if query_id in seen:
+            raise ValueError(f"{path}: duplicate query id {query_id!r}")
+        seen.add(query_id)
+
+        block = content[header.end():following.start() if following else len(content)]
+        title = TITLE_PATTERN.search(block)
+        sql_lines = [line for line in block.strip().split('\n') if not line.strip().startswith('--')]
+        sql = '\n'.join(sql_lines).strip().rstrip(';').strip()
+        if not sql:
+            raise ValueError(f"{path}: query {query_id!r} has no SQL")
+
+        query = CatalogQuery(number, query_id, title.group(1) if title else query_id, sql)
+        unknown = [name for name in query.params if name not in DEFAULT_PARAMS]
+        if unknown:
+            raise ValueError(f"{path}: query {query_id!r} uses unknown parameters {unknown}")
+        queries.append(query)
+    return queries
+
+
+def parse_params(items):
+    """Parse ['name=value', ...] into typed parameter values."""
+    params = {}
+    for item in items or []:
+        name, sep, value = item.partition('=')
+        name = name.strip()
+        if not sep or name not in PARAM_TYPES:
+            raise ValueError(f"Bad parameter {item!r}; expected name=value with name in {sorted(PARAM_TYPES)}")
+        params[name] = PARAM_TYPES[name](value.strip())
+    return params
+
+
+def cohort_label(params):
+    """Short label of the parameters that differ from the defaults ('' if none)."""
+    return ', '.join(f"{name}={value}" for name, value in params.items()
+                     if value != DEFAULT_PARAMS.get(name))
+
+
+def cohort_slug(params):
+    """Directory-safe form of cohort_label()."""
+    parts = [f"{name}-{value}" for name, value in params.items() if value != DEFAULT_PARAMS.get(name)]
+    return re.sub(r'[^a-z0-9_.-]+', '_', '_'.join(parts).lower()).strip('_')
+
+
+@lru_cache(maxsize=None)
+def dollar_params(sql):
+    """Rewrite :name placeholders as $name (DuckDB's named parameter style)."""
+    return PARAM_PATTERN.sub(r'$\1', sql)
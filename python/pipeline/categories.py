@@ -0,0 +1,50 @@
+"""
+SGPA performance categories.
+
+One vectorized classifier shared by the exploration and cleaning stages.
+SGPA values are binned against sorted thresholds with a single
+searchsorted call and returned as a categorical with a fixed ordering.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Lower bounds (inclusive) of each band above the lowest one
+SGPA_THRESHOLDS = [6, 7, 8, 9]
+
+# One label per band, from the lowest band to the highest
+SGPA_LABELS = ['At Risk', 'Pass Class', 'Second Class', 'First Class', 'Distinction']
+
+# Students without an SGPA (e.g. promoted with backlogs)
+MISSING_LABEL = 'Promoted'
+
+# Display order used by the reports and plots
+CATEGORY_ORDER = SGPA_LABELS[::-1] + [MISSING_LABEL]
+
+
+def categorize_sgpa(sgpa, thresholds=SGPA_THRESHOLDS, labels=SGPA_LABELS,
+                    missing_label=MISSING_LABEL):
+    """Classify SGPA values into performance categories.
+
+    A value v falls in band i when thresholds[i-1] <= v < thresholds[i].
+    Returns a categorical Series whose categories run from the highest
+    band down to the lowest, followed by `missing_label` for NaN values.
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    if len(labels) != len(thresholds) + 1:
+        raise ValueError("labels must have exactly one more entry than thresholds")
+    if np.any(np.diff(thresholds) <= 0):
+        raise ValueError("thresholds must be strictly increasing")
+
+    sgpa = pd.Series(sgpa, dtype=float)
+    values = sgpa.to_numpy()
+
+    # Band index counted from the lowest band, then flipped to the
+    # highest-first category order
+    bands = np.searchsorted(thresholds, values, side='right')
+    codes = len(labels) - 1 - bands
+    codes[np.isnan(values)] = len(labels)
+
+    categories = list(labels[::-1]) + [missing_label]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories),
+                     index=sgpa.index)
@@ -0,0 +1,97 @@
+"""
+Compact in-memory representation of the grades table.
+
+String columns that repeat on every grade row (hall_ticket, course_code,
+grade, result, semester) become dictionary-encoded categoricals and the
+small integer columns become int8. Given the persisted student key
+list (see pipeline.storage.update_student_keys()), hall_ticket
+categories follow it, so a student's category code is their stable
+integer key (see student_keys()) and also their grade matrix row.
+"""
+
+import numpy as np
+import pandas as pd
+
+GRADE_ORDER = ['O', 'A+', 'A', 'B+', 'B', 'C', 'D', 'F']
+
+CATEGORICAL_COLUMNS = ['hall_ticket', 'course_code', 'grade', 'result', 'semester']
+INT8_COLUMNS = ['grade_points', 'credits']
+
+
+def _as_category(series, ordered_values=None):
+    """Dictionary-encode a column with sorted (or the given leading) categories."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.remove_unused_categories()
+        observed = list(values.cat.categories)
+    else:
+        values = series
+        observed = list(pd.unique(series.dropna()))
+
+    if ordered_values is None:
+        categories = sorted(observed)
+    else:
+        # Keep the canonical order and append any unexpected values
+        categories = ordered_values + sorted(set(observed) - set(ordered_values))
+
+    return values.astype(pd.CategoricalDtype(categories, ordered=ordered_values is not None))
+
+
+def compact_grades(grades, student_index=None):
+    """Return the grades table with categorical and int8 columns.
+
+    Works on any projection of the grades table; missing columns are
+    simply skipped. `student_index` is the persisted student key list: when
+    given, the hall_ticket categories are exactly that list, so category
+    codes are student keys. Otherwise they are the sorted hall tickets.
+    """
+    compact = grades.copy()
+
+    for col in CATEGORICAL_COLUMNS:
+        if col not in compact:
+            continue
+        if col == 'hall_ticket' and student_index is not None:
+            compact[col] = _with_student_keys(compact[col], student_index)
+        else:
+            compact[col] = _as_category(compact[col], GRADE_ORDER if col == 'grade' else None)
+
+    for col in INT8_COLUMNS:
+        if col in compact:
+            compact[col] = compact[col].astype(np.int8)
+
+    return compact
+
+
+def _with_student_keys(series, student_index):
+    """hall_ticket as a categorical whose categories are the student key list."""
+    values = series.astype(str)
+    unknown = ~values.isin(student_index)
+    if unknown.any():
+        raise ValueError(f"{unknown.sum()} grade rows have hall tickets without a student key "
+                         f"(e.g. {values[unknown].iloc[0]!r})")
+    return values.astype(pd.CategoricalDtype(student_index))
+
+
+def student_keys(grades):
+    """Return the integer student key for each grade row.
+
+    The key is stable across runs when the table was compacted with the
+    persisted student key list, which is append-only: a student keeps
+    their key even after leaving and re-entering the batch.
+    """
+    return grades['hall_ticket'].cat.codes.astype(np.int32)
+
+
+def lookup_categories(series, mapping, default, dtype):
+    """Map a categorical column through `mapping` once per category.
+
+    Rows whose value is missing or not in the mapping get `default`.
+    """
+    table = np.array([mapping.get(value, default) for value in series.cat.categories] + [default],
+                     dtype=dtype)
+    # Missing values have code -1, which indexes the trailing default
+    return pd.Series(table[series.cat.codes.to_numpy()], index=series.index)
+
+
+def memory_footprint(df):
+    """Return the deep memory usage of a DataFrame in megabytes."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
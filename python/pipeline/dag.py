@@ -0,0 +1,138 @@
+"""
+Dependency-graph scheduler for the analysis pipeline.
+
+Each Step declares the files and directories it reads (inputs) and writes
+(outputs). A step depends on every step whose outputs overlap its inputs
+(the same path, or one inside the other), so the graph follows from the
+declarations rather than from the order of the list.
+
+run_steps() starts every step whose dependencies have finished, up to
+`workers` at a time, so independent steps (visualizations, ML and the R
+analysis all only need data/cleaned/) overlap and a full run takes about
+as long as its critical path. A step that fails blocks everything
+downstream of it; unrelated steps still run.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Step:
+    """One pipeline step: a script plus the paths it reads and writes.
+
+    `key` is the short name used on the command line (e.g. --force) and for
+    the step's manifest; `args` are extra command-line arguments.
+    """
+
+    def __init__(self, key, name, script, description='', inputs=(), outputs=(), args=()):
+        self.key = key
+        self.name = name
+        self.script = script
+        self.description = description
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.args = list(args)
+
+    def __repr__(self):
+        return f"Step({self.name!r})"
+
+
+def paths_overlap(a, b):
+    """True when two paths are the same or one lies inside the other."""
+    a, b = a.rstrip('/'), b.rstrip('/')
+    return a == b or a.startswith(b + '/') or b.startswith(a + '/')
+
+
+def step_dependencies(steps):
+    """{step name: set of names of the steps it depends on}.
+
+    Raises ValueError for duplicate names, for two steps writing the same
+    path and for dependency cycles.
+    """
+    for names in ([step.name for step in steps], [step.key for step in steps]):
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate step names in {names}")
+
+    for i, step in enumerate(steps):
+        for other in steps[i + 1:]:
+            for path in step.outputs:
+                clash = [p for p in other.outputs if paths_overlap(path, p)]
+                if clash:
+                    raise ValueError(f"Steps {step.name!r} and {other.name!r} both write {path} / {clash[0]}")
+
+    deps = {}
+    for step in steps:
+        deps[step.name] = {other.name for other in steps if other is not step
+                           and any(paths_overlap(i, o) for i in step.inputs for o in other.outputs)}
+    topological_order(steps, deps)
+    return deps
+
+
+def topological_order(steps, deps):
+    """Steps ordered so that each comes after its dependencies (otherwise in list order)."""
+    ordered = []
+    done = set()
+    remaining = list(steps)
+    while remaining:
+        step = next((step for step in remaining if deps[step.name] <= done), None)
+        if step is None:
+            raise ValueError(f"Dependency cycle among steps {[step.name for step in remaining]}")
+        ordered.append(step)
+        done.add(step.name)
+        remaining.remove(step)
+    return ordered
+
+
+def critical_path(steps, deps, elapsed):
+    """(step names, seconds) of the longest chain of dependent steps by elapsed time."""
+    longest = {}
+    for step in topological_order(steps, deps):
+        before = max((longest[d] for d in deps[step.name]), key=lambda item: item[1], default=([], 0.0))
+        longest[step.name] = (before[0] + [step.name], before[1] + elapsed.get(step.name, 0.0))
+    return max(longest.values(), key=lambda item: item[1], default=([], 0.0))
+
+
+def run_steps(steps, run, workers=1, on_start=None, on_finish=None):
+    """Run steps in dependency order, up to `workers` at a time.
+
+    `run(step)` executes one step and returns 'completed', 'failed',
+    'skipped' or 'unchanged' (up to date, not run); a failed step marks its dependents 'blocked' without
+    running them. on_start(step) and on_finish(step, status, seconds) are
+    called as steps start and end. Returns ({name: status}, {name: seconds}).
+    """
+    deps = step_dependencies(steps)
+    pending = topological_order(steps, deps)
+    status = {}
+    elapsed = {}
+
+    def timed(step):
+        start = time.perf_counter()
+        result = run(step)
+        return result, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        running = {}
+        while pending or running:
+            for step in list(pending):
+                if any(status.get(d) in ('failed', 'blocked') for d in deps[step.name]):
+                    pending.remove(step)
+                    status[step.name] = 'blocked'
+                    elapsed[step.name] = 0.0
+                    if on_finish:
+                        on_finish(step, 'blocked', 0.0)
+                elif len(running) < max(workers, 1) and all(d in status for d in deps[step.name]):
+                    pending.remove(step)
+                    if on_start:
+                        on_start(step)
+                    running[pool.submit(timed, step)] = step
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                status[step.name], elapsed[step.name] = future.result()
+                if on_finish:
+                    on_finish(step, status[step.name], elapsed[step.name])
+
+    return status, elapsed
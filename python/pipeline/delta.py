@@ -0,0 +1,67 @@
+"""
+Delta (incremental) cleaning support.
+
+Each cleaning run stores a fingerprint per raw student record next to the
+cleaned tables. A delta run compares the current fingerprints with the
+stored ones so that only changed, new or removed students need their
+grades, performance rows and aggregates recomputed.
+"""
+
+import os
+
+import pandas as pd
+
+from pipeline.storage import CLEANED_DIR, read_cleaned
+
+FINGERPRINTS_FILE = '_fingerprints.csv'
+
+# Cleaned outputs a delta run patches in place
+DELTA_TABLES = ['grades', 'performance', 'subject_performance']
+
+
+def load_previous_outputs(cleaned_dir=CLEANED_DIR):
+    """Return the previous run's patchable tables and fingerprints.
+
+    Returns None when any of them is missing, in which case the caller
+    should fall back to a full rebuild.
+    """
+    fingerprints_file = os.path.join(cleaned_dir, FINGERPRINTS_FILE)
+    tables_present = all(os.path.exists(os.path.join(cleaned_dir, f"{name}.csv"))
+                         for name in DELTA_TABLES)
+
+    if not (tables_present and os.path.exists(fingerprints_file)):
+        return None
+
+    previous = {name: read_cleaned(name, cleaned_dir=cleaned_dir) for name in DELTA_TABLES}
+    previous['fingerprints'] = pd.read_csv(fingerprints_file, dtype=str)
+    return previous
+
+
+def save_fingerprints(fingerprints, cleaned_dir=CLEANED_DIR):
+    """Store the current record fingerprints for the next delta run."""
+    fingerprints.to_csv(os.path.join(cleaned_dir, FINGERPRINTS_FILE), index=False)
+
+
+def diff_fingerprints(current, previous):
+    """Return (changed, removed) sets of hall tickets.
+
+    `changed` holds new students and students whose raw record differs from
+    the previous run; `removed` holds students no longer in the batch.
+    """
+    merged = current.merge(previous, on='hall_ticket', how='outer',
+                           suffixes=('', '_previous'), indicator=True)
+
+    changed = merged[(merged['_merge'] == 'left_only') |
+                     ((merged['_merge'] == 'both') &
+                      (merged['fingerprint'] != merged['fingerprint_previous']))]
+    removed = merged[merged['_merge'] == 'right_only']
+
+    return set(changed['hall_ticket']), set(removed['hall_ticket'])
+
+
+def replace_rows(previous, stale_mask, fresh):
+    """Drop the stale rows of a previous table and append freshly computed ones."""
+    kept = previous[~stale_mask]
+    if fresh.empty:
+        return kept.reset_index(drop=True)
+    return pd.concat([kept, fresh], ignore_index=True)
@@ -0,0 +1,293 @@
+"""
+Query engines for the SQL analysis suite.
+
+Two embedded engines run the same query catalog (see pipeline.catalog):
+
+- sqlite: the row-oriented database written by 03_load_to_sql.py
+- duckdb: a columnar engine that scans the cleaned Parquet (or CSV) files
+  directly, or a local DuckDB database file built from them
+
+Both return DataFrames with the same column types, so the exports do not
+depend on which engine produced them. Engines are safe to query from
+several threads at once: each thread gets its own read-only SQLite
+connection or DuckDB cursor, which run_queries() uses to run the suite
+concurrently. Parameters are always bound, never formatted into the SQL,
+so each connection re-executes its prepared statements across cohorts.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import create_engine, text
+
+from pipeline.cache import file_digest
+from pipeline.catalog import dollar_params
+from pipeline.sqlload import DB_PATH, table_versions
+from pipeline.storage import CLEANED_DIR, cleaned_path, read_cleaned
+from pipeline.summaries import SUMMARIES, refresh_summaries, summary_fingerprint, summary_select
+
+SCHEMA_FILE = 'sql/01_schema.sql'
+
+ENGINES = ('sqlite', 'duckdb')
+
+DUCKDB_PATH = 'data/academic_performance.duckdb'
+
+# Cleaned tables the engines read, and everything the queries may reference
+BASE_TABLES = ['students', 'subjects', 'grades', 'performance']
+QUERY_TABLES = BASE_TABLES + list(SUMMARIES)
+
+
+class SQLiteEngine:
+    """Runs queries against the SQLite database, opened read-only.
+
+    Each thread checks out its own pooled connection.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, db_path=DB_PATH, pool_size=5):
+        self.engine = create_engine(f'sqlite:///file:{db_path}?mode=ro&uri=true',
+                                    pool_size=pool_size)
+
+    def query(self, sql, params=None):
+        return pd.read_sql(text(sql), self.engine, params=params)
+
+    def iter_query(self, sql, chunksize, params=None):
+        """Yield the result of sql as DataFrames of up to chunksize rows."""
+        with self.engine.connect() as conn:
+            yield from pd.read_sql(text(sql), conn, params=params, chunksize=chunksize)
+
+    def table_fingerprints(self):
+        """{table: version} as recorded by the loader in _table_versions."""
+        with self.engine.connect() as conn:
+            return table_versions(conn.connection.driver_connection)
+
+    def close(self):
+        self.engine.dispose()
+
+
+class DuckDBEngine:
+    """Runs queries on DuckDB over the cleaned files or a DuckDB file.
+
+    With database=None the cleaned tables are exposed as views over their
+    Parquet files, so nothing is copied (tables with only a CSV are loaded
+    in). With a database path, the file is (re)built from the cleaned
+    tables whenever it is missing or older than them, then opened
+    read-only. Each thread queries through its own cursor.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, database=None, cleaned_dir=CLEANED_DIR):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("The duckdb engine needs the duckdb package: pip install duckdb") from e
+
+        self.cleaned_dir = cleaned_dir
+        if database is None:
+            self.conn = duckdb.connect()
+            self.attach_cleaned()
+        else:
+            if is_stale(database, cleaned_dir) or missing_tables(duckdb, database):
+                if os.path.exists(database):
+                    os.remove(database)
+                self.conn = duckdb.connect(database)
+                self.build_database()
+                self.conn.close()
+            self.conn = duckdb.connect(database, read_only=True)
+
+        # Match SQLite's NULL ordering (smallest value) so sorted exports agree
+        self.conn.execute("SET default_null_order = 'nulls_first_on_asc_last_on_desc'")
+        self.local = threading.local()
+
+    def cursor(self):
+        """This thread's cursor on the shared database."""
+        if not hasattr(self.local, 'cursor'):
+            self.local.cursor = self.conn.cursor()
+        return self.local.cursor
+
+    def source(self, name):
+        """DuckDB table function reading a cleaned table from disk."""
+        parquet = cleaned_path(name, 'parquet', self.cleaned_dir)
+        if os.path.exists(parquet):
+            return f"read_parquet('{parquet}')"
+        return None
+
+    def attach_cleaned(self):
+        for name in BASE_TABLES:
+            source = self.source(name)
+            if source is not None:
+                self.conn.execute(f'CREATE VIEW {name} AS SELECT * FROM {source}')
+            else:
+                # CSV fallback goes through read_cleaned for the repo's dtypes;
+                # copied into a table so every thread's cursor can see it
+                self.conn.register('_frame', read_cleaned(name, cleaned_dir=self.cleaned_dir))
+                self.conn.execute(f'CREATE TABLE {name} AS SELECT * FROM _frame')
+                self.conn.unregister('_frame')
+
+        # Summaries are computed on the fly; DuckDB scans are cheap enough
+        for name in SUMMARIES:
+            self.conn.execute(f'CREATE VIEW {name} AS {summary_select(name)}')
+
+    def build_database(self):
+        from pipeline.schema import Schema
+
+        schema = Schema(SCHEMA_FILE)
+        schema.create(self.conn, 'duckdb')
+        for name in schema.tables:
+            if name in SUMMARIES:
+                continue
+            source = self.source(name)
+            if source is None:
+                self.conn.register('_frame', read_cleaned(name, cleaned_dir=self.cleaned_dir))
+                source = '_frame'
+            columns = [row[0] for row in self.conn.execute(f'DESCRIBE SELECT * FROM {source}').fetchall()]
+            column_list = ', '.join(columns)
+            self.conn.execute(f'INSERT INTO {name} ({column_list}) SELECT {column_list} FROM {source}')
+            if source == '_frame':
+                self.conn.unregister('_frame')
+        refresh_summaries(self.conn)
+        schema.create_indexes(self.conn, 'duckdb')
+        self.conn.execute('CHECKPOINT')
+
+    def table_fingerprints(self):
+        """{table: digest of the cleaned file it is read or built from}.
+
+        Summaries are versioned from the tables they are computed from.
+        """
+        fingerprints = {}
+        for name in BASE_TABLES:
+            for ext in ('parquet', 'csv'):
+                path = cleaned_path(name, ext, self.cleaned_dir)
+                if os.path.exists(path):
+                    fingerprints[name] = f"{ext}:{file_digest(path)}"
+                    break
+        for name in SUMMARIES:
+            fingerprint = summary_fingerprint(name, fingerprints)
+            if fingerprint is not None:
+                fingerprints[name] = fingerprint
+        return fingerprints
+
+    def query(self, sql, params=None):
+        relation = self.cursor().sql(dollar_params(sql), params=params or None)
+        types = [str(t) for t in relation.dtypes]
+        df = relation.df()
+        # SUM() over integers is HUGEINT in DuckDB and arrives as float;
+        # bring it back to the integer columns SQLite returns
+        for col, sql_type in zip(df.columns, types):
+            if sql_type == 'HUGEINT':
+                df[col] = df[col].astype('int64' if df[col].notna().all() else 'Int64')
+        return df
+
+    def iter_query(self, sql, chunksize, params=None):
+        """Yield the result of sql as DataFrames of up to chunksize rows."""
+        reader = self.cursor().sql(dollar_params(sql), params=params or None).fetch_record_batch(chunksize)
+        empty = True
+        for batch in reader:
+            empty = False
+            yield batch_to_frame(batch)
+        if empty:
+            yield batch_to_frame(reader.schema.empty_table())
+
+    def close(self):
+        self.conn.close()
+
+
+def batch_to_frame(batch):
+    """Arrow batch -> DataFrame with DuckDB decimals as int64/float64.
+
+    HUGEINT sums arrive as decimal(38,0) and DECIMAL columns as decimals;
+    query() gets the same integer and float columns from DuckDB's .df().
+    """
+    table = pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch
+    fields = []
+    for field in table.schema:
+        if pa.types.is_decimal(field.type):
+            field = field.with_type(pa.int64() if field.type.scale == 0 else pa.float64())
+        fields.append(field)
+    return table.cast(pa.schema(fields)).to_pandas()
+
+
+def is_stale(database, cleaned_dir=CLEANED_DIR):
+    """True when a DuckDB file is missing or older than any cleaned table."""
+    if not os.path.exists(database):
+        return True
+    built = os.path.getmtime(database)
+    for name in BASE_TABLES:
+        for ext in ('parquet', 'csv'):
+            path = cleaned_path(name, ext, cleaned_dir)
+            if os.path.exists(path) and os.path.getmtime(path) > built:
+                return True
+    return False
+
+
+def missing_tables(duckdb, database):
+    """True when an existing DuckDB file lacks a table the queries read."""
+    if not os.path.exists(database):
+        return True
+    with duckdb.connect(database, read_only=True) as conn:
+        present = {row[0] for row in conn.execute('SHOW TABLES').fetchall()}
+    return not set(QUERY_TABLES) <= present
+
+
+def open_engine(name, duckdb_path=None, workers=1):
+    """Return a query engine by name ('sqlite' or 'duckdb')."""
+    if name == 'sqlite':
+        return SQLiteEngine(pool_size=max(workers, 1))
+    if name == 'duckdb':
+        return DuckDBEngine(duckdb_path)
+    raise ValueError(f"Unknown engine {name!r}; expected one of {ENGINES}")
+
+
+def normalize_missing(df):
+    """df as object columns with None for every missing value.
+
+    DuckDB returns nullable dtypes (missing = <NA>) where SQLite gives
+    float64 or object columns (NaN / None), so results are normalized
+    before they are compared.
+    """
+    normalized = df.reset_index(drop=True).astype(object)
+    return normalized.where(normalized.notna(), None)
+
+
+def frames_match(left, right):
+    """True when two query results hold the same values (floats to 1e-9)."""
+    if list(left.columns) != list(right.columns) or len(left) != len(right):
+        return False
+    try:
+        pd.testing.assert_frame_equal(normalize_missing(left), normalize_missing(right),
+                                      check_dtype=False, check_exact=False, atol=1e-9)
+    except AssertionError:
+        return False
+    return True
+
+
+def run_queries(engine, tasks, workers=1, execute=None):
+    """Run (task id, sql, params) tasks concurrently; yield results as they finish.
+
+    Yields (task id, df, seconds, error) in completion order; error is None
+    on success and df is None on failure. `execute(engine, task id, sql,
+    params)` replaces engine.query(sql, params) for custom work per task
+    (e.g. streaming exports), and its return value takes the place of df.
+    """
+    def run(task):
+        task_id, sql_query, params = task
+        start = time.perf_counter()
+        try:
+            if execute is None:
+                df = engine.query(sql_query, params)
+            else:
+                df = execute(engine, task_id, sql_query, params)
+        except Exception as e:
+            return task_id, None, time.perf_counter() - start, e
+        return task_id, df, time.perf_counter() - start, None
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = [executor.submit(run, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
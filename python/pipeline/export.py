@@ -0,0 +1,104 @@
+"""
+Chunked, streaming export of query results.
+
+stream_export() consumes an iterator of DataFrame chunks (see iter_query()
+on the engines in pipeline.engines) and appends each one to a CSV or
+Parquet file as it arrives, keeping only a small preview in memory. The
+file is written under a temporary name and moved into place at the end,
+so readers never see a partial export.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = 50_000
+PREVIEW_ROWS = 20
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+
+class CsvChunkWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+    abort = close
+
+
+class ParquetChunkWriter:
+    """Appends chunks as row groups of one Parquet file.
+
+    A column that is entirely NULL so far has no type yet, so chunks are
+    held back until every column has one (or the stream ends) and the file
+    schema is the unified schema of the held chunks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.pending = []
+
+    def write(self, chunk):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self.writer is None:
+            self.pending.append(table)
+            schema = pa.unify_schemas([t.schema for t in self.pending], promote_options='default')
+            if not any(pa.types.is_null(field.type) for field in schema):
+                self.open(schema)
+        else:
+            self.writer.write_table(table.cast(self.writer.schema))
+
+    def open(self, schema):
+        self.writer = pq.ParquetWriter(self.path, schema, compression='zstd')
+        for table in self.pending:
+            self.writer.write_table(table.cast(schema))
+        self.pending = []
+
+    def close(self):
+        if self.writer is None:
+            schemas = [t.schema for t in self.pending] or [pa.schema([])]
+            self.open(pa.unify_schemas(schemas, promote_options='default'))
+        self.writer.close()
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def stream_export(chunks, path, fmt='csv', preview_rows=PREVIEW_ROWS):
+    """Write DataFrame chunks to path as they arrive.
+
+    Returns (rows written, preview DataFrame of the first preview_rows).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {EXPORT_FORMATS}")
+
+    tmp = f"{path}.tmp-{os.getpid()}-{id(chunks)}"
+    writer = CsvChunkWriter(tmp) if fmt == 'csv' else ParquetChunkWriter(tmp)
+    rows = 0
+    preview = []
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+            if rows < preview_rows:
+                preview.append(chunk.head(preview_rows - rows))
+            rows += len(chunk)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+
+    return rows, pd.concat(preview, ignore_index=True) if preview else pd.DataFrame()
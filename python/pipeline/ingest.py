@@ -0,0 +1,90 @@
+"""
+Raw batch ingestion.
+
+Reads data/raw data/batch_student_data.json one student record at a
+time so that the exploration and cleaning stages never hold the whole
+batch in memory as Python dicts.
+"""
+
+import glob
+import json
+import os
+
+RAW_DATA_PATH = 'data/raw data/batch_student_data.json'
+
+CHUNK_SIZE = 1 << 16
+
+
+def iter_records(path=RAW_DATA_PATH, chunk_size=CHUNK_SIZE):
+    """Yield each record of a top-level JSON array file, one at a time.
+
+    Only the record being decoded and one read chunk are kept in memory,
+    so peak usage does not grow with the size of the batch.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        started = False
+
+        while True:
+            # Skip whitespace and the separators between array items
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"Unexpected end of file in {path}")
+                buf = f.read(chunk_size)
+                pos = 0
+                eof = not buf
+                continue
+
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"Expected a JSON array in {path}")
+                started = True
+                pos += 1
+                continue
+
+            if buf[pos] == ']':
+                return
+
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                record, end = None, None
+
+            # A value that runs to the end of the buffer may be truncated
+            if end is None or (end >= len(buf) and not eof):
+                if eof:
+                    raise ValueError(f"Malformed record in {path} at offset {pos}")
+                more = f.read(max(chunk_size, len(buf) - pos))
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+
+            yield record
+            pos = end
+
+
+def resolve_raw_paths(source=RAW_DATA_PATH):
+    """Expand a raw batch file, directory or glob pattern into sorted file paths.
+
+    A directory contributes every *.json file directly inside it. Paths are
+    sorted so that later shards consistently win when records overlap.
+    """
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, '*.json'))
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        paths = glob.glob(source)
+
+    if not paths:
+        raise FileNotFoundError(f"No raw batch files found for: {source}")
+
+    return sorted(paths)
@@ -0,0 +1,150 @@
+"""
+Content-hash manifests for incremental pipeline runs.
+
+After a step succeeds, a manifest under data/manifests/ records the
+SHA-256 of every file it read (its declared inputs), of its code (the
+script plus the pipeline modules it imports, followed transitively), of
+its command line and of every file it wrote. On the next run the step is
+skipped when all of these still match, so editing only
+05_visualizations.py reruns only the visualizations, while a change to
+data/raw data/ reruns everything downstream of the cleaning step.
+
+Hashes are reused while a file's size and modification time are
+unchanged, so checking an up-to-date step does not re-read large outputs
+such as the database.
+"""
+
+import json
+import os
+import re
+
+from pipeline.cache import file_digest
+
+MANIFEST_DIR = 'data/manifests'
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_PATTERN = re.compile(r'^\s*(?:from|import)\s+pipeline\.(\w+)', re.MULTILINE)
+
+
+def manifest_path(step, manifest_dir=MANIFEST_DIR):
+    return os.path.join(manifest_dir, f"{step.key}.json")
+
+
+def code_files(script):
+    """The script plus every pipeline module it imports, directly or not."""
+    files = [script]
+    if not script.endswith('.py'):
+        return files
+
+    seen = set()
+    pending = [script]
+    while pending:
+        with open(pending.pop(), 'r', encoding='utf-8') as f:
+            source = f.read()
+        for module in IMPORT_PATTERN.findall(source):
+            path = os.path.join(PACKAGE_DIR, f"{module}.py")
+            if module not in seen and os.path.exists(path):
+                seen.add(module)
+                pending.append(path)
+    return files + [os.path.relpath(os.path.join(PACKAGE_DIR, f"{module}.py"))
+                    for module in sorted(seen)]
+
+
+def expand_paths(paths):
+    """Files under the given paths (directories recursively), sorted.
+
+    A declared path that does not exist is kept as is, so that its
+    appearance also counts as a change.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path.rstrip('/'))
+    return files
+
+
+def digest_files(paths, known=None):
+    """{file: [size, mtime_ns, sha256]} for the files under paths (None if missing).
+
+    `known` is an earlier result whose hashes are reused for files with an
+    unchanged size and modification time.
+    """
+    known = known or {}
+    digests = {}
+    for path in expand_paths(paths):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            digests[path] = None
+            continue
+        previous = known.get(path)
+        if previous and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+            digests[path] = previous
+        else:
+            digests[path] = [stat.st_size, stat.st_mtime_ns, file_digest(path)]
+    return digests
+
+
+def load_manifest(step, manifest_dir=MANIFEST_DIR):
+    try:
+        with open(manifest_path(step, manifest_dir), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def step_state(step, command, manifest=None):
+    """What the step would run with now: its command, input and code hashes."""
+    manifest = manifest or {}
+    return {
+        'command': list(command),
+        'inputs': digest_files(step.inputs, manifest.get('inputs')),
+        'code': digest_files(code_files(step.script), manifest.get('code')),
+    }
+
+
+def changed_files(before, after):
+    """Files whose content differs between two digest_files() results."""
+    before = {path: entry and entry[2] for path, entry in before.items()}
+    after = {path: entry and entry[2] for path, entry in after.items()}
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+def stale_reason(step, state, manifest):
+    """Why the step has to run, or None when it is up to date."""
+    if manifest is None:
+        return "no previous run recorded"
+    if state['command'] != manifest['command']:
+        return "command changed"
+    for kind in ('code', 'inputs'):
+        changed = changed_files(manifest[kind], state[kind])
+        if changed:
+            more = f" (+{len(changed) - 1} more)" if len(changed) > 1 else ''
+            return f"{'code' if kind == 'code' else 'input'} changed: {changed[0]}{more}"
+    changed = changed_files(manifest['outputs'], digest_files(step.outputs, manifest['outputs']))
+    if changed:
+        return f"output missing or modified: {changed[0]}"
+    return None
+
+
+def save_manifest(step, state, manifest_dir=MANIFEST_DIR):
+    """Record a successful run of the step with the state it ran with."""
+    os.makedirs(manifest_dir, exist_ok=True)
+    manifest = dict(state, step=step.name, outputs=digest_files(step.outputs))
+    path = manifest_path(step, manifest_dir)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def clear_manifest(step, manifest_dir=MANIFEST_DIR):
+    """Forget the step's last run, so the next run executes it."""
+    try:
+        os.remove(manifest_path(step, manifest_dir))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,169 @@
+"""
+Memory-mapped student x course grade-point matrix.
+
+The cleaning stage writes data/cleaned/grade_matrix.npy: one int8 row per
+student and one column per (course, semester) taken, holding grade
+points, or MISSING where the student did not take the course that
+semester. A retake in a later semester therefore gets its own column
+instead of overwriting the earlier grade. Row and column labels are
+stored in plain text index files (a course code and a semester per
+column). Rows follow the hall_ticket categories of the
+compact grades table, which the cleaning stage keys by the persisted
+student keys, so a student's row number is their student key. A student
+who has left the batch keeps an all-MISSING row.
+
+Readers open the matrix with np.load(mmap_mode='r'); selecting a student
+row or a course column is a zero-copy view of the mapped file.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipeline.compact import student_keys
+from pipeline.storage import CLEANED_DIR
+
+MATRIX_FILE = 'grade_matrix.npy'
+STUDENT_INDEX_FILE = 'grade_matrix_students.txt'
+COURSE_INDEX_FILE = 'grade_matrix_courses.txt'
+SEMESTER_INDEX_FILE = 'grade_matrix_semesters.txt'
+
+MISSING = -1
+
+# Rows processed per block when computing statistics over the mapped file
+BLOCK_ROWS = 1 << 16
+
+
+def _write_index(path, labels):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(f"{label}\n" for label in labels)
+
+
+def _read_index(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return pd.Index([line.rstrip('\n') for line in f])
+
+
+def write_grade_matrix(grades, cleaned_dir=CLEANED_DIR):
+    """Persist a compact grades table as a memory-mapped grade matrix.
+
+    Columns are the (course, semester) pairs present in the table, sorted
+    by course then semester. The grades table holds one row per student,
+    course and semester, so every grade gets its own cell.
+    """
+    hall_tickets = grades['hall_ticket'].cat.categories
+    course_codes = grades['course_code'].cat.categories
+    semesters = grades['semester'].cat.categories
+
+    pairs = (grades['course_code'].cat.codes.to_numpy().astype(np.int64) * len(semesters)
+             + grades['semester'].cat.codes.to_numpy())
+    columns, column_of_row = np.unique(pairs, return_inverse=True)
+
+    matrix = np.lib.format.open_memmap(
+        os.path.join(cleaned_dir, MATRIX_FILE), mode='w+', dtype=np.int8,
+        shape=(len(hall_tickets), len(columns))
+    )
+    matrix[:] = MISSING
+    matrix[student_keys(grades).to_numpy(), column_of_row] = grades['grade_points'].to_numpy()
+    matrix.flush()
+    del matrix
+
+    _write_index(os.path.join(cleaned_dir, STUDENT_INDEX_FILE), hall_tickets)
+    _write_index(os.path.join(cleaned_dir, COURSE_INDEX_FILE), course_codes[columns // len(semesters)])
+    _write_index(os.path.join(cleaned_dir, SEMESTER_INDEX_FILE), semesters[columns % len(semesters)])
+
+
+class GradeMatrix:
+    """Read-only view of the persisted grade matrix and its labels."""
+
+    def __init__(self, cleaned_dir=CLEANED_DIR):
+        self.values = np.load(os.path.join(cleaned_dir, MATRIX_FILE), mmap_mode='r')
+        self.hall_tickets = _read_index(os.path.join(cleaned_dir, STUDENT_INDEX_FILE))
+        # Course code and semester of each column; a course repeats when
+        # it was taken in several semesters
+        self.course_codes = _read_index(os.path.join(cleaned_dir, COURSE_INDEX_FILE))
+        self.semesters = _read_index(os.path.join(cleaned_dir, SEMESTER_INDEX_FILE))
+        self.columns = pd.MultiIndex.from_arrays([self.course_codes, self.semesters],
+                                                 names=['course_code', 'semester'])
+
+    def student(self, hall_ticket):
+        """Grade points of one student across all columns (a view)."""
+        return self.values[self.hall_tickets.get_loc(hall_ticket)]
+
+    def course(self, course_code, semester=None):
+        """Grade points of all students for one course (a strided view).
+
+        `semester` may be left out when the course was taken in a single
+        semester only.
+        """
+        if semester is not None:
+            return self.values[:, self.columns.get_loc((course_code, semester))]
+        columns = np.flatnonzero(self.course_codes == course_code)
+        if len(columns) == 0:
+            raise KeyError(course_code)
+        if len(columns) > 1:
+            raise KeyError(f"{course_code!r} was taken in several semesters "
+                           f"({', '.join(self.semesters[columns])}); pass one of them")
+        return self.values[:, columns[0]]
+
+    def course_stats(self, by_semester=False):
+        """Per-course count, mean, std, min, max and fail count.
+
+        Counts every grade: a student who retook a course in another
+        semester counts once per semester, as in the grades table. With
+        `by_semester` the result has one row per (course, semester).
+
+        Walks the mapped file in blocks of rows so memory stays bounded;
+        sums are accumulated exactly in int64. A fail is a grade worth
+        0 points, which only F is.
+        """
+        n_courses = len(self.course_codes)
+        count = np.zeros(n_courses, dtype=np.int64)
+        total = np.zeros(n_courses, dtype=np.int64)
+        total_sq = np.zeros(n_courses, dtype=np.int64)
+        fails = np.zeros(n_courses, dtype=np.int64)
+        low = np.full(n_courses, np.iinfo(np.int8).max, dtype=np.int8)
+        high = np.full(n_courses, MISSING, dtype=np.int8)
+
+        for start in range(0, self.values.shape[0], BLOCK_ROWS):
+            block = self.values[start:start + BLOCK_ROWS]
+            taken = block != MISSING
+            points = np.where(taken, block, 0).astype(np.int64)
+
+            count += taken.sum(axis=0)
+            total += points.sum(axis=0)
+            total_sq += (points * points).sum(axis=0)
+            fails += (taken & (block == 0)).sum(axis=0)
+            low = np.minimum(low, np.where(taken, block, np.iinfo(np.int8).max).min(axis=0))
+            high = np.maximum(high, block.max(axis=0))
+
+        index = self.columns
+        if not by_semester:
+            # Fold the semester columns of each course together
+            index, group = np.unique(self.course_codes.to_numpy(dtype=object), return_inverse=True)
+            index = pd.Index(index, name='course_code')
+            folded = []
+            for column in (count, total, total_sq, fails):
+                sums = np.zeros(len(index), dtype=np.int64)
+                np.add.at(sums, group, column)
+                folded.append(sums)
+            count, total, total_sq, fails = folded
+            folded_low = np.full(len(index), np.iinfo(np.int8).max, dtype=np.int8)
+            folded_high = np.full(len(index), MISSING, dtype=np.int8)
+            np.minimum.at(folded_low, group, low)
+            np.maximum.at(folded_high, group, high)
+            low, high = folded_low, folded_high
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            variance = (total_sq - total * mean) / (count - 1)
+
+        return pd.DataFrame({
+            'n_students': count,
+            'mean_points': mean,
+            'std_points': np.sqrt(np.clip(variance, 0, None)),
+            'min_points': low,
+            'max_points': high,
+            'fail_count': fails,
+        }, index=index)
@@ -0,0 +1,140 @@
+"""
+Result cache for the SQL analysis queries.
+
+A result is keyed by the engine, the whitespace-normalized SQL text, the
+bound parameter values and the versions of the tables the query reads (see table_fingerprints() on
+the engines in pipeline.engines). Results are stored as Parquet under
+data/cache/queries/, so a re-run against an unchanged database serves
+every query from disk without touching the engine. A small manifest
+remembers which key each export was last written from, so unchanged
+exports are not rewritten either.
+
+An index (results.json) records the engine and table versions behind
+every key. Whenever the cache is opened or saved, entries for this
+engine whose table versions no longer match the database are dropped,
+so each reload does not leave its old results behind for good.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+from pipeline.cache import CACHE_DIR
+
+QUERY_CACHE_DIR = os.path.join(CACHE_DIR, 'queries')
+EXPORTS_MANIFEST = 'exports.json'
+RESULTS_INDEX = 'results.json'
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so formatting-only edits keep the same key."""
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def referenced_tables(sql, tables):
+    """The subset of `tables` named in sql (all of them if none match)."""
+    found = [name for name in tables if re.search(rf'\b{re.escape(name)}\b', sql, re.IGNORECASE)]
+    return sorted(found) or sorted(tables)
+
+
+class QueryCache:
+    """Parquet-backed cache of query results plus an export manifest."""
+
+    def __init__(self, engine_name, fingerprints, tables, cache_dir=QUERY_CACHE_DIR):
+        self.engine_name = engine_name
+        self.fingerprints = fingerprints
+        self.tables = tables
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Versions as they read back from JSON (tuples become lists)
+        self.versions = json.loads(json.dumps(fingerprints, default=str))
+        self.pending = {}
+
+        self.manifest_path = os.path.join(cache_dir, EXPORTS_MANIFEST)
+        self.manifest = _read_json(self.manifest_path)
+        self.index_path = os.path.join(cache_dir, RESULTS_INDEX)
+        self.index = _read_json(self.index_path)
+        self.prune()
+
+    def key(self, sql, params=None):
+        """Cache key for sql run with params, or None when a table it reads has no version."""
+        tables = referenced_tables(sql, self.tables)
+        if any(name not in self.fingerprints for name in tables):
+            return None
+        payload = json.dumps({
+            'engine': self.engine_name,
+            'sql': normalize_sql(sql),
+            'params': params or {},
+            'tables': {name: self.fingerprints[name] for name in tables},
+        }, sort_keys=True, default=str)
+        key = hashlib.sha256(payload.encode()).hexdigest()
+        self.pending[key] = {'engine': self.engine_name,
+                             'tables': {name: self.versions[name] for name in tables}}
+        return key
+
+    def remember(self, key):
+        if key in self.pending:
+            self.index[key] = self.pending[key]
+
+    def is_stale(self, entry):
+        """True when an index entry of this engine was built from other table versions."""
+        return entry['engine'] == self.engine_name and any(
+            self.versions.get(name) != version for name, version in entry['tables'].items())
+
+    def prune(self):
+        """Drop stale results and exports, and result files missing from the index."""
+        self.index = {key: entry for key, entry in self.index.items() if not self.is_stale(entry)}
+        self.manifest = {output_file: key for output_file, key in self.manifest.items()
+                         if key in self.index}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.parquet') and name[:-len('.parquet')] not in self.index:
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key):
+        """Return the cached DataFrame for key, or None on a miss."""
+        if key is None or not os.path.exists(self.path(key)):
+            return None
+        return pd.read_parquet(self.path(key))
+
+    def put(self, key, df):
+        if key is None:
+            return
+        tmp = f"{self.path(key)}.tmp-{os.getpid()}"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.path(key))
+        self.remember(key)
+
+    def export_is_current(self, output_file, key):
+        """True when output_file exists and was last written from key."""
+        return key is not None and self.manifest.get(output_file) == key and os.path.exists(output_file)
+
+    def mark_exported(self, output_file, key):
+        if key is not None:
+            self.manifest[output_file] = key
+            self.remember(key)
+
+    def save(self):
+        self.prune()
+        _write_json(self.index_path, self.index)
+        _write_json(self.manifest_path, self.manifest)
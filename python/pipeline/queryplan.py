@@ -0,0 +1,162 @@
+"""
+Query plan capture and slow-query instrumentation for SQLite.
+
+profile_queries() runs each analysis query once on its own connection and
+records, per query:
+
+- the EXPLAIN QUERY PLAN rows, split into full scans, index searches and
+  temp B-trees (sorts/groupings SQLite could not serve from an index)
+- wall time, rows returned, an estimate of rows scanned (the row counts of
+  the fully scanned tables) and the number of VM steps executed
+- flags for full scans and temp B-trees over tables above a row threshold,
+  and for queries slower than a time threshold
+
+The report is written as JSON so runs can be diffed when queries change.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from pipeline.sqlload import DB_PATH, table_versions
+
+PLAN_REPORT = 'docs/reports/query_plan_report.json'
+
+# Flag full scans / temp B-trees over tables with at least this many rows
+SCAN_THRESHOLD = 10_000
+
+# Flag queries slower than this
+SLOW_MS = 500
+
+# The progress handler fires every PROGRESS_STEP VM instructions
+PROGRESS_STEP = 1000
+
+PLAN_PATTERN = re.compile(r'^(SCAN|SEARCH) (\S+)(?: USING (?:COVERING )?INDEX (\w+)| USING (INTEGER PRIMARY KEY))?')
+TEMP_BTREE_PATTERN = re.compile(r'^USE TEMP B-TREE FOR (.+)$')
+TABLE_ALIAS_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+
+SQL_KEYWORDS = {'where', 'join', 'on', 'group', 'order', 'left', 'right', 'inner', 'outer',
+                'cross', 'limit', 'having', 'union', 'using', 'natural', 'window'}
+
+
+def table_aliases(sql):
+    """Map each alias (and table name) in FROM/JOIN clauses to its table."""
+    aliases = {}
+    for table, alias in TABLE_ALIAS_PATTERN.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def query_plan(conn, sql, params=None):
+    """Return the EXPLAIN QUERY PLAN detail strings for sql."""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params or {})]
+
+
+def classify_plan(plan, aliases):
+    """Split plan details into scans, searches and temp B-trees."""
+    scans, searches, temp_btrees = [], [], []
+    for detail in plan:
+        if (match := PLAN_PATTERN.match(detail)):
+            kind, name, index, rowid = match.groups()
+            entry = {'table': aliases.get(name, name), 'index': index or rowid}
+            (scans if kind == 'SCAN' else searches).append(entry)
+        elif (match := TEMP_BTREE_PATTERN.match(detail)):
+            temp_btrees.append(match.group(1))
+    return scans, searches, temp_btrees
+
+
+def table_row_counts(conn):
+    """Row count per table, from _table_versions when the loader wrote it."""
+    counts = {name: rows for name, (rows, _) in table_versions(conn).items()}
+    tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    for (name,) in tables:
+        if name not in counts:
+            counts[name] = conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+    return counts
+
+
+def profile_query(conn, sql, row_counts, scan_threshold=SCAN_THRESHOLD, slow_ms=SLOW_MS, params=None):
+    """Plan, run and time one query; returns its report entry."""
+    plan = query_plan(conn, sql, params)
+    scans, searches, temp_btrees = classify_plan(plan, table_aliases(sql))
+
+    steps = [0]
+
+    def count_steps():
+        steps[0] += 1
+        return 0
+
+    conn.set_progress_handler(count_steps, PROGRESS_STEP)
+    start = time.perf_counter()
+    rows = conn.execute(sql, params or {}).fetchall()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    conn.set_progress_handler(None, PROGRESS_STEP)
+
+    scanned = [entry['table'] for entry in scans if entry['table'] in row_counts]
+    touched = scanned + [entry['table'] for entry in searches if entry['table'] in row_counts]
+    largest = max((row_counts[table] for table in touched), default=0)
+
+    flags = []
+    for table in scanned:
+        if row_counts[table] >= scan_threshold:
+            flags.append(f"full scan of {table} ({row_counts[table]} rows)")
+    if temp_btrees and largest >= scan_threshold:
+        flags.extend(f"temp B-tree for {purpose} over {largest} rows" for purpose in temp_btrees)
+    if elapsed_ms >= slow_ms:
+        flags.append(f"slow: {elapsed_ms:.0f} ms")
+
+    return {
+        'elapsed_ms': round(elapsed_ms, 3),
+        'rows_returned': len(rows),
+        'rows_scanned_estimate': sum(row_counts[table] for table in scanned),
+        'vm_steps': steps[0] * PROGRESS_STEP,
+        'index_used': any(entry['index'] for entry in scans + searches),
+        'indexes': sorted({entry['index'] for entry in scans + searches if entry['index']}),
+        'full_scans': [entry for entry in scans if entry['table'] in row_counts],
+        'searches': searches,
+        'temp_btrees': temp_btrees,
+        'plan': plan,
+        'flags': flags,
+    }
+
+
+def profile_queries(queries, params=None, db_path=DB_PATH, scan_threshold=SCAN_THRESHOLD, slow_ms=SLOW_MS):
+    """Profile catalog queries one at a time with params bound.
+
+    Returns the report as a dict; queries that fail are recorded with
+    their error instead of a plan.
+    """
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        row_counts = table_row_counts(conn)
+        entries = []
+        for query in queries:
+            bound = query.bind(params)
+            entry = {'query': query.number, 'id': query.id, 'name': query.title, 'params': bound}
+            try:
+                entry.update(profile_query(conn, query.sql, row_counts, scan_threshold, slow_ms, bound))
+            except sqlite3.Error as e:
+                entry['error'] = str(e)
+            entries.append(entry)
+    finally:
+        conn.close()
+
+    return {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'database': db_path,
+        'thresholds': {'scan_rows': scan_threshold, 'slow_ms': slow_ms},
+        'table_rows': row_counts,
+        'queries': entries,
+        'flagged': [entry['query'] for entry in entries if entry.get('flags') or 'error' in entry],
+    }
+
+
+def write_plan_report(report, path=PLAN_REPORT):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,86 @@
+"""
+Dialect-aware access to the declared schema in sql/01_schema.sql.
+
+The schema file is the single source of truth for column types, primary
+keys and indexes. Its DROP statements use Postgres-only CASCADE, so they
+are ignored here and regenerated per dialect; CREATE TABLE and CREATE INDEX
+statements are portable across SQLite, Postgres and DuckDB as written.
+"""
+
+import re
+
+SCHEMA_PATH = 'sql/01_schema.sql'
+
+DIALECTS = ('sqlite', 'postgresql', 'duckdb')
+
+TABLE_PATTERN = re.compile(r'CREATE\s+TABLE\s+(\w+)', re.IGNORECASE)
+INDEX_PATTERN = re.compile(r'CREATE\s+INDEX\s+(\w+)\s+ON\s+(\w+)', re.IGNORECASE)
+TABLE_KEY_PATTERN = re.compile(r'PRIMARY\s+KEY\s*\(([^)]*)\)', re.IGNORECASE)
+COLUMN_KEY_PATTERN = re.compile(r'^\s*(\w+)\s+[^,\n]*?\bPRIMARY\s+KEY\b', re.IGNORECASE | re.MULTILINE)
+
+
+def split_statements(sql):
+    """Split a SQL script into statements, dropping `--` comment lines."""
+    sql = '\n'.join(line for line in sql.splitlines() if not line.strip().startswith('--'))
+    return [s.strip() for s in sql.split(';') if s.strip()]
+
+
+class Schema:
+    """Tables and indexes declared in a schema file, rendered per dialect."""
+
+    def __init__(self, path=SCHEMA_PATH):
+        with open(path, 'r') as f:
+            statements = split_statements(f.read())
+
+        # Table name -> CREATE TABLE statement, in declaration order
+        self.tables = {}
+        # Index name -> (table, CREATE INDEX statement)
+        self.indexes = {}
+        for statement in statements:
+            if (match := TABLE_PATTERN.match(statement)):
+                self.tables[match.group(1)] = statement
+            elif (match := INDEX_PATTERN.match(statement)):
+                self.indexes[match.group(1)] = (match.group(2), statement)
+
+    def primary_key(self, table):
+        """Return the declared primary key columns of a table as a list."""
+        statement = self.tables[table]
+        if (match := TABLE_KEY_PATTERN.search(statement)):
+            return [col.strip() for col in match.group(1).split(',')]
+        if (match := COLUMN_KEY_PATTERN.search(statement)):
+            return [match.group(1)]
+        return []
+
+    def drop_statements(self, dialect='sqlite'):
+        """DROP statements, dependents first (reverse declaration order)."""
+        check_dialect(dialect)
+        cascade = ' CASCADE' if dialect == 'postgresql' else ''
+        return [f'DROP TABLE IF EXISTS {name}{cascade}' for name in reversed(list(self.tables))]
+
+    def table_statements(self, dialect='sqlite'):
+        """CREATE TABLE statements with declared types and keys."""
+        check_dialect(dialect)
+        return list(self.tables.values())
+
+    def index_statements(self, dialect='sqlite', tables=None):
+        """CREATE INDEX statements, optionally limited to some tables."""
+        check_dialect(dialect)
+        return [statement for table, statement in self.indexes.values()
+                if tables is None or table in tables]
+
+    def create(self, conn, dialect='sqlite'):
+        """Drop and recreate every declared table (without indexes) on conn."""
+        for statement in self.drop_statements(dialect) + self.table_statements(dialect):
+            conn.execute(statement)
+
+    def create_indexes(self, conn, dialect='sqlite', tables=None):
+        """Build the declared indexes on conn; returns how many were built."""
+        statements = self.index_statements(dialect, tables)
+        for statement in statements:
+            conn.execute(statement)
+        return len(statements)
+
+
+def check_dialect(dialect):
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unsupported dialect {dialect!r}; expected one of {DIALECTS}")
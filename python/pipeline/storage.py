@@ -0,0 +1,166 @@
+"""
+Typed storage for the cleaned tables.
+
+The cleaning stage writes every table to data/cleaned/ both as CSV (for
+people and tools that expect it) and as zstd-compressed Parquet with an
+explicit schema. Downstream stages read the Parquet copy with column
+projection, so they skip CSV parsing and type inference entirely.
+
+Student keys: data/cleaned/student_keys.txt lists every hall ticket ever
+cleaned, one per line, and a student's line number is their integer
+key. The list is append-only, so keys never change between runs; the
+grades table is always read back with its hall_ticket categories in
+that order (see pipeline.compact).
+
+When several stages run in one process (RUN_ALL_ANALYSIS.py --in-process),
+keep_in_memory() keeps each table as an Arrow table once written or read,
+and later reads convert it straight to a DataFrame without touching disk.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pipeline.compact import compact_grades
+
+CLEANED_DIR = 'data/cleaned'
+
+STUDENT_KEYS_FILE = 'student_keys.txt'
+
+PARQUET_COMPRESSION = 'zstd'
+
+# Dictionary-encoded string column (read back by pandas as a categorical)
+DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+ORDERED_DICT_STRING = pa.dictionary(pa.int32(), pa.string(), ordered=True)
+
+SCHEMAS = {
+    'students': pa.schema([
+        ('hall_ticket', pa.string()),
+        ('student_name', pa.string()),
+        ('father_name', pa.string()),
+        ('mother_name', pa.string()),
+        ('program', pa.string()),
+    ]),
+    'subjects': pa.schema([
+        ('course_code', pa.string()),
+        ('course_title', pa.string()),
+        ('credits', pa.int32()),
+    ]),
+    'grades': pa.schema([
+        ('hall_ticket', DICT_STRING),
+        ('course_code', DICT_STRING),
+        ('grade', ORDERED_DICT_STRING),
+        ('result', DICT_STRING),
+        ('credits', pa.int8()),
+        ('semester', DICT_STRING),
+        ('grade_points', pa.int8()),
+    ]),
+    'performance': pa.schema([
+        ('hall_ticket', pa.string()),
+        ('semester', pa.string()),
+        ('sgpa', pa.float64()),
+        ('result', pa.string()),
+        ('total_subjects', pa.int32()),
+        ('performance_category', pa.string()),
+        ('avg_grade_points', pa.float64()),
+        ('min_grade_points', pa.int32()),
+        ('max_grade_points', pa.int32()),
+        ('std_grade_points', pa.float64()),
+        ('fail_count', pa.int32()),
+    ]),
+    'subject_performance': pa.schema([
+        ('course_code', pa.string()),
+        ('passed', pa.int32()),
+        ('total_enrolled', pa.int32()),
+        ('avg_grade_points', pa.float64()),
+        ('pass_rate', pa.float64()),
+        ('fail_count', pa.int32()),
+        ('course_title', pa.string()),
+    ]),
+}
+
+# Arrow tables by Parquet path while keep_in_memory() is on, else None
+_memory = None
+
+
+def keep_in_memory(enabled=True):
+    """Serve read_cleaned() from tables kept in this process (see module docstring)."""
+    global _memory
+    _memory = {} if enabled else None
+
+
+def cleaned_path(name, ext, cleaned_dir=CLEANED_DIR):
+    return os.path.join(cleaned_dir, f"{name}.{ext}")
+
+
+def read_student_keys(cleaned_dir=CLEANED_DIR):
+    """The persisted hall tickets in key order, or None before the first run."""
+    try:
+        with open(os.path.join(cleaned_dir, STUDENT_KEYS_FILE), 'r', encoding='utf-8') as f:
+            return pd.Index([line.rstrip('\n') for line in f], dtype=object)
+    except FileNotFoundError:
+        return None
+
+
+def update_student_keys(hall_tickets, cleaned_dir=CLEANED_DIR):
+    """Give every new hall ticket the next free key; returns all hall tickets in key order.
+
+    Existing keys are never changed or reused. New hall tickets are
+    appended in sorted order, so a first run keys students alphabetically.
+    """
+    known = read_student_keys(cleaned_dir)
+    if known is None:
+        known = pd.Index([], dtype=object)
+    new = pd.Index(pd.unique(pd.Series(hall_tickets, dtype=str))).difference(known).sort_values()
+    if len(new) == 0:
+        return known
+
+    keys = known.append(new)
+    path = os.path.join(cleaned_dir, STUDENT_KEYS_FILE)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.writelines(f"{hall_ticket}\n" for hall_ticket in keys)
+    os.replace(tmp, path)
+    return keys
+
+
+def write_cleaned(name, df, cleaned_dir=CLEANED_DIR):
+    """Write a cleaned table as CSV and as typed Parquet."""
+    df.to_csv(cleaned_path(name, 'csv', cleaned_dir), index=False)
+
+    table = pa.Table.from_pandas(df, schema=SCHEMAS[name], preserve_index=False)
+    parquet_file = cleaned_path(name, 'parquet', cleaned_dir)
+    pq.write_table(table, parquet_file, compression=PARQUET_COMPRESSION)
+    if _memory is not None:
+        _memory[parquet_file] = table
+
+
+def read_cleaned(name, columns=None, cleaned_dir=CLEANED_DIR):
+    """Read a cleaned table, loading only `columns` when given.
+
+    Uses the Parquet copy when present and falls back to the CSV (with
+    string columns kept as strings) for outputs from older runs. The grades
+    table is always returned in its compact form (see pipeline.compact),
+    keyed by the persisted student keys when they exist.
+    """
+    parquet_file = cleaned_path(name, 'parquet', cleaned_dir)
+    if _memory is not None and parquet_file not in _memory and os.path.exists(parquet_file):
+        _memory[parquet_file] = pq.read_table(parquet_file)
+
+    if _memory is not None and parquet_file in _memory:
+        table = _memory[parquet_file]
+        df = (table.select(columns) if columns is not None else table).to_pandas()
+    elif os.path.exists(parquet_file):
+        df = pd.read_parquet(parquet_file, columns=columns)
+    else:
+        string_columns = {field.name: str for field in SCHEMAS[name]
+                          if pa.types.is_string(field.type) or pa.types.is_dictionary(field.type)}
+        df = pd.read_csv(cleaned_path(name, 'csv', cleaned_dir), usecols=columns,
+                         dtype=string_columns, float_precision='round_trip')
+
+    if name == 'grades':
+        df = compact_grades(df, read_student_keys(cleaned_dir) if 'hall_ticket' in df else None)
+
+    return df
@@ -0,0 +1,175 @@
+"""
+Materialized summary tables for the analysis queries.
+
+Each summary is one GROUP BY over a base table, per semester and program
+(the cohort dimensions the analysis queries filter on) and its group column:
+
+- subject_stats: per-course enrolment, pass/fail, grade-point and per-grade
+  counts (grades JOIN subjects)
+- grade_distribution: count per grade (grades)
+- class_stats: per-category SGPA count, sum, sum of squares, min and max
+  plus pass/promoted counts (performance)
+
+Program comes from students ('' for rows without one). The loader
+refreshes the summaries in the same transaction as the base tables: fully
+after a bulk load, and only for the groups touched by changed rows after
+an incremental load. Queries reading them cost the same however
+large the grades table grows. The SELECTs are plain SQL, so DuckDB can use
+them as views or to fill its own copies.
+"""
+
+import hashlib
+
+SUBJECT_STATS = '''
+SELECT
+    g.semester,
+    COALESCE(s.program, '') AS program,
+    g.course_code,
+    sub.course_title,
+    COUNT(*) AS total_enrolled,
+    SUM(CASE WHEN g.result = 'PASS' THEN 1 ELSE 0 END) AS passed,
+    SUM(CASE WHEN g.result = 'FAIL' THEN 1 ELSE 0 END) AS failed,
+    SUM(g.grade_points) AS grade_points_sum,
+    COUNT(g.grade_points) AS grade_points_count,
+    SUM(CASE WHEN g.grade = 'O' THEN 1 ELSE 0 END) AS o_count,
+    SUM(CASE WHEN g.grade = 'A+' THEN 1 ELSE 0 END) AS a_plus_count,
+    SUM(CASE WHEN g.grade = 'A' THEN 1 ELSE 0 END) AS a_count,
+    SUM(CASE WHEN g.grade = 'B+' THEN 1 ELSE 0 END) AS b_plus_count,
+    SUM(CASE WHEN g.grade = 'B' THEN 1 ELSE 0 END) AS b_count,
+    SUM(CASE WHEN g.grade = 'C' THEN 1 ELSE 0 END) AS c_count,
+    SUM(CASE WHEN g.grade = 'D' THEN 1 ELSE 0 END) AS d_count,
+    SUM(CASE WHEN g.grade = 'F' THEN 1 ELSE 0 END) AS f_count
+FROM grades g
+JOIN subjects sub ON g.course_code = sub.course_code
+LEFT JOIN students s ON g.hall_ticket = s.hall_ticket
+{where}
+GROUP BY g.semester, COALESCE(s.program, ''), g.course_code, sub.course_title
+'''
+
+GRADE_DISTRIBUTION = '''
+SELECT
+    g.semester,
+    COALESCE(s.program, '') AS program,
+    g.grade,
+    COUNT(*) AS grade_count
+FROM grades g
+LEFT JOIN students s ON g.hall_ticket = s.hall_ticket
+{where}
+GROUP BY g.semester, COALESCE(s.program, ''), g.grade
+'''
+
+CLASS_STATS = '''
+SELECT
+    p.semester,
+    COALESCE(s.program, '') AS program,
+    p.performance_category,
+    COUNT(*) AS student_count,
+    COUNT(p.sgpa) AS sgpa_count,
+    SUM(p.sgpa) AS sgpa_sum,
+    SUM(p.sgpa * p.sgpa) AS sgpa_sq_sum,
+    MIN(p.sgpa) AS min_sgpa,
+    MAX(p.sgpa) AS max_sgpa,
+    SUM(CASE WHEN p.sgpa IS NOT NULL AND p.result = 'PASS' THEN 1 ELSE 0 END) AS passed,
+    SUM(CASE WHEN p.sgpa IS NOT NULL AND p.result = 'PROMOTED' THEN 1 ELSE 0 END) AS promoted
+FROM performance p
+LEFT JOIN students s ON p.hall_ticket = s.hall_ticket
+{where}
+GROUP BY p.semester, COALESCE(s.program, ''), p.performance_category
+'''
+
+# name -> (SELECT, group column, filter expression, {source table: its group column})
+#
+# A source may instead give (column, SELECT) when its rows do not carry the
+# group column: the SELECT maps the changed values of `column`, held in
+# temp.summary_source, to the groups they belong to. A student changing
+# program moves every course, grade and category that student has.
+SUMMARIES = {
+    'subject_stats': (SUBJECT_STATS, 'course_code', 'g.course_code',
+                      {'grades': 'course_code', 'subjects': 'course_code',
+                       'students': ('hall_ticket', 'SELECT course_code FROM grades '
+                                    'WHERE hall_ticket IN (SELECT value FROM temp.summary_source)')}),
+    'grade_distribution': (GRADE_DISTRIBUTION, 'grade', 'g.grade',
+                           {'grades': 'grade',
+                            'students': ('hall_ticket', 'SELECT grade FROM grades '
+                                         'WHERE hall_ticket IN (SELECT value FROM temp.summary_source)')}),
+    'class_stats': (CLASS_STATS, 'performance_category', 'p.performance_category',
+                    {'performance': 'performance_category',
+                     'students': ('hall_ticket', 'SELECT performance_category FROM performance '
+                                  'WHERE hall_ticket IN (SELECT value FROM temp.summary_source)')}),
+}
+
+
+def summary_select(name, where=''):
+    """The SELECT that computes summary `name`, optionally filtered."""
+    select, _, _, _ = SUMMARIES[name]
+    return select.format(where=where).strip()
+
+
+def tracked_columns(table):
+    """Group columns of `table` whose changes invalidate some summary."""
+    return sorted({source_column(column) for _, _, _, sources in SUMMARIES.values()
+                   for source, column in sources.items() if source == table})
+
+
+def source_column(column):
+    """The tracked column of a source entry in SUMMARIES."""
+    return column[0] if isinstance(column, tuple) else column
+
+
+def source_groups(conn, column, values):
+    """Map changed values of a source column to the summary groups they touch."""
+    if not isinstance(column, tuple) or not values:
+        return set(values)
+    _, mapping = column
+    conn.execute('DROP TABLE IF EXISTS temp.summary_source')
+    conn.execute('CREATE TEMP TABLE summary_source (value)')
+    conn.executemany('INSERT INTO temp.summary_source VALUES (?)', [(value,) for value in values])
+    groups = {row[0] for row in conn.execute(mapping).fetchall()}
+    conn.execute('DROP TABLE temp.summary_source')
+    return groups
+
+
+def refresh_summaries(conn, affected=None):
+    """Recompute the summary tables on conn (inside the caller's transaction).
+
+    With affected=None every summary is rebuilt. Otherwise `affected` maps
+    (table, column) to the set of group values touched by changed rows, and
+    only those groups are deleted and recomputed (run it after the base
+    tables are updated, so mapped sources see the new rows). Returns {summary: groups
+    refreshed}, with None meaning a full rebuild.
+    """
+    refreshed = {}
+    for name, (select, key, filter_expr, sources) in SUMMARIES.items():
+        if affected is None:
+            conn.execute(f'DELETE FROM {name}')
+            conn.execute(f'INSERT INTO {name} {summary_select(name)}')
+            refreshed[name] = None
+            continue
+
+        groups = set()
+        for source, column in sources.items():
+            groups |= source_groups(conn, column, affected.get((source, source_column(column)), set()))
+        if not groups:
+            continue
+
+        conn.execute('DROP TABLE IF EXISTS temp.summary_keys')
+        conn.execute('CREATE TEMP TABLE summary_keys (value)')
+        conn.executemany('INSERT INTO temp.summary_keys VALUES (?)', [(value,) for value in groups])
+        conn.execute(f'DELETE FROM {name} WHERE {key} IN (SELECT value FROM temp.summary_keys)')
+        where = f'WHERE {filter_expr} IN (SELECT value FROM temp.summary_keys)'
+        conn.execute(f'INSERT INTO {name} {summary_select(name, where)}')
+        conn.execute('DROP TABLE temp.summary_keys')
+        refreshed[name] = len(groups)
+    return refreshed
+
+
+def summary_fingerprint(name, fingerprints):
+    """Version of a summary derived from its source tables' versions.
+
+    Returns None when a source table has no version.
+    """
+    sources = sorted(SUMMARIES[name][3])
+    if any(source not in fingerprints for source in sources):
+        return None
+    payload = '|'.join(f"{source}={fingerprints[source]}" for source in sources)
+    return hashlib.sha256(f"{name}:{payload}".encode()).hexdigest()
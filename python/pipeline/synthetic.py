@@ -0,0 +1,260 @@
+"""
+Synthetic raw batches for scale testing.
+
+generate_records() yields student records in the exact layout of
+data/raw data/batch_student_data.json (student.hallTicket/name/...,
+semesters[].subjects[].courseCode/courseTitle/credits/grade/result, sgpa,
+totalSubjects), and write_batch() streams them to one JSON array file or
+to several shard files, so any stage can be run at 100k or 10M students
+without holding the batch in memory.
+
+Grades come from a small latent model: each student has an ability, each
+course a difficulty, and a grade is the quantile band of ability -
+difficulty + noise. The bands are set so that `fail_rate` of all grades
+are F and the passing grades follow the shipped batch's distribution;
+`ability_spread` concentrates failures on fewer students and
+`difficulty_spread` on fewer courses. As in the real data, a student with
+any F is PROMOTED with an empty SGPA; otherwise the SGPA is the
+credit-weighted mean of the grade points.
+
+Students are generated in fixed blocks, each from its own random stream
+derived from the seed, so the same seed and settings always give the same
+records, however the output is sharded.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+BLOCK_STUDENTS = 10_000
+
+# Grades from worst to best, with their grade points
+GRADES = ['F', 'D', 'C', 'B', 'B+', 'A', 'A+', 'O']
+GRADE_POINTS = [0, 4, 5, 6, 7, 8, 9, 10]
+
+# Relative frequency of the passing grades D..O in the shipped batch
+PASS_GRADE_WEIGHTS = [6, 9, 16, 26, 123, 114, 27]
+
+# Share of F grades in the shipped batch
+FAIL_RATE = 0.027
+
+CREDIT_CHOICES = [2, 4, 5]
+CREDIT_WEIGHTS = [0.1, 0.4, 0.5]
+
+PROGRAM_NAMES = [
+    'BBA INFORMATION TECHNOLOGY', 'BCOM COMPUTERS', 'BSC DATA SCIENCE', 'BCOM GENERAL',
+    'BBA GENERAL', 'BSC COMPUTER SCIENCE', 'BA ECONOMICS', 'BCOM HONOURS',
+]
+
+FIRST_NAMES = ['AARAV', 'ADITI', 'ANANYA', 'ARJUN', 'AYESHA', 'DIVYA', 'FARHAN', 'GURPREET',
+               'HARSHA', 'ISHAAN', 'KAVYA', 'MEERA', 'MOHAMMED', 'NEHA', 'PRIYA', 'RAHIM',
+               'RAHUL', 'SANA', 'SNEHA', 'VIKRAM']
+SURNAMES = ['AHMED', 'GUPTA', 'KAUR', 'KHAN', 'KUMAR', 'NAIDU', 'PATEL', 'RAO', 'REDDY',
+            'SHARMA', 'SINGH', 'VARMA']
+FATHER_NAMES = ['ANIL', 'ASIF', 'MAHESH', 'RAJESH', 'SURESH', 'TEJENDER', 'YOUSUF']
+MOTHER_NAMES = ['FATIMA', 'HAJRA', 'LAKSHMI', 'RAVINDER', 'SUNITA', 'USHA']
+
+ROMAN = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+
+HALL_TICKET_BASE = 100_000_000_000
+
+
+class BatchSpec:
+    """Size and shape of a synthetic batch."""
+
+    def __init__(self, students=10_000, programs=4, subjects=6, courses=15, semesters=1,
+                 current_semester=5, fail_rate=FAIL_RATE, ability_spread=1.0,
+                 difficulty_spread=0.5, seed=42):
+        if not 0 < fail_rate < 1:
+            raise ValueError(f"fail_rate must be between 0 and 1, got {fail_rate}")
+        if subjects > courses:
+            raise ValueError(f"subjects per semester ({subjects}) exceeds courses offered ({courses})")
+        if not 1 <= semesters <= current_semester <= len(ROMAN):
+            raise ValueError(f"need 1 <= semesters ({semesters}) <= current_semester "
+                             f"({current_semester}) <= {len(ROMAN)}")
+        self.students = students
+        self.programs = programs
+        self.subjects = subjects
+        self.courses = courses
+        self.semesters = semesters
+        self.current_semester = current_semester
+        self.fail_rate = fail_rate
+        self.ability_spread = ability_spread
+        self.difficulty_spread = difficulty_spread
+        self.seed = seed
+
+    def grade_cutoffs(self):
+        """Latent-score cutoffs between consecutive grades (F | D | ... | O)."""
+        weights = np.array(PASS_GRADE_WEIGHTS, dtype=float)
+        shares = np.concatenate([[self.fail_rate], (1 - self.fail_rate) * weights / weights.sum()])
+        sigma = float(np.sqrt(self.ability_spread ** 2 + self.difficulty_spread ** 2 + 1))
+        dist = NormalDist(0, sigma)
+        return np.array([dist.inv_cdf(p) for p in np.cumsum(shares)[:-1]])
+
+    def semester_numbers(self):
+        """Semester numbers per record, current first (the one the cleaning stage reads)."""
+        return [self.current_semester - k for k in range(self.semesters)]
+
+    def __repr__(self):
+        return (f"BatchSpec(students={self.students}, programs={self.programs}, "
+                f"subjects={self.subjects}, courses={self.courses}, semesters={self.semesters}, "
+                f"fail_rate={self.fail_rate}, seed={self.seed})")
+
+
+def program_names(count):
+    return [PROGRAM_NAMES[i] if i < len(PROGRAM_NAMES) else f"PROGRAM {i + 1:03d}"
+            for i in range(count)]
+
+
+def course_catalog(spec):
+    """{semester: (codes, titles, credits, difficulty)} for every program's offering.
+
+    codes and titles are lists per program; credits and difficulty are
+    (programs x courses) arrays.
+    """
+    rng = np.random.default_rng([spec.seed, 0])
+    catalog = {}
+    for semester in spec.semester_numbers():
+        codes = [[f"P{p + 1:03d}-{semester}-C{k + 1:03d}" for k in range(spec.courses)]
+                 for p in range(spec.programs)]
+        titles = [[f"SUBJECT {k + 1:03d} ({ROMAN[semester - 1]}) P{p + 1:03d}" for k in range(spec.courses)]
+                  for p in range(spec.programs)]
+        credits = rng.choice(CREDIT_CHOICES, size=(spec.programs, spec.courses), p=CREDIT_WEIGHTS)
+        difficulty = rng.normal(0, spec.difficulty_spread, size=(spec.programs, spec.courses))
+        catalog[semester] = (codes, titles, credits, difficulty)
+    return catalog
+
+
+def generate_block(spec, block, catalog=None, cutoffs=None):
+    """Return the records of block `block` (BLOCK_STUDENTS students, fewer for the last)."""
+    catalog = catalog or course_catalog(spec)
+    cutoffs = cutoffs if cutoffs is not None else spec.grade_cutoffs()
+    programs = program_names(spec.programs)
+    points = np.array(GRADE_POINTS)
+
+    start = block * BLOCK_STUDENTS
+    n = min(BLOCK_STUDENTS, spec.students - start)
+    if n <= 0:
+        return []
+    rng = np.random.default_rng([spec.seed, 1, block])
+
+    program = rng.integers(0, spec.programs, size=n)
+    ability = rng.normal(0, spec.ability_spread, size=n)
+    first = rng.integers(0, len(FIRST_NAMES), size=n)
+    surname = rng.integers(0, len(SURNAMES), size=n)
+    father = rng.integers(0, len(FATHER_NAMES), size=n)
+    mother = rng.integers(0, len(MOTHER_NAMES), size=n)
+
+    # Grades, credits and SGPA for the whole block, one semester at a time
+    semesters = []
+    for semester in spec.semester_numbers():
+        codes, titles, credits, difficulty = catalog[semester]
+        # Each student takes `subjects` distinct courses of their program's offering
+        picks = np.argsort(rng.random((n, spec.courses)), axis=1)[:, :spec.subjects]
+        noise = rng.normal(0, 1, size=(n, spec.subjects))
+        rows = program[:, None]
+        grade_idx = np.searchsorted(cutoffs, ability[:, None] - difficulty[rows, picks] + noise)
+        taken_credits = credits[rows, picks]
+        sgpa = (points[grade_idx] * taken_credits).sum(axis=1) / taken_credits.sum(axis=1)
+        failed = (grade_idx == 0).any(axis=1)
+        semesters.append((f"SEMESTER-{ROMAN[semester - 1]}", codes, titles, picks.tolist(),
+                          grade_idx.tolist(), taken_credits.tolist(), sgpa.tolist(), failed.tolist()))
+
+    records = []
+    for i in range(n):
+        p = int(program[i])
+        record_semesters = []
+        total_subjects = 0
+        for label, codes, titles, picks, grade_idx, taken_credits, sgpa, failed in semesters:
+            subjects = [{
+                'courseCode': codes[p][course],
+                'courseTitle': titles[p][course],
+                'credits': credit,
+                'grade': GRADES[g],
+                'result': 'FAIL' if g == 0 else 'PASS',
+            } for course, g, credit in zip(picks[i], grade_idx[i], taken_credits[i])]
+            record_semesters.append({
+                'semester': label,
+                'sgpa': '' if failed[i] else f"{sgpa[i]:.2f}",
+                'result': 'PROMOTED' if failed[i] else 'PASS',
+                'subjects': subjects,
+            })
+            total_subjects += len(subjects)
+
+        surname_name = SURNAMES[surname[i]]
+        records.append({
+            'student': {
+                'name': f"{FIRST_NAMES[first[i]]} {surname_name}",
+                'hallTicket': str(HALL_TICKET_BASE + start + i),
+                'fatherName': f"{FATHER_NAMES[father[i]]} {surname_name}",
+                'motherName': f"{MOTHER_NAMES[mother[i]]} {surname_name}",
+                'program': programs[p],
+            },
+            'semesters': record_semesters,
+            'totalSubjects': total_subjects,
+        })
+    return records
+
+
+def generate_records(spec, blocks=None):
+    """Yield the batch's records block by block (all blocks by default)."""
+    catalog = course_catalog(spec)
+    cutoffs = spec.grade_cutoffs()
+    if blocks is None:
+        blocks = range(-(-spec.students // BLOCK_STUDENTS))
+    for block in blocks:
+        yield from generate_block(spec, block, catalog, cutoffs)
+
+
+def write_records(records, path):
+    """Stream records to path as a JSON array, one record per line; returns the count.
+
+    Records are written compact (json's C encoder is only used without
+    indentation) under a temporary name and moved into place at the end.
+    """
+    tmp = f"{path}.tmp-{os.getpid()}"
+    count = 0
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in records:
+            f.write(',\n' if count else '\n')
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write('\n]\n' if count else ']\n')
+    os.replace(tmp, path)
+    return count
+
+
+def shard_blocks(spec, shards):
+    """Split the batch's blocks into `shards` contiguous runs."""
+    blocks = -(-spec.students // BLOCK_STUDENTS)
+    bounds = np.linspace(0, blocks, shards + 1).round().astype(int)
+    return [range(bounds[k], bounds[k + 1]) for k in range(shards)]
+
+
+def write_shard(spec, blocks, path):
+    """Write the given blocks of the batch to one file; returns (path, count)."""
+    return path, write_records(generate_records(spec, blocks), path)
+
+
+def write_batch(spec, path, shards=1, workers=None):
+    """Write the batch to `path`, or to `shards` files in directory `path`.
+
+    Shards are named batch_student_data_NNN.json (the cleaning stage reads
+    every *.json in a directory) and written in a process pool of up to
+    `workers` processes. Returns [(path, records written)].
+    """
+    if shards == 1:
+        return [(path, write_records(generate_records(spec), path))]
+
+    os.makedirs(path, exist_ok=True)
+    blocks = shard_blocks(spec, shards)
+    paths = [os.path.join(path, f"batch_student_data_{k:03d}.json") for k in range(shards)]
+    workers = min(workers or os.cpu_count() or 1, shards)
+    if workers == 1:
+        return [write_shard(spec, shard, shard_path) for shard, shard_path in zip(blocks, paths)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write_shard, [spec] * shards, blocks, paths))
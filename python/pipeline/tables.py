@@ -0,0 +1,125 @@
+"""
+Decomposition of raw student records into the cleaned table layout.
+
+A single pass over the records appends straight into per-table column
+buffers; each DataFrame is then built once from its columns instead of
+from a list of per-row dicts.
+
+Only a record's first (current) semester is decomposed. Its grades and
+performance rows carry the semester the record names, so the semester
+in their keys comes from the data rather than being assumed.
+"""
+
+import hashlib
+import json
+
+import pandas as pd
+
+# Label for records whose semester entry does not name its semester
+SEMESTER = 'SEMESTER-V'
+
+STUDENT_COLUMNS = ['hall_ticket', 'student_name', 'father_name', 'mother_name', 'program']
+SUBJECT_COLUMNS = ['course_code', 'course_title', 'credits']
+GRADE_COLUMNS = ['hall_ticket', 'course_code', 'grade', 'result', 'credits', 'semester']
+PERFORMANCE_COLUMNS = ['hall_ticket', 'semester', 'sgpa', 'result', 'total_subjects']
+FINGERPRINT_COLUMNS = ['hall_ticket', 'fingerprint']
+
+
+def record_fingerprint(record):
+    """Return a stable content hash of one raw student record."""
+    canonical = json.dumps(record, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def decompose_records(records):
+    """Build the students, subjects, grades and performance tables in one pass.
+
+    Returns a dict of DataFrames keyed by table name, plus a `fingerprints`
+    table holding a content hash per record for delta cleaning. Tables are
+    returned as extracted; deduplication and sorting are left to the caller.
+    """
+    students = {col: [] for col in STUDENT_COLUMNS}
+    subjects = {col: [] for col in SUBJECT_COLUMNS}
+    grades = {col: [] for col in GRADE_COLUMNS}
+    performance = {col: [] for col in PERFORMANCE_COLUMNS}
+    fingerprints = {col: [] for col in FINGERPRINT_COLUMNS}
+    seen_subjects = set()
+
+    # Bind the appends once; they run for every grade row
+    g_hall_ticket = grades['hall_ticket'].append
+    g_course_code = grades['course_code'].append
+    g_grade = grades['grade'].append
+    g_result = grades['result'].append
+    g_credits = grades['credits'].append
+    g_semester = grades['semester'].append
+
+    for record in records:
+        student = record['student']
+        semester_info = record['semesters'][0]
+        hall_ticket = student['hallTicket']
+        semester = semester_info.get('semester') or SEMESTER
+
+        students['hall_ticket'].append(hall_ticket)
+        students['student_name'].append(student['name'])
+        students['father_name'].append(student['fatherName'])
+        students['mother_name'].append(student['motherName'])
+        students['program'].append(student['program'])
+
+        for subject in semester_info['subjects']:
+            key = (subject['courseCode'], subject['courseTitle'], subject['credits'])
+            if key not in seen_subjects:
+                seen_subjects.add(key)
+                subjects['course_code'].append(key[0])
+                subjects['course_title'].append(key[1])
+                subjects['credits'].append(key[2])
+
+            g_hall_ticket(hall_ticket)
+            g_course_code(subject['courseCode'])
+            g_grade(subject['grade'])
+            g_result(subject['result'])
+            g_credits(subject['credits'])
+            g_semester(semester)
+
+        sgpa = semester_info['sgpa']
+        performance['hall_ticket'].append(hall_ticket)
+        performance['semester'].append(semester)
+        performance['sgpa'].append(float(sgpa) if sgpa else None)
+        performance['result'].append(semester_info['result'])
+        performance['total_subjects'].append(record['totalSubjects'])
+
+        fingerprints['hall_ticket'].append(hall_ticket)
+        fingerprints['fingerprint'].append(record_fingerprint(record))
+
+    return {
+        'students': pd.DataFrame(students, columns=STUDENT_COLUMNS),
+        'subjects': pd.DataFrame(subjects, columns=SUBJECT_COLUMNS),
+        'grades': pd.DataFrame(grades, columns=GRADE_COLUMNS),
+        'performance': pd.DataFrame(performance, columns=PERFORMANCE_COLUMNS),
+        'fingerprints': pd.DataFrame(fingerprints, columns=FINGERPRINT_COLUMNS),
+    }
+
+
+# Natural keys used to deduplicate rows that appear in more than one shard
+TABLE_KEYS = {
+    'students': ['hall_ticket'],
+    'subjects': ['course_code'],
+    'grades': ['hall_ticket', 'course_code', 'semester'],
+    'performance': ['hall_ticket', 'semester'],
+    'fingerprints': ['hall_ticket'],
+}
+
+
+def merge_tables(shards):
+    """Concatenate per-shard tables and drop rows repeated across shards.
+
+    When a key appears in several shards the row from the last shard wins,
+    so a re-issued batch (e.g. after revaluation) overrides the original.
+    The same holds within a shard, e.g. for a course listed under two
+    titles.
+    """
+    merged = {}
+    for name, keys in TABLE_KEYS.items():
+        combined = pd.concat([shard[name] for shard in shards], ignore_index=True)
+        merged[name] = combined.drop_duplicates(subset=keys, keep='last').reset_index(drop=True)
+
+    return merged
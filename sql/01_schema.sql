@@ -1,5 +1,8 @@
 -- ACADEMIC PERFORMANCE DATABASE SCHEMA
 
+DROP TABLE IF EXISTS class_stats CASCADE;
+DROP TABLE IF EXISTS grade_distribution CASCADE;
+DROP TABLE IF EXISTS subject_stats CASCADE;
 DROP TABLE IF EXISTS grades CASCADE;
 DROP TABLE IF EXISTS performance CASCADE;
 DROP TABLE IF EXISTS subjects CASCADE;
@@ -49,6 +52,51 @@ CREATE TABLE grades (
     PRIMARY KEY (hall_ticket, course_code, semester)
 );
 
+-- SUMMARY TABLES (maintained by the loader, see python/pipeline/summaries.py)
+CREATE TABLE subject_stats (
+    semester VARCHAR(20),
+    program VARCHAR(100),
+    course_code VARCHAR(20),
+    course_title VARCHAR(200),
+    total_enrolled INT,
+    passed INT,
+    failed INT,
+    grade_points_sum INT,
+    grade_points_count INT,
+    o_count INT,
+    a_plus_count INT,
+    a_count INT,
+    b_plus_count INT,
+    b_count INT,
+    c_count INT,
+    d_count INT,
+    f_count INT,
+    PRIMARY KEY (semester, program, course_code)
+);
+
+CREATE TABLE grade_distribution (
+    semester VARCHAR(20),
+    program VARCHAR(100),
+    grade VARCHAR(2),
+    grade_count INT,
+    PRIMARY KEY (semester, program, grade)
+);
+
+CREATE TABLE class_stats (
+    semester VARCHAR(20),
+    program VARCHAR(100),
+    performance_category VARCHAR(20),
+    student_count INT,
+    sgpa_count INT,
+    sgpa_sum DOUBLE PRECISION,
+    sgpa_sq_sum DOUBLE PRECISION,
+    min_sgpa DECIMAL(4,2),
+    max_sgpa DECIMAL(4,2),
+    passed INT,
+    promoted INT,
+    PRIMARY KEY (semester, program, performance_category)
+);
+
 -- CREATE INDEXES
 CREATE INDEX idx_grades_hall_ticket ON grades(hall_ticket);
 CREATE INDEX idx_grades_course ON grades(course_code);
@@ -1,29 +1,45 @@
 -- ACADEMIC PERFORMANCE ANALYSIS QUERIES
+--
+-- Query catalog read by python/pipeline/catalog.py. Each query starts with
+-- a `-- name:` header (its stable id, also used for the export file name)
+-- and a `-- title:` line. Parameters are bound by name; defaults live in
+-- DEFAULT_PARAMS in catalog.py:
+--   :semester, :program   cohort filters, NULL for all cohorts
+--   :top_n                number of students in top_students
+--   :risk_sgpa            SGPA below which a student is at risk
+--   :min_o_grades         O grades needed for perfect_scores
 
--- QUERY 1: OVERALL CLASS STATISTICS
-SELECT 
-    COUNT(*) as total_students,
-    ROUND(AVG(sgpa), 2) as avg_sgpa,
-    ROUND(MIN(sgpa), 2) as min_sgpa,
-    ROUND(MAX(sgpa), 2) as max_sgpa,
-    ROUND(AVG(CASE WHEN sgpa IS NOT NULL THEN (sgpa - (SELECT AVG(sgpa) FROM performance WHERE sgpa IS NOT NULL)) * (sgpa - (SELECT AVG(sgpa) FROM performance WHERE sgpa IS NOT NULL)) ELSE 0 END), 2) as variance_sgpa,
-    SUM(CASE WHEN result = 'PASS' THEN 1 ELSE 0 END) as passed_students,
-    SUM(CASE WHEN result = 'PROMOTED' THEN 1 ELSE 0 END) as promoted_students,
-    ROUND(100.0 * SUM(CASE WHEN result = 'PASS' THEN 1 ELSE 0 END) / COUNT(*), 2) as pass_percentage
-FROM performance
-WHERE sgpa IS NOT NULL;
+-- name: class_statistics
+-- title: Overall Class Statistics
+-- Reads the materialized class_stats; variance is E[sgpa^2] - E[sgpa]^2
+SELECT
+    SUM(sgpa_count) as total_students,
+    ROUND(SUM(sgpa_sum) / SUM(sgpa_count), 2) as avg_sgpa,
+    ROUND(MIN(min_sgpa), 2) as min_sgpa,
+    ROUND(MAX(max_sgpa), 2) as max_sgpa,
+    ROUND(SUM(sgpa_sq_sum) / SUM(sgpa_count) - (SUM(sgpa_sum) / SUM(sgpa_count)) * (SUM(sgpa_sum) / SUM(sgpa_count)), 2) as variance_sgpa,
+    SUM(passed) as passed_students,
+    SUM(promoted) as promoted_students,
+    ROUND(100.0 * SUM(passed) / SUM(sgpa_count), 2) as pass_percentage
+FROM class_stats
+WHERE sgpa_count > 0
+  AND (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program);
 
--- QUERY 2: PERFORMANCE CATEGORY DISTRIBUTION
-SELECT 
+-- name: performance_category_distribution
+-- title: Performance Category Distribution
+SELECT
     performance_category,
-    COUNT(*) as student_count,
-    ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage,
-    ROUND(AVG(sgpa), 2) as avg_sgpa,
-    ROUND(MIN(sgpa), 2) as min_sgpa,
-    ROUND(MAX(sgpa), 2) as max_sgpa
-FROM performance
+    SUM(student_count) as student_count,
+    ROUND(100.0 * SUM(student_count) / SUM(SUM(student_count)) OVER (), 2) as percentage,
+    ROUND(SUM(sgpa_sum) / NULLIF(SUM(sgpa_count), 0), 2) as avg_sgpa,
+    ROUND(MIN(min_sgpa), 2) as min_sgpa,
+    ROUND(MAX(max_sgpa), 2) as max_sgpa
+FROM class_stats
+WHERE (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program)
 GROUP BY performance_category
-ORDER BY 
+ORDER BY
     CASE performance_category
         WHEN 'Distinction' THEN 1
         WHEN 'First Class' THEN 2
@@ -33,8 +49,9 @@ ORDER BY
         ELSE 6
     END;
 
--- QUERY 3: TOP 10 STUDENTS
-SELECT 
+-- name: top_students
+-- title: Top Students
+SELECT
     s.student_name,
     s.hall_ticket,
     p.sgpa,
@@ -43,11 +60,14 @@ SELECT
 FROM performance p
 JOIN students s ON p.hall_ticket = s.hall_ticket
 WHERE p.sgpa IS NOT NULL
-ORDER BY p.sgpa DESC
-LIMIT 10;
+  AND (:semester IS NULL OR p.semester = :semester)
+  AND (:program IS NULL OR s.program = :program)
+ORDER BY p.sgpa DESC, s.hall_ticket
+LIMIT :top_n;
 
--- QUERY 4: STUDENTS AT RISK (Low SGPA or Fails)
-SELECT 
+-- name: students_at_risk
+-- title: Students at Risk (Low SGPA or Fails)
+SELECT
     s.student_name,
     s.hall_ticket,
     p.sgpa,
@@ -55,17 +75,22 @@ SELECT
     p.performance_category
 FROM performance p
 JOIN students s ON p.hall_ticket = s.hall_ticket
-WHERE p.sgpa < 7 OR p.fail_count > 0
-ORDER BY p.sgpa;
+WHERE (p.sgpa < :risk_sgpa OR p.fail_count > 0)
+  AND (:semester IS NULL OR p.semester = :semester)
+  AND (:program IS NULL OR s.program = :program)
+ORDER BY p.sgpa, s.hall_ticket;
 
--- QUERY 5: GRADE DISTRIBUTION
-SELECT 
+-- name: grade_distribution
+-- title: Grade Distribution
+SELECT
     grade,
-    COUNT(*) as count,
-    ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage
-FROM grades
+    SUM(grade_count) as count,
+    ROUND(100.0 * SUM(grade_count) / SUM(SUM(grade_count)) OVER (), 2) as percentage
+FROM grade_distribution
+WHERE (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program)
 GROUP BY grade
-ORDER BY 
+ORDER BY
     CASE grade
         WHEN 'O' THEN 1
         WHEN 'A+' THEN 2
@@ -77,64 +102,74 @@ ORDER BY
         WHEN 'F' THEN 8
     END;
 
--- QUERY 6: SUBJECT PERFORMANCE ANALYSIS
-SELECT 
-    sub.course_code,
-    sub.course_title,
-    COUNT(g.hall_ticket) as total_enrolled,
-    SUM(CASE WHEN g.result = 'PASS' THEN 1 ELSE 0 END) as passed,
-    SUM(CASE WHEN g.result = 'FAIL' THEN 1 ELSE 0 END) as failed,
-    ROUND(100.0 * SUM(CASE WHEN g.result = 'PASS' THEN 1 ELSE 0 END) / COUNT(*), 2) as pass_rate,
-    ROUND(AVG(g.grade_points), 2) as avg_grade_points
-FROM grades g
-JOIN subjects sub ON g.course_code = sub.course_code
-GROUP BY sub.course_code, sub.course_title
-ORDER BY pass_rate;
+-- name: subject_performance
+-- title: Subject Performance Analysis
+SELECT
+    course_code,
+    course_title,
+    SUM(total_enrolled) as total_enrolled,
+    SUM(passed) as passed,
+    SUM(failed) as failed,
+    ROUND(100.0 * SUM(passed) / SUM(total_enrolled), 2) as pass_rate,
+    ROUND(1.0 * SUM(grade_points_sum) / NULLIF(SUM(grade_points_count), 0), 2) as avg_grade_points
+FROM subject_stats
+WHERE (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program)
+GROUP BY course_code, course_title
+ORDER BY pass_rate, course_code;
 
--- QUERY 7: HARDEST SUBJECTS (by fail rate)
-SELECT 
-    sub.course_code,
-    sub.course_title,
-    COUNT(g.hall_ticket) as total_enrolled,
-    SUM(CASE WHEN g.grade = 'F' THEN 1 ELSE 0 END) as fail_count,
-    ROUND(100.0 * SUM(CASE WHEN g.grade = 'F' THEN 1 ELSE 0 END) / COUNT(*), 2) as fail_rate,
-    ROUND(AVG(g.grade_points), 2) as avg_grade_points
-FROM grades g
-JOIN subjects sub ON g.course_code = sub.course_code
-GROUP BY sub.course_code, sub.course_title
-HAVING fail_count > 0
-ORDER BY fail_rate DESC;
+-- name: hardest_subjects
+-- title: Hardest Subjects (by Fail Rate)
+SELECT
+    course_code,
+    course_title,
+    SUM(total_enrolled) as total_enrolled,
+    SUM(f_count) as fail_count,
+    ROUND(100.0 * SUM(f_count) / SUM(total_enrolled), 2) as fail_rate,
+    ROUND(1.0 * SUM(grade_points_sum) / NULLIF(SUM(grade_points_count), 0), 2) as avg_grade_points
+FROM subject_stats
+WHERE (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program)
+GROUP BY course_code, course_title
+HAVING SUM(f_count) > 0
+ORDER BY fail_rate DESC, course_code;
 
--- QUERY 8: EASIEST SUBJECTS (highest avg grade points)
-SELECT 
-    sub.course_code,
-    sub.course_title,
-    COUNT(g.hall_ticket) as total_enrolled,
-    ROUND(AVG(g.grade_points), 2) as avg_grade_points,
-    SUM(CASE WHEN g.grade IN ('O', 'A+') THEN 1 ELSE 0 END) as excellent_count,
-    ROUND(100.0 * SUM(CASE WHEN g.grade IN ('O', 'A+') THEN 1 ELSE 0 END) / COUNT(*), 2) as excellence_rate
-FROM grades g
-JOIN subjects sub ON g.course_code = sub.course_code
-GROUP BY sub.course_code, sub.course_title
-ORDER BY avg_grade_points DESC;
+-- name: easiest_subjects
+-- title: Easiest Subjects (Highest Avg Grade Points)
+SELECT
+    course_code,
+    course_title,
+    SUM(total_enrolled) as total_enrolled,
+    ROUND(1.0 * SUM(grade_points_sum) / NULLIF(SUM(grade_points_count), 0), 2) as avg_grade_points,
+    SUM(o_count + a_plus_count) as excellent_count,
+    ROUND(100.0 * SUM(o_count + a_plus_count) / SUM(total_enrolled), 2) as excellence_rate
+FROM subject_stats
+WHERE (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program)
+GROUP BY course_code, course_title
+ORDER BY avg_grade_points DESC, course_code;
 
--- QUERY 9: GRADE DISTRIBUTION BY SUBJECT
-SELECT 
-    sub.course_title,
-    SUM(CASE WHEN g.grade = 'O' THEN 1 ELSE 0 END) as O_count,
-    SUM(CASE WHEN g.grade = 'A+' THEN 1 ELSE 0 END) as A_plus_count,
-    SUM(CASE WHEN g.grade = 'A' THEN 1 ELSE 0 END) as A_count,
-    SUM(CASE WHEN g.grade = 'B+' THEN 1 ELSE 0 END) as B_plus_count,
-    SUM(CASE WHEN g.grade = 'B' THEN 1 ELSE 0 END) as B_count,
-    SUM(CASE WHEN g.grade = 'C' THEN 1 ELSE 0 END) as C_count,
-    SUM(CASE WHEN g.grade = 'D' THEN 1 ELSE 0 END) as D_count,
-    SUM(CASE WHEN g.grade = 'F' THEN 1 ELSE 0 END) as F_count
-FROM grades g
-JOIN subjects sub ON g.course_code = sub.course_code
-GROUP BY sub.course_title;
+-- name: grade_distribution_by_subject
+-- title: Grade Distribution by Subject
+SELECT
+    course_title,
+    SUM(o_count) as O_count,
+    SUM(a_plus_count) as A_plus_count,
+    SUM(a_count) as A_count,
+    SUM(b_plus_count) as B_plus_count,
+    SUM(b_count) as B_count,
+    SUM(c_count) as C_count,
+    SUM(d_count) as D_count,
+    SUM(f_count) as F_count
+FROM subject_stats
+WHERE (:semester IS NULL OR semester = :semester)
+  AND (:program IS NULL OR program = :program)
+GROUP BY course_title
+ORDER BY course_title;
 
--- QUERY 10: STUDENTS WITH PERFECT SCORES
-SELECT 
+-- name: perfect_scores
+-- title: Students with Perfect Scores
+SELECT
     s.student_name,
     s.hall_ticket,
     COUNT(g.grade) as total_subjects,
@@ -142,32 +177,40 @@ SELECT
     p.sgpa
 FROM grades g
 JOIN students s ON g.hall_ticket = s.hall_ticket
-JOIN performance p ON s.hall_ticket = p.hall_ticket
+JOIN performance p ON s.hall_ticket = p.hall_ticket AND g.semester = p.semester
+WHERE (:semester IS NULL OR g.semester = :semester)
+  AND (:program IS NULL OR s.program = :program)
 GROUP BY s.student_name, s.hall_ticket, p.sgpa
-HAVING SUM(CASE WHEN g.grade = 'O' THEN 1 ELSE 0 END) >= 3
-ORDER BY p.sgpa DESC;
+HAVING SUM(CASE WHEN g.grade = 'O' THEN 1 ELSE 0 END) >= :min_o_grades
+ORDER BY p.sgpa DESC, s.hall_ticket;
 
--- QUERY 11: CORRELATION BETWEEN SGPA AND GRADE CONSISTENCY
-SELECT 
+-- name: sgpa_consistency
+-- title: Correlation between SGPA and Grade Consistency
+SELECT
     p.performance_category,
     ROUND(AVG(p.sgpa), 2) as avg_sgpa,
     ROUND(AVG(p.std_grade_points), 2) as avg_std_deviation,
     COUNT(*) as student_count
 FROM performance p
 WHERE p.sgpa IS NOT NULL AND p.std_grade_points IS NOT NULL
+  AND (:semester IS NULL OR p.semester = :semester)
+  AND (:program IS NULL OR p.hall_ticket IN (SELECT hall_ticket FROM students WHERE program = :program))
 GROUP BY p.performance_category
 ORDER BY avg_sgpa DESC;
 
--- QUERY 12: SUBJECT-WISE PERCENTILE ANALYSIS
+-- name: subject_percentiles
+-- title: Subject-wise Percentile Analysis
 WITH subject_percentiles AS (
-    SELECT 
+    SELECT
         course_code,
         grade_points,
         NTILE(4) OVER (PARTITION BY course_code ORDER BY grade_points) as quartile
     FROM grades
     WHERE grade_points IS NOT NULL
+      AND (:semester IS NULL OR semester = :semester)
+      AND (:program IS NULL OR hall_ticket IN (SELECT hall_ticket FROM students WHERE program = :program))
 )
-SELECT 
+SELECT
     sub.course_title,
     MIN(CASE WHEN sp.quartile = 1 THEN sp.grade_points END) as Q1_25th_percentile,
     MIN(CASE WHEN sp.quartile = 2 THEN sp.grade_points END) as Q2_median,
@@ -175,4 +218,5 @@ SELECT
     MAX(sp.grade_points) as max_grade_points
 FROM subject_percentiles sp
 JOIN subjects sub ON sp.course_code = sub.course_code
-GROUP BY sub.course_title;
\ No newline at end of file
+GROUP BY sub.course_title
+ORDER BY sub.course_title;
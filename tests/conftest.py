@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+
+@pytest.fixture
+def schema():
+    from pipeline.schema import Schema
+    return Schema(os.path.join(ROOT, 'sql', '01_schema.sql'))
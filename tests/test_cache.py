@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from pipeline.cache import TABLE_NAMES, cache_path, load_tables, swap_in
+from pipeline.synthetic import BatchSpec, generate_records, write_records
+
+
+def write_batch(tmp_path):
+    raw_path = str(tmp_path / 'batch.json')
+    write_records(generate_records(BatchSpec(students=20)), raw_path)
+    return raw_path
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_load_tables_caches_and_removes_stale_directories(tmp_path):
+    raw_path = write_batch(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    target = cache_path(raw_path, cache_dir)
+    # Left behind by a process that died while writing or swapping
+    stale = [f"{target}.tmp-{dead_pid()}", f"{target}.old-{dead_pid()}"]
+    # Still being written by a running process
+    live = f"{target}.tmp-{os.getppid()}"
+    for path in stale + [live]:
+        os.makedirs(path)
+
+    parsed = load_tables(raw_path, cache_dir)
+    cached = load_tables(raw_path, cache_dir)
+
+    assert sorted(os.listdir(target)) == sorted(f"{name}.feather" for name in TABLE_NAMES)
+    assert not any(os.path.exists(path) for path in stale)
+    assert os.path.exists(live)
+    for name in TABLE_NAMES:
+        assert cached[name].equals(parsed[name])
+
+
+def test_load_tables_replaces_an_incomplete_entry(tmp_path):
+    raw_path = write_batch(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    target = cache_path(raw_path, cache_dir)
+    os.makedirs(target)
+    with open(os.path.join(target, 'students.feather'), 'w') as f:
+        json.dump('not a feather file', f)
+
+    tables = load_tables(raw_path, cache_dir)
+
+    assert len(tables['students']) == 20
+    assert sorted(os.listdir(cache_dir)) == [os.path.basename(target)]
+    assert len(load_tables(raw_path, cache_dir)['students']) == 20
+
+
+def test_swap_in_keeps_an_entry_written_concurrently(tmp_path):
+    raw_path = write_batch(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    target = cache_path(raw_path, cache_dir)
+    load_tables(raw_path, cache_dir)
+    before = {name: os.stat(os.path.join(target, f"{name}.feather")).st_ino for name in TABLE_NAMES}
+
+    # A second process finishes parsing after the first one swapped its entry in
+    tmp = f"{target}.tmp-{os.getppid()}"
+    os.makedirs(tmp)
+    swap_in(tmp, target)
+
+    assert not os.path.exists(tmp)
+    assert before == {name: os.stat(os.path.join(target, f"{name}.feather")).st_ino for name in TABLE_NAMES}
+
+
+def test_concurrent_cold_loads_agree(tmp_path):
+    raw_path = write_batch(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(load_tables, [raw_path] * 4, [cache_dir] * 4))
+
+    assert os.listdir(cache_dir) == [os.path.basename(cache_path(raw_path, cache_dir))]
+    for tables in results[1:]:
+        for name in TABLE_NAMES:
+            assert tables[name].equals(results[0][name])
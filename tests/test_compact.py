@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from pipeline.compact import compact_grades, student_keys
+from pipeline.storage import read_cleaned, read_student_keys, update_student_keys, write_cleaned
+
+
+def make_grades(hall_tickets):
+    return pd.DataFrame({
+        'hall_ticket': hall_tickets,
+        'course_code': 'C1',
+        'grade': 'A',
+        'result': 'PASS',
+        'credits': 4,
+        'semester': 'SEMESTER-V',
+        'grade_points': 8,
+    })
+
+
+def test_student_keys_are_append_only(tmp_path):
+    cleaned_dir = str(tmp_path)
+    assert read_student_keys(cleaned_dir) is None
+
+    first = update_student_keys(['S3', 'S1', 'S2', 'S1'], cleaned_dir)
+    # S2 leaves, S0 joins: it sorts first but still gets the next key
+    second = update_student_keys(['S3', 'S1', 'S0'], cleaned_dir)
+
+    assert first.tolist() == ['S1', 'S2', 'S3']
+    assert second.tolist() == ['S1', 'S2', 'S3', 'S0']
+    assert read_student_keys(cleaned_dir).tolist() == second.tolist()
+
+
+def test_compacted_grades_keep_student_keys_across_runs(tmp_path):
+    cleaned_dir = str(tmp_path)
+    update_student_keys(['S1', 'S2', 'S3'], cleaned_dir)
+    student_index = update_student_keys(['S0', 'S3'], cleaned_dir)
+
+    grades = compact_grades(make_grades(['S3', 'S0', 'S3']), student_index)
+    assert student_keys(grades).tolist() == [2, 3, 2]
+
+    write_cleaned('grades', grades, cleaned_dir)
+    assert student_keys(read_cleaned('grades', cleaned_dir=cleaned_dir)).tolist() == [2, 3, 2]
+
+
+def test_compact_grades_rejects_hall_tickets_without_a_key():
+    with pytest.raises(ValueError):
+        compact_grades(make_grades(['S1', 'S9']), pd.Index(['S1']))
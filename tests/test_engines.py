@@ -0,0 +1,24 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pipeline.engines import frames_match
+
+
+def test_frames_match_treats_nullable_missing_values_as_equal():
+    sqlite_result = pd.DataFrame({'sgpa': [8.5, np.nan], 'grade': ['O', None], 'passed': [3.0, np.nan]})
+    duckdb_result = pd.DataFrame({'sgpa': [8.5, np.nan],
+                                  'grade': pd.array(['O', pd.NA], dtype='string'),
+                                  'passed': pd.array([3, pd.NA], dtype='Int64')})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert frames_match(sqlite_result, duckdb_result)
+        assert not frames_match(sqlite_result, duckdb_result.assign(passed=pd.array([4, pd.NA], dtype='Int64')))
+        assert not frames_match(sqlite_result, duckdb_result.assign(grade=['O', 'A']))
+
+
+def test_frames_match_compares_floats_to_tolerance():
+    assert frames_match(pd.DataFrame({'avg': [0.1 + 0.2]}), pd.DataFrame({'avg': [0.3]}))
+    assert not frames_match(pd.DataFrame({'avg': [0.3001]}), pd.DataFrame({'avg': [0.3]}))
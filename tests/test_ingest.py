@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from pipeline.ingest import iter_records
+from pipeline.synthetic import BatchSpec, generate_records, write_records
+
+RECORDS = [
+    {'student': {'hallTicket': '121423408001', 'name': 'ASHA, "A" [RANK 1]'},
+     'semesters': [{'sgpa': '9.81', 'subjects': []}], 'totalSubjects': 0},
+    {'student': {'hallTicket': '121423408002', 'name': 'ÉLODIE ]}, ÑANDÚ'},
+     'semesters': [{'sgpa': '', 'subjects': [{'grade': 'A+', 'credits': 4}]}], 'totalSubjects': 1},
+    [1, 2.5, None, True],
+    12345,
+    'a string, with ] inside',
+]
+
+
+def write_json(tmp_path, text):
+    path = tmp_path / 'batch.json'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 16])
+def test_iter_records_matches_json_load(tmp_path, indent, chunk_size):
+    path = write_json(tmp_path, json.dumps(RECORDS, indent=indent, ensure_ascii=False))
+
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)
+    assert list(iter_records(path, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [3, 1 << 16])
+def test_iter_records_reads_written_batches(tmp_path, chunk_size):
+    path = str(tmp_path / 'batch.json')
+    write_records(generate_records(BatchSpec(students=50, semesters=2)), path)
+
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)
+    assert list(iter_records(path, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize('text', ['[]', ' \n[ ]\n'])
+def test_iter_records_of_an_empty_array(tmp_path, text):
+    assert list(iter_records(write_json(tmp_path, text))) == []
+
+
+@pytest.mark.parametrize('text', ['{"a": 1}', '[{"a": 1}, {"b": ', '[{"a": 1}', '[{"a": 1}, {"b" 2}]'])
+def test_iter_records_rejects_malformed_batches(tmp_path, text):
+    with pytest.raises(ValueError):
+        list(iter_records(write_json(tmp_path, text), chunk_size=4))
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.compact import compact_grades
+from pipeline.matrix import MISSING, GradeMatrix, write_grade_matrix
+
+
+def make_grades():
+    # S1 failed C1 in semester IV and retook it in V
+    grades = pd.DataFrame({
+        'hall_ticket': ['S1', 'S1', 'S1', 'S2', 'S2', 'S3'],
+        'course_code': ['C1', 'C1', 'C2', 'C1', 'C2', 'C2'],
+        'semester': ['SEMESTER-IV', 'SEMESTER-V', 'SEMESTER-V', 'SEMESTER-V', 'SEMESTER-V', 'SEMESTER-IV'],
+        'grade': ['F', 'B', 'A', 'O', 'C', 'A+'],
+        'grade_points': [0, 6, 8, 10, 5, 9],
+    })
+    return compact_grades(grades)
+
+
+def test_retakes_get_their_own_column(tmp_path):
+    grades = make_grades()
+    write_grade_matrix(grades, str(tmp_path))
+
+    matrix = GradeMatrix(str(tmp_path))
+
+    assert list(matrix.columns) == [('C1', 'SEMESTER-IV'), ('C1', 'SEMESTER-V'),
+                                    ('C2', 'SEMESTER-IV'), ('C2', 'SEMESTER-V')]
+    assert matrix.student('S1').tolist() == [0, 6, MISSING, 8]
+    assert matrix.course('C1', 'SEMESTER-V').tolist() == [6, 10, MISSING]
+    with pytest.raises(KeyError):
+        matrix.course('C1')
+
+
+def test_course_stats_match_the_grades_table(tmp_path):
+    grades = make_grades()
+    write_grade_matrix(grades, str(tmp_path))
+    points = grades['grade_points'].astype(np.int64)
+
+    for by_semester, keys in ((False, ['course_code']), (True, ['course_code', 'semester'])):
+        stats = GradeMatrix(str(tmp_path)).course_stats(by_semester=by_semester)
+        expected = points.groupby([grades[key] for key in keys], observed=True).agg(
+            ['count', 'mean', 'std', 'min', 'max'])
+        fails = (points == 0).groupby([grades[key] for key in keys], observed=True).sum()
+
+        assert stats['n_students'].tolist() == expected['count'].tolist()
+        np.testing.assert_allclose(stats['mean_points'], expected['mean'])
+        np.testing.assert_allclose(stats['std_points'], expected['std'])
+        assert stats['min_points'].tolist() == expected['min'].tolist()
+        assert stats['max_points'].tolist() == expected['max'].tolist()
+        assert stats['fail_count'].tolist() == fails.tolist()
+        assert stats.index.tolist() == expected.index.tolist()
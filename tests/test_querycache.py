@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+
+from pipeline.querycache import QueryCache
+
+TABLES = ['grades', 'subjects']
+GRADES_SQL = 'SELECT grade, COUNT(*) FROM grades GROUP BY grade'
+SUBJECTS_SQL = 'SELECT * FROM subjects'
+
+
+def fill(cache, exports_dir):
+    keys = {}
+    for name, sql in (('grades', GRADES_SQL), ('subjects', SUBJECTS_SQL)):
+        keys[name] = cache.key(sql)
+        cache.put(keys[name], pd.DataFrame({'n': [1, 2]}))
+        cache.mark_exported(os.path.join(exports_dir, f"{name}.csv"), keys[name])
+    cache.save()
+    return keys
+
+
+def test_results_of_old_table_versions_are_pruned(tmp_path):
+    cache_dir = str(tmp_path / 'queries')
+    exports_dir = str(tmp_path)
+    keys = fill(QueryCache('sqlite', {'grades': (10, 'a'), 'subjects': (2, 'b')}, TABLES, cache_dir),
+                exports_dir)
+
+    # grades was reloaded: only results that read it are stale
+    cache = QueryCache('sqlite', {'grades': (11, 'c'), 'subjects': (2, 'b')}, TABLES, cache_dir)
+
+    assert cache.get(keys['grades']) is None
+    assert cache.get(keys['subjects']) is not None
+    assert cache.key(SUBJECTS_SQL) == keys['subjects']
+    assert sorted(cache.manifest.values()) == [keys['subjects']]
+    assert sorted(os.listdir(cache_dir)) == sorted(
+        [f"{keys['subjects']}.parquet", 'exports.json', 'results.json'])
+
+
+def test_other_engines_keep_their_results(tmp_path):
+    cache_dir = str(tmp_path / 'queries')
+    duckdb_keys = fill(QueryCache('duckdb', {'grades': 'parquet:x', 'subjects': 'parquet:y'}, TABLES, cache_dir),
+                       str(tmp_path))
+    sqlite_keys = fill(QueryCache('sqlite', {'grades': (10, 'a'), 'subjects': (2, 'b')}, TABLES, cache_dir),
+                       str(tmp_path))
+
+    cache = QueryCache('sqlite', {'grades': (11, 'c'), 'subjects': (3, 'd')}, TABLES, cache_dir)
+    cache.save()
+
+    assert all(cache.get(key) is None for key in sqlite_keys.values())
+    assert all(cache.get(key) is not None for key in duckdb_keys.values())
+
+
+def test_result_files_missing_from_the_index_are_removed(tmp_path):
+    cache_dir = str(tmp_path / 'queries')
+    os.makedirs(cache_dir)
+    orphan = os.path.join(cache_dir, f"{'0' * 64}.parquet")
+    pd.DataFrame({'n': [1]}).to_parquet(orphan)
+
+    QueryCache('sqlite', {'grades': (10, 'a')}, TABLES, cache_dir)
+
+    assert not os.path.exists(orphan)
@@ -0,0 +1,142 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from pipeline.categories import CATEGORY_ORDER, categorize_sgpa
+from pipeline.sqlload import ROW_HASHES_TABLE, bulk_load, incremental_load
+from pipeline.summaries import SUMMARIES
+
+TABLES = ['students', 'subjects', 'grades', 'performance']
+
+
+def with_categories(performance):
+    """Performance with the categories the cleaning stage derives from SGPA."""
+    return performance.assign(performance_category=categorize_sgpa(performance['sgpa']).astype(str))
+
+
+def make_tables():
+    students = pd.DataFrame({
+        'hall_ticket': ['S1', 'S2', 'S3', 'S4'],
+        'student_name': ['ASHA', 'RAVI', 'MEENA', 'KIRAN'],
+        'father_name': ['F1', 'F2', 'F3', 'F4'],
+        'mother_name': ['M1', 'M2', 'M3', 'M4'],
+        'program': ['BSC', 'BSC', 'BCOM', 'BCOM'],
+    })
+    subjects = pd.DataFrame({
+        'course_code': ['C1', 'C2'],
+        'course_title': ['ALGEBRA', 'ACCOUNTS'],
+        'credits': [4, 3],
+    })
+    grades = pd.DataFrame({
+        'hall_ticket': ['S1', 'S1', 'S2', 'S2', 'S3', 'S3', 'S4', 'S4'],
+        'course_code': ['C1', 'C2'] * 4,
+        'grade': ['O', 'A', 'B', 'F', 'A+', 'B+', 'C', 'D'],
+        'result': ['PASS', 'PASS', 'PASS', 'FAIL', 'PASS', 'PASS', 'PASS', 'PASS'],
+        'credits': [4, 3] * 4,
+        'semester': 'SEMESTER-V',
+        'grade_points': [10, 8, 6, 0, 9, 7, 5, 4],
+    })
+    performance = with_categories(pd.DataFrame({
+        'hall_ticket': ['S1', 'S2', 'S3', 'S4'],
+        'semester': 'SEMESTER-V',
+        'sgpa': [8.64, None, 7.43, 4.57],
+        'result': ['PASS', 'PROMOTED', 'PASS', 'PASS'],
+        'total_subjects': [2, 2, 2, 2],
+    }))
+    return {'students': students, 'subjects': subjects, 'grades': grades, 'performance': performance}
+
+
+def change_tables(tables):
+    """S4 leaves, S5 joins, a grade and two SGPAs change and S1 moves program.
+
+    The Promoted and Second Class groups empty out, Distinction and Pass
+    Class appear and At Risk changes members.
+    """
+    changed = {name: df.copy() for name, df in tables.items()}
+    for name in ('students', 'grades', 'performance'):
+        df = changed[name]
+        changed[name] = df[df['hall_ticket'] != 'S4'].reset_index(drop=True)
+
+    changed['students'].loc[changed['students']['hall_ticket'] == 'S1', 'program'] = 'BCOM'
+    changed['students'] = pd.concat([changed['students'], pd.DataFrame({
+        'hall_ticket': ['S5'], 'student_name': ['LATA'], 'father_name': ['F5'],
+        'mother_name': ['M5'], 'program': ['BSC']})], ignore_index=True)
+
+    grades = changed['grades']
+    fix = (grades['hall_ticket'] == 'S2') & (grades['course_code'] == 'C2')
+    grades.loc[fix, ['grade', 'result', 'grade_points']] = ['D', 'PASS', 4]
+    changed['grades'] = pd.concat([grades, pd.DataFrame({
+        'hall_ticket': ['S5', 'S5'], 'course_code': ['C1', 'C2'], 'grade': ['A', 'A'],
+        'result': ['PASS', 'PASS'], 'credits': [4, 3], 'semester': 'SEMESTER-V',
+        'grade_points': [8, 8]})], ignore_index=True)
+
+    performance = changed['performance']
+    performance.loc[performance['hall_ticket'] == 'S2', ['sgpa', 'result']] = [5.43, 'PASS']
+    performance.loc[performance['hall_ticket'] == 'S3', 'sgpa'] = 6.71
+    changed['performance'] = with_categories(pd.concat([performance, pd.DataFrame({
+        'hall_ticket': ['S5'], 'semester': 'SEMESTER-V', 'sgpa': [9.2], 'result': ['PASS'],
+        'total_subjects': [2]})], ignore_index=True))
+    return changed
+
+
+def table_rows(db_path, name):
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql(f'SELECT * FROM "{name}" ORDER BY 1, 2, 3', conn)
+
+
+def assert_same_database(left, right):
+    for name in TABLES + list(SUMMARIES):
+        pd.testing.assert_frame_equal(table_rows(left, name), table_rows(right, name))
+
+
+@pytest.mark.parametrize('forget_hashes', [False, True])
+def test_incremental_load_matches_full_reload(tmp_path, schema, forget_hashes):
+    incremental_db = str(tmp_path / 'incremental.db')
+    full_db = str(tmp_path / 'full.db')
+    changed = change_tables(make_tables())
+
+    bulk_load(make_tables(), incremental_db, schema)
+    if forget_hashes:
+        # Without stored row hashes every row is staged and compared in SQL
+        with sqlite3.connect(incremental_db) as conn:
+            conn.execute(f'DELETE FROM {ROW_HASHES_TABLE}')
+    counts = incremental_load(changed, schema, incremental_db)
+    bulk_load(changed, full_db, schema)
+
+    assert_same_database(incremental_db, full_db)
+    assert counts['students'] == (2, 1)
+    assert counts['grades'] == (3, 2)
+    assert counts['subjects'] == (0, 0)
+    assert counts['performance'] == (3, 1)
+
+
+def test_incremental_load_of_unchanged_tables_writes_nothing(tmp_path, schema):
+    db_path = str(tmp_path / 'pipeline.db')
+    bulk_load(make_tables(), db_path, schema)
+
+    counts = incremental_load(make_tables(), schema, db_path)
+
+    assert counts == {name: (0, 0) for name in TABLES}
+
+
+def test_repeated_incremental_loads_match_full_reload(tmp_path, schema):
+    incremental_db = str(tmp_path / 'incremental.db')
+    full_db = str(tmp_path / 'full.db')
+    tables = make_tables()
+    changed = change_tables(tables)
+
+    bulk_load(tables, incremental_db, schema)
+    incremental_load(changed, schema, incremental_db)
+    incremental_load(tables, schema, incremental_db)
+    bulk_load(tables, full_db, schema)
+
+    assert_same_database(incremental_db, full_db)
+
+
+def test_fixture_categories_cover_the_real_labels():
+    initial = set(make_tables()['performance']['performance_category'])
+    changed = set(change_tables(make_tables())['performance']['performance_category'])
+
+    assert initial | changed == set(CATEGORY_ORDER)
+    assert initial - changed == {'Promoted', 'Second Class'}
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from pipeline.tables import SEMESTER, decompose_records, merge_tables
+
+
+def make_record(hall_ticket, subjects, sgpa='8.50', semester='SEMESTER-V'):
+    semester_info = {
+        'sgpa': sgpa,
+        'result': 'PASS',
+        'subjects': [{'courseCode': code, 'courseTitle': title, 'credits': credits,
+                      'grade': grade, 'result': 'PASS'}
+                     for code, title, credits, grade in subjects],
+    }
+    if semester is not None:
+        semester_info['semester'] = semester
+    return {
+        'student': {'hallTicket': hall_ticket, 'name': f"STUDENT {hall_ticket}",
+                    'fatherName': 'FATHER', 'motherName': 'MOTHER', 'program': 'BSC'},
+        'semesters': [semester_info],
+        'totalSubjects': len(subjects),
+    }
+
+
+def test_merge_tables_last_shard_wins():
+    first = decompose_records([
+        make_record('S1', [('C1', 'ALGEBRA', 4, 'B'), ('C2', 'ACCOUNTS', 3, 'A')], sgpa='7.43'),
+        make_record('S2', [('C1', 'ALGEBRA', 4, 'O')]),
+    ])
+    # A re-issued batch: S1 revalued, C1 retitled with new credits
+    second = decompose_records([
+        make_record('S1', [('C1', 'LINEAR ALGEBRA', 5, 'A'), ('C2', 'ACCOUNTS', 3, 'A')], sgpa='8.00'),
+    ])
+
+    merged = merge_tables([first, second])
+
+    subjects = merged['subjects'].set_index('course_code')
+    assert subjects.index.is_unique
+    assert subjects.loc['C1', 'course_title'] == 'LINEAR ALGEBRA'
+    assert subjects.loc['C1', 'credits'] == 5
+
+    grades = merged['grades'].set_index(['hall_ticket', 'course_code'])
+    assert len(grades) == 3
+    assert grades.loc[('S1', 'C1'), 'grade'] == 'A'
+    assert grades.loc[('S2', 'C1'), 'grade'] == 'O'
+
+    performance = merged['performance'].set_index('hall_ticket')
+    assert len(performance) == 2
+    assert performance.loc['S1', 'sgpa'] == 8.0
+    assert merged['students']['hall_ticket'].tolist() == ['S2', 'S1']
+
+
+def test_merge_tables_deduplicates_a_single_shard():
+    shard = decompose_records([
+        make_record('S1', [('C1', 'ALGEBRA', 4, 'B')]),
+        make_record('S2', [('C1', 'ALGEBRA I', 4, 'A')]),
+        make_record('S1', [('C1', 'ALGEBRA I', 4, 'A')]),
+    ])
+
+    merged = merge_tables([shard])
+
+    pd.testing.assert_frame_equal(merged['subjects'], pd.DataFrame(
+        {'course_code': ['C1'], 'course_title': ['ALGEBRA I'], 'credits': [4]}))
+    assert merged['students']['hall_ticket'].tolist() == ['S2', 'S1']
+    assert merged['grades'][['hall_ticket', 'grade']].values.tolist() == [['S2', 'A'], ['S1', 'A']]
+
+
+def test_decompose_records_takes_the_semester_from_the_record():
+    tables = decompose_records([
+        make_record('S1', [('C1', 'ALGEBRA', 4, 'B')], semester='SEMESTER-III'),
+        make_record('S2', [('C1', 'ALGEBRA', 4, 'B')], semester=None),
+    ])
+
+    assert tables['grades']['semester'].tolist() == ['SEMESTER-III', SEMESTER]
+    assert tables['performance']['semester'].tolist() == ['SEMESTER-III', SEMESTER]